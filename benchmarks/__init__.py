@@ -0,0 +1,6 @@
+"""Benchmarks for the JS8Call Configuration Viewer.
+
+Each bench_*.py module runs standalone (python benchmarks/bench_x.py) or as
+part of the package (python -m benchmarks.bench_x). synthetic.py generates
+realistic js8call.ini files for the benchmarks to run against.
+"""
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark diffing snapshots of a large js8call.ini.
+
+Generates a multi-megabyte ini file and a chain of snapshots that each change
+a handful of settings, then times diff_configs with and without the section
+digests (the no-digest baseline compares every section key by key).
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import js8call_diff
+from js8call_ini import IniFile
+
+def generate_snapshots(sections, settings, count, changes_per_step, seed=0):
+    """Return a list of ini file contents, each a few settings different from the last."""
+    rnd = random.Random(seed)
+    values = {
+        (f"Section{section}", f"Setting{setting}"): str(rnd.randrange(100000))
+        for section in range(sections)
+        for setting in range(settings)
+    }
+    snapshots = []
+    for _ in range(count):
+        lines = []
+        current_section = None
+        for (section, key), value in values.items():
+            if section != current_section:
+                lines.append(f"[{section}]")
+                current_section = section
+            lines.append(f"{key}={value}")
+        snapshots.append(("\n".join(lines) + "\n").encode())
+        
+        for section_key in rnd.sample(list(values), changes_per_step):
+            values[section_key] = str(rnd.randrange(100000))
+    return snapshots
+
+class NoDigest:
+    """Wraps an IniFile so every section looks changed."""
+    
+    def __init__(self, config):
+        self.config = config
+    
+    def section_digest(self, section):
+        # A fresh object never compares equal to another snapshot's digest
+        return object()
+    
+    def sections(self):
+        return self.config.sections()
+    
+    def __contains__(self, section):
+        return section in self.config
+    
+    def __getitem__(self, section):
+        return self.config[section]
+
+def time_chain(configs, wrap=None):
+    """Return the total seconds to diff each snapshot with the next."""
+    if wrap:
+        configs = [wrap(config) for config in configs]
+    start = time.perf_counter()
+    for old, new in zip(configs, configs[1:]):
+        js8call_diff.diff_configs(old, new)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark diffing ini snapshots")
+    parser.add_argument("--sections", type=int, default=200, help="Sections per file")
+    parser.add_argument("--settings", type=int, default=500, help="Settings per section")
+    parser.add_argument("--snapshots", type=int, default=10, help="Snapshots in the chain")
+    parser.add_argument("--changes", type=int, default=5, help="Settings changed between snapshots")
+    args = parser.parse_args()
+    
+    snapshots = generate_snapshots(args.sections, args.settings, args.snapshots, args.changes)
+    print(f"{len(snapshots)} snapshots of {len(snapshots[0]) / 1024 ** 2:.1f} MB, "
+          f"{args.changes} changes between each")
+    
+    start = time.perf_counter()
+    configs = [IniFile(data) for data in snapshots]
+    print(f"parse              {(time.perf_counter() - start) * 1000 / len(configs):8.1f} ms per file")
+    
+    baseline = time_chain(configs, NoDigest)
+    digests = time_chain(configs)
+    cached = time_chain(configs)
+    steps = len(configs) - 1
+    print(f"diff, no digests   {baseline * 1000 / steps:8.1f} ms per step")
+    print(f"diff, digests      {digests * 1000 / steps:8.1f} ms per step")
+    print(f"diff, warm digests {cached * 1000 / steps:8.1f} ms per step")
+
+if __name__ == "__main__":
+    main()
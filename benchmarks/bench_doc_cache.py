@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark cold vs warm loading of the parsed settings values documentation.
+
+Cold: no cache entry exists, so the markdown is parsed and the cache is written.
+Warm: the cache entry is current, so launch only deserializes it.
+Parse only: the plain markdown parse without any cache, for reference.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import js8call_config_viewer as viewer
+
+def time_runs(func, iterations, setup=None):
+    """Run func the given number of times and return the per-run timings in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+def report(label, timings):
+    """Print median and min/max for a set of timings."""
+    median = timings[len(timings) // 2]
+    print(f"{label:<12} median {median:8.3f} ms   min {timings[0]:8.3f} ms   max {timings[-1]:8.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the settings documentation cache")
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="Runs per measurement")
+    args = parser.parse_args()
+    
+    cache_dir = tempfile.mkdtemp(prefix="js8call-doc-cache-")
+    
+    def clear_cache():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    
+    def load():
+        viewer.SETTING_VALUES.clear()
+        viewer.load_setting_values(cache_dir=cache_dir)
+    
+    md_path = os.path.join(os.path.dirname(os.path.abspath(viewer.__file__)), "docs", "js8call_settings_values.md")
+    with open(md_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    
+    try:
+        report("parse only", time_runs(lambda: viewer.parse_setting_values(text), args.iterations))
+        report("cold", time_runs(load, args.iterations, setup=clear_cache))
+        load()
+        report("warm", time_runs(load, args.iterations))
+        print(f"{len(viewer.SETTING_VALUES)} settings loaded")
+    finally:
+        clear_cache()
+
+if __name__ == "__main__":
+    main()
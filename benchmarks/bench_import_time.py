@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Guard the startup budget of the headless query path.
+
+Runs `python -X importtime` on a headless `get` query in a fresh interpreter,
+reports the cumulative import time of js8call_config_viewer and the total
+wall time, and fails (exit 1) if either is over budget or if textual/rich
+were imported at all.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SAMPLE_INI = """[Configuration]
+MyCall=W1AW
+MyGrid=FN31
+HeartbeatInterval=30
+TCPEnabled=true
+"""
+
+# Snippet run in the child interpreter: a headless query, then report whether the UI stack was loaded
+CHILD_CODE = """
+import sys
+import js8call_config_viewer
+js8call_config_viewer.main(["get", "MyCall", "-f", sys.argv[1]])
+print("UI_MODULES=" + ",".join(name for name in ("textual", "rich") if name in sys.modules))
+"""
+
+def parse_importtime(stderr, module):
+    """Return the cumulative import time in milliseconds reported for a top-level module."""
+    for line in stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1].strip()) / 1000
+    return None
+
+def run_once(ini_path):
+    """Run one headless query in a fresh interpreter and return its measurements."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE, ini_path],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    ui_modules = ""
+    for line in result.stdout.splitlines():
+        if line.startswith("UI_MODULES="):
+            ui_modules = line.split("=", 1)[1]
+    return parse_importtime(result.stderr, "js8call_config_viewer"), wall_ms, ui_modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless startup and import time")
+    parser.add_argument("-n", "--iterations", type=int, default=10, help="Number of fresh interpreter runs")
+    parser.add_argument("--import-budget", type=float, default=50.0, help="Max median import time in ms")
+    parser.add_argument("--wall-budget", type=float, default=None, help="Max median wall time in ms (off by default, includes interpreter startup)")
+    args = parser.parse_args()
+    
+    with tempfile.NamedTemporaryFile("w", suffix=".ini", delete=False) as f:
+        f.write(SAMPLE_INI)
+        ini_path = f.name
+    
+    try:
+        runs = [run_once(ini_path) for _ in range(args.iterations)]
+    finally:
+        os.unlink(ini_path)
+    
+    import_times = sorted(run[0] for run in runs)
+    wall_times = sorted(run[1] for run in runs)
+    ui_modules = {module for run in runs for module in run[2].split(",") if module}
+    import_median = import_times[len(import_times) // 2]
+    wall_median = wall_times[len(wall_times) // 2]
+    
+    print(f"import js8call_config_viewer  median {import_median:7.2f} ms   (budget {args.import_budget:.0f} ms)")
+    print(f"headless get, wall time      median {wall_median:7.2f} ms")
+    print(f"UI modules imported: {', '.join(sorted(ui_modules)) or 'none'}")
+    
+    failed = False
+    if ui_modules:
+        print("FAIL: the headless path imported the UI stack")
+        failed = True
+    if import_median > args.import_budget:
+        print("FAIL: import time over budget")
+        failed = True
+    if args.wall_budget is not None and wall_median > args.wall_budget:
+        print("FAIL: wall time over budget")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark the QSettings INI reader against configparser.
+
+Generates js8call.ini-like files from 10 KB to 100 MB (settings, long lists
+and @ByteArray/@Variant blobs) and times a full parse plus reading every value.
+"""
+
+import argparse
+import configparser
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from js8call_ini import IniFile
+
+SIZES = [10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2]
+
+SECTIONS = ["Configuration", "Common", "MainWindow", "Audio", "Colors", "Waterfall", "Rig", "Network"]
+
+def generate_ini(path, size, seed=0):
+    """Write a synthetic js8call.ini of roughly the given size in bytes."""
+    rnd = random.Random(seed)
+    written = 0
+    index = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size:
+            lines = [f"[{SECTIONS[index % len(SECTIONS)]}{index // len(SECTIONS) or ''}]"]
+            for setting in range(40):
+                kind = rnd.random()
+                if kind < 0.05:
+                    blob = "".join(f"\\x{rnd.randrange(256):x}" for _ in range(rnd.randrange(50, 2000)))
+                    value = f"@ByteArray({blob})"
+                elif kind < 0.10:
+                    value = ", ".join(f"{rnd.randrange(1800000, 148000000)}" for _ in range(rnd.randrange(10, 300)))
+                elif kind < 0.15:
+                    value = f"\"{rnd.choice(['W1AW', 'K1ABC'])} 100%\""
+                else:
+                    value = str(rnd.randrange(1000))
+                lines.append(f"Setting{setting}Name{index}={value}")
+            chunk = "\n".join(lines) + "\n\n"
+            f.write(chunk)
+            written += len(chunk)
+            index += 1
+
+def read_with_configparser(path):
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(path, encoding="utf-8")
+    return sum(len(value) for section in config.sections() for _, value in config[section].items())
+
+def read_with_inifile(path):
+    config = IniFile.from_path(path)
+    return sum(len(value) for section in config.sections() for _, value in config[section].items())
+
+def read_keys_only(path):
+    # Parsing plus key iteration, the common case when values are decoded lazily
+    config = IniFile.from_path(path)
+    return sum(len(config[section]) for section in config.sections())
+
+def best_of(func, path, repeat):
+    """Return the best wall time in seconds over several runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.0f} GB"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the INI reader against configparser")
+    parser.add_argument("--max-size", type=int, default=SIZES[-1], help="Largest file size in bytes")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+    
+    print(f"{'size':>8}  {'configparser':>13}  {'IniFile':>10}  {'IniFile keys':>13}  {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in (size for size in SIZES if size <= args.max_size):
+            path = os.path.join(temp_dir, f"js8call_{size}.ini")
+            generate_ini(path, size)
+            repeat = args.repeat if size <= 10 * 1024 ** 2 else 1
+            
+            baseline = best_of(read_with_configparser, path, repeat)
+            full = best_of(read_with_inifile, path, repeat)
+            keys = best_of(read_keys_only, path, repeat)
+            print(f"{format_size(os.path.getsize(path)):>8}  {baseline * 1000:>10.1f} ms  {full * 1000:>7.1f} ms  "
+                  f"{keys * 1000:>10.1f} ms  {baseline / full:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Benchmark the data pipeline on synthetic configs from 100 to 1,000,000 keys.
+
+Times each stage the viewer runs before showing anything: loading the settings
+values doc (cold and cached), read_js8call_ini, organize_settings_by_category,
+the UI's organize_setting_records and the per-setting
+is_documented_setting/get_setting_description fan-out (cold and memoized).
+Each stage is then run once more under tracemalloc for its peak memory. The report is JSON, for tracking regressions between commits:
+    
+    python -m benchmarks.bench_pipeline -o before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import js8call_config_viewer as viewer
+from benchmarks.synthetic import write_ini
+
+SIZES = [100, 1000, 10000, 100000, 1000000]
+
+def reset_lookups():
+    """Replace the memoized lookup indexes with fresh ones, so the next lookups are cold."""
+    viewer.SETTING_VALUES_INDEX = viewer.SettingMetadataIndex(viewer.SETTING_VALUES, partial=False)
+    viewer.SETTING_DESCRIPTIONS_INDEX = viewer.SettingMetadataIndex(viewer.SETTING_DESCRIPTIONS)
+    viewer.SETTING_CLASSIFIER = viewer.SettingClassifier(viewer.KEY_SETTINGS, viewer.CATEGORY_NAME_PATTERNS)
+
+def describe_all(keys):
+    """The lookups the UI makes for every displayed setting."""
+    for key in keys:
+        if viewer.is_documented_setting(key):
+            viewer.get_setting_description(key)
+
+def git_revision():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure(func, repeat, setup=None):
+    """Return the best wall time of func in seconds, calling setup (untimed) before each run."""
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def measure_memory(func, setup=None):
+    """Return (peak, retained) bytes allocated by one run of func, keeping its result alive."""
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, retained
+
+def bench_size(key_count, temp_dir, repeat):
+    """Return the stage results for one config size."""
+    path = write_ini(os.path.join(temp_dir, f"js8call_{key_count}.ini"), key_count)
+    size_bytes = os.path.getsize(path)
+    config, _ = viewer.read_js8call_ini(path)
+    keys = [key for section in config.sections() for key in config[section]]
+    
+    def organize_cold():
+        reset_lookups()
+    
+    stages = [
+        # (name, func, setup, items processed)
+        ("read_js8call_ini", lambda: viewer.read_js8call_ini(path), None, key_count),
+        ("organize_settings_by_category (cold)", lambda: viewer.organize_settings_by_category(config), organize_cold, key_count),
+        ("organize_settings_by_category (warm)", lambda: viewer.organize_settings_by_category(config), None, key_count),
+        ("organize_setting_records (warm)", lambda: viewer.organize_setting_records(config), None, key_count),
+        ("describe fan-out (cold)", lambda: describe_all(keys), reset_lookups, len(keys)),
+        ("describe fan-out (warm)", lambda: describe_all(keys), None, len(keys)),
+    ]
+    
+    results = []
+    for name, func, setup, items in stages:
+        seconds = measure(func, repeat, setup)
+        peak, retained = measure_memory(func, setup)
+        results.append({
+            "stage": name,
+            "keys": key_count,
+            "file_bytes": size_bytes,
+            "seconds": seconds,
+            "items_per_second": items / seconds if seconds else None,
+            "peak_bytes": peak,
+            "retained_bytes": retained,
+        })
+    return results
+
+def bench_setting_values(repeat):
+    """Return the results for loading the settings values doc cold (parse) and warm (cache)."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold_dirs = []
+        
+        def cold_setup():
+            viewer.SETTING_VALUES.clear()
+            cold_dirs.append(tempfile.mkdtemp(dir=cache_dir))
+        
+        def warm_setup():
+            viewer.SETTING_VALUES.clear()
+        
+        stages = [
+            ("load_setting_values (cold)", lambda: viewer.load_setting_values(cold_dirs[-1]), cold_setup),
+            ("load_setting_values (warm)", lambda: viewer.load_setting_values(cache_dir), warm_setup),
+        ]
+        viewer.load_setting_values(cache_dir)
+        
+        results = []
+        for name, func, setup in stages:
+            seconds = measure(func, repeat, setup)
+            peak, retained = measure_memory(func, setup)
+            entries = len(viewer.SETTING_VALUES)
+            results.append({
+                "stage": name,
+                "keys": entries,
+                "seconds": seconds,
+                "items_per_second": entries / seconds if seconds else None,
+                "peak_bytes": peak,
+                "retained_bytes": retained,
+            })
+    return results
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data pipeline on synthetic configs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Config sizes in keys")
+    parser.add_argument("--max-keys", type=int, help="Skip sizes above this many keys")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per stage (best is reported)")
+    parser.add_argument("-o", "--output", default="-", help="JSON report file (default: stdout)")
+    args = parser.parse_args()
+    
+    sizes = [size for size in args.sizes if not args.max_keys or size <= args.max_keys]
+    results = bench_setting_values(args.repeat)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for key_count in sizes:
+            # Large sizes take seconds per run, so a single run is enough
+            repeat = args.repeat if key_count <= 100000 else 1
+            results.extend(bench_size(key_count, temp_dir, repeat))
+    
+    report = {
+        "benchmark": "pipeline",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        # ru_maxrss is in kilobytes on Linux
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "results": results,
+    }
+    
+    # A readable summary goes to stderr so the JSON can be piped
+    for result in results:
+        print(f"{result['stage']:<40} {result['keys']:>9} keys  {result['seconds'] * 1000:>10.2f} ms  "
+              f"peak {format_bytes(result['peak_bytes']):>9}", file=sys.stderr)
+    
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Benchmark the serve daemon with many simultaneous clients.
+
+Starts `serve` on a synthetic config in a subprocess, then runs waves of
+client processes that all start at once. Each client sends a mix of get,
+search, category and validate requests, either over one connection it keeps
+open (a dashboard) or connecting for every request (a cron job or shell
+script). Per-request latencies are reported as p50/p95/p99 per operation,
+with the overall request rate of each wave.
+
+It also times one query through the command-line client (the installed
+command's entry point, which answers queries without importing the viewer),
+the same query through the viewer script, and the get command, which parses
+the ini file on every call. The report is JSON:
+    
+    python -m benchmarks.bench_serve -o serve.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.bench_pipeline import git_revision
+from benchmarks.synthetic import write_ini
+from js8call_ini import IniFile
+from js8call_query import ServeClient, is_serving
+
+CLIENTS = [1, 4, 16, 64]
+
+VIEWER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "js8call_config_viewer.py")
+# What the installed js8call-config-viewer command runs
+ENTRY_POINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "js8call_query.py")
+
+# Share of each operation in a client's requests
+REQUEST_MIX = [("get", 0.7), ("search", 0.1), ("category", 0.1), ("validate", 0.1)]
+
+SEARCH_QUERIES = ["grid", "heartbeat", "color", "freq", "tcp", "call"]
+
+def percentile(samples, fraction):
+    """Return the nearest-rank percentile of sorted samples."""
+    return samples[min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))]
+
+def make_requests(keys, count, seed):
+    """Return count (op, params) requests in the REQUEST_MIX proportions."""
+    rnd = random.Random(seed)
+    ops, weights = zip(*REQUEST_MIX)
+    requests = []
+    for op in rnd.choices(ops, weights, k=count):
+        if op == "get":
+            params = {"pattern": rnd.choice(keys)}
+        elif op == "search":
+            params = {"query": rnd.choice(SEARCH_QUERIES), "limit": 20}
+        elif op == "category":
+            params = {}
+        else:
+            params = {"key": "MyGrid", "value": rnd.choice(["FN31", "FN31pr", "ZZ99"])}
+        requests.append((op, params))
+    return requests
+
+def run_client(socket_path, requests, persistent, barrier, results):
+    """Send the requests once every client is ready and put [(op, seconds)] (or the error) on the results queue."""
+    try:
+        timings = []
+        client = ServeClient(socket_path) if persistent else None
+        barrier.wait()
+        for op, params in requests:
+            start = time.perf_counter()
+            if persistent:
+                response = client.request(op, **params)
+            else:
+                with ServeClient(socket_path) as single:
+                    response = single.request(op, **params)
+            timings.append((op, time.perf_counter() - start))
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+        if client:
+            client.close()
+        results.put(timings)
+    except Exception as e:
+        # Let the wave fail instead of waiting for this client forever
+        barrier.abort()
+        results.put(RuntimeError(f"client failed: {e!r}"))
+
+def run_wave(socket_path, keys, clients, requests_per_client, persistent):
+    """Run clients processes at once and return (timings, seconds for the whole wave)."""
+    context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    # The extra party is this process, which starts the clock once every client has connected
+    barrier = context.Barrier(clients + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=run_client,
+            args=(socket_path, make_requests(keys, requests_per_client, seed), persistent, barrier, results),
+        )
+        for seed in range(clients)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait(timeout=60)
+    start = time.perf_counter()
+    timings = []
+    for _ in processes:
+        result = results.get(timeout=300)
+        if isinstance(result, Exception):
+            raise result
+        timings.extend(result)
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    return timings, elapsed
+
+def summarize(mode, clients, timings, elapsed):
+    """Return result rows per operation and for all requests of a wave."""
+    rows = []
+    by_op = {}
+    for op, seconds in timings:
+        by_op.setdefault(op, []).append(seconds)
+    by_op["all"] = [seconds for _, seconds in timings]
+    for op, samples in by_op.items():
+        samples.sort()
+        rows.append({
+            "mode": mode,
+            "clients": clients,
+            "op": op,
+            "count": len(samples),
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+            "max_ms": samples[-1] * 1000,
+            "requests_per_second": len(timings) / elapsed if op == "all" else None,
+        })
+    return rows
+
+def time_command(args, runs, script=VIEWER):
+    """Return the median seconds a command-line invocation takes, start to exit."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script] + args, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return percentile(samples, 0.50)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the serve daemon with many simultaneous clients")
+    parser.add_argument("--keys", type=int, default=2000, help="Settings in the synthetic config")
+    parser.add_argument("--clients", type=int, nargs="+", default=CLIENTS, help="Simultaneous clients per wave")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--cli-runs", type=int, default=10, help="Runs of each command-line invocation")
+    parser.add_argument("-o", "--output", default="-", help="JSON report file (default: stdout)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ini_path = write_ini(os.path.join(temp_dir, "js8call.ini"), args.keys)
+        config = IniFile.from_path(ini_path)
+        keys = sorted({key for section in config.sections() for key in config[section]})
+        socket_path = os.path.join(temp_dir, "serve.sock")
+        
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, VIEWER, "serve", ini_path, "--socket", socket_path], stderr=subprocess.DEVNULL)
+        try:
+            while not is_serving(socket_path):
+                if server.poll() is not None:
+                    raise RuntimeError("the server exited during startup")
+                time.sleep(0.01)
+            startup = time.perf_counter() - start
+            
+            results = []
+            for persistent in (True, False):
+                mode = "persistent" if persistent else "connect per request"
+                for clients in args.clients:
+                    timings, elapsed = run_wave(socket_path, keys, clients, args.requests, persistent)
+                    results.extend(summarize(mode, clients, timings, elapsed))
+            
+            key = keys[len(keys) // 2]
+            query = ["query", "get", key, "--socket", socket_path]
+            cli = {
+                "query get": time_command(query, args.cli_runs, ENTRY_POINT),
+                "query get (viewer script)": time_command(query, args.cli_runs),
+                "get (parses the file)": time_command(["get", key, "-f", ini_path], args.cli_runs),
+                # The floor for any command-line client
+                "python startup": time_command(["pass"], args.cli_runs, "-c"),
+            }
+        finally:
+            server.terminate()
+            server.wait()
+    
+    report = {
+        "benchmark": "serve",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "keys": args.keys,
+        "server_startup_seconds": startup,
+        "cli_median_seconds": cli,
+        "results": results,
+    }
+    
+    # A readable summary goes to stderr so the JSON can be piped
+    print(f"server startup ({args.keys} keys)  {startup * 1000:8.1f} ms", file=sys.stderr)
+    for name, seconds in cli.items():
+        print(f"{name:<32} {seconds * 1000:8.1f} ms per call", file=sys.stderr)
+    for result in results:
+        rate = f"  {result['requests_per_second']:>8.0f} req/s" if result["requests_per_second"] else ""
+        print(f"{result['mode']:<20} {result['clients']:>4} clients  {result['op']:<9} n={result['count']:<6} "
+              f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms{rate}",
+              file=sys.stderr)
+    
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""End-to-end UI latency benchmarks, from keypress to repaint, using Textual's headless pilot.
+
+Drives JS8CallConfigViewer (with --all) against synthetic configs of increasing
+size and replays scripted sessions: startup to first paint (of the screen, then
+of the first category's rows), category switches, holding j for 500 rows,
+opening the v values modal and the help screen.
+
+Each interaction is timed from the moment its key is posted to the app until
+the first repaint at which the expected state is on screen (e.g. the cursor
+moved and its description is shown). Repaints are caught by wrapping the app's
+display hook and rendering each update to terminal output, as a real terminal
+driver would, so no terminal is needed. The report is JSON with p50/p95/p99
+latencies per interaction:
+    
+    python -m benchmarks.bench_ui -o ui.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from textual import events
+from textual._compositor import CompositorUpdate
+
+from benchmarks.bench_pipeline import git_revision
+from benchmarks.synthetic import write_ini
+from js8call_tui import HelpScreen, JS8CallConfigViewer, SettingsView, SettingValuesScreen
+
+SIZES = [100, 1000, 10000, 100000]
+
+# Terminal size the app is rendered at
+TERMINAL_SIZE = (120, 40)
+
+class PaintProbe:
+    """Times repaints of a headless app and matches them to the interaction in progress."""
+    
+    def __init__(self, app):
+        self.app = app
+        self._display = app._display
+        self._pending = None
+        app._display = self._on_display
+    
+    def _on_display(self, screen, renderable):
+        self._display(screen, renderable)
+        if renderable is None:
+            return
+        if isinstance(renderable, CompositorUpdate):
+            # Produce the terminal output a real driver would write
+            renderable.render_segments(self.app.console)
+        
+        if self._pending:
+            start, predicate, future = self._pending
+            if predicate() and not future.done():
+                self._pending = None
+                future.set_result(time.perf_counter() - start)
+    
+    def expect(self, predicate):
+        """Start timing; the returned future resolves to the seconds until a repaint where predicate() holds."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending = (time.perf_counter(), predicate, future)
+        return future
+    
+    async def interact(self, key, predicate, timeout=30):
+        """Post a key to the app and return the seconds until the repaint showing its effect."""
+        char = key if len(key) == 1 else None
+        future = self.expect(predicate)
+        self.app.post_message(events.Key(key, char))
+        return await asyncio.wait_for(future, timeout)
+
+def percentile(samples, fraction):
+    """Return the nearest-rank percentile of sorted samples."""
+    return samples[min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))]
+
+def summarize(name, key_count, samples):
+    samples = sorted(samples)
+    return {
+        "interaction": name,
+        "keys": key_count,
+        "count": len(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+async def time_startup(path):
+    """Return the seconds from creating the app to the first paint of the main screen and of its settings table."""
+    app = JS8CallConfigViewer(config_path=path, show_all=True)
+    probe = PaintProbe(app)
+    
+    def settings_shown():
+        screen = app.screen
+        return isinstance(screen, SettingsView) and screen.query_one("#settings-table").row_count > 0
+    
+    # The screen paints before the config is loaded, then again once the first category is filled in
+    shell_paint = probe.expect(lambda: isinstance(app.screen, SettingsView))
+    async with app.run_test(size=TERMINAL_SIZE) as pilot:
+        shell = await asyncio.wait_for(shell_paint, 60)
+        rows = await asyncio.wait_for(probe.expect(settings_shown), 60)
+        # Let the remaining categories load before shutting the app down
+        while not app.screen.loaded:
+            await pilot.pause(0.01)
+        return shell, shell + rows
+
+async def run_session(path, hold_rows, repeat):
+    """Replay the scripted session once and return {interaction: [seconds]}."""
+    timings = {"category switch": [], "hold j": [], "open values": [], "close values": [], "open help": [], "close help": []}
+    app = JS8CallConfigViewer(config_path=path, show_all=True)
+    probe = PaintProbe(app)
+    
+    async with app.run_test(size=TERMINAL_SIZE) as pilot:
+        view = app.screen
+        while not view.loaded:
+            await pilot.pause(0.01)
+        table = view.query_one("#settings-table")
+        description_area = view.query_one("#description-area")
+        
+        # Switch to every category in turn (h focuses the list; the timed key is the selection)
+        for _ in range(repeat):
+            for index, category in enumerate(view.categories):
+                await pilot.press("h")
+                view.query_one("#categories-list").index = index
+                await pilot.pause()
+                timings["category switch"].append(await probe.interact(
+                    "enter", lambda category=category: view.current_category == category and table.has_focus
+                ))
+        
+        # Hold j through the largest category
+        largest = max(view.categories, key=lambda category: len(view.get_category_rows(category)))
+        await pilot.press("h")
+        view.query_one("#categories-list").index = view.categories.index(largest)
+        await pilot.press("enter")
+        await pilot.pause()
+        
+        for row in range(1, min(hold_rows, table.row_count - 1) + 1):
+            expected = view.describe_record(table.get_record(row))
+            timings["hold j"].append(await probe.interact(
+                "j", lambda row=row, expected=expected: table.cursor_row == row and description_area._description == expected
+            ))
+        
+        # Open and close the values modal and the help screen
+        for _ in range(repeat):
+            timings["open values"].append(await probe.interact("v", lambda: isinstance(app.screen, SettingValuesScreen)))
+            timings["close values"].append(await probe.interact("escape", lambda: app.screen is view))
+            timings["open help"].append(await probe.interact("f1", lambda: isinstance(app.screen, HelpScreen)))
+            timings["close help"].append(await probe.interact("escape", lambda: app.screen is view))
+    
+    return timings
+
+async def bench_size(key_count, temp_dir, args):
+    path = write_ini(os.path.join(temp_dir, f"js8call_{key_count}.ini"), key_count)
+    startup = [await time_startup(path) for _ in range(args.startup_runs)]
+    timings = await run_session(path, args.hold_rows, args.repeat)
+    
+    results = [
+        summarize("startup to first paint", key_count, [shell for shell, _ in startup]),
+        summarize("startup to first rows", key_count, [rows for _, rows in startup]),
+    ]
+    results.extend(summarize(name, key_count, samples) for name, samples in timings.items() if samples)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keypress-to-repaint latency in the headless UI")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Config sizes in keys")
+    parser.add_argument("--max-keys", type=int, help="Skip sizes above this many keys")
+    parser.add_argument("--hold-rows", type=int, default=500, help="Rows to move through while holding j")
+    parser.add_argument("--startup-runs", type=int, default=5, help="App launches timed per size")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="Repetitions of the category, values and help interactions")
+    parser.add_argument("-o", "--output", default="-", help="JSON report file (default: stdout)")
+    args = parser.parse_args()
+    
+    sizes = [size for size in args.sizes if not args.max_keys or size <= args.max_keys]
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for key_count in sizes:
+            results.extend(asyncio.run(bench_size(key_count, temp_dir, args)))
+    
+    report = {
+        "benchmark": "ui",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "terminal_size": list(TERMINAL_SIZE),
+        "results": results,
+    }
+    
+    # A readable summary goes to stderr so the JSON can be piped
+    for result in results:
+        print(f"{result['interaction']:<24} {result['keys']:>7} keys  n={result['count']:<4} "
+              f"p50 {result['p50_ms']:>8.1f} ms  p95 {result['p95_ms']:>8.1f} ms  p99 {result['p99_ms']:>8.1f} ms",
+              file=sys.stderr)
+    
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Generate realistic synthetic js8call.ini files of any size.
+
+Settings are spread over the real section names in SECTION_TO_CATEGORY. Keys are
+a mix of documented names (from SETTING_DESCRIPTIONS, KEY_SETTINGS and the
+settings values doc), variants of documented names that only match partially,
+and undocumented names. Values are a mix of the shapes JS8Call writes: numbers,
+booleans, strings, long comma-separated lists, and @ByteArray/@Variant blobs.
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import js8call_config_viewer as viewer
+
+# Share of keys of each kind (the rest are undocumented)
+DOCUMENTED_SHARE = 0.10
+PARTIAL_SHARE = 0.25
+
+# Words used to build plausible undocumented key names
+NAME_WORDS = [
+    "Main", "Window", "Geometry", "State", "Splitter", "Column", "Width", "Last", "Recent",
+    "Dialog", "Filter", "Offset", "Mode", "Enabled", "Size", "Index", "Path", "Timeout",
+    "Station", "Message", "Activity", "Band", "Call", "Frequency", "Spot", "Log", "Sort",
+]
+
+# Dial frequencies (Hz) used in long list values
+FREQUENCIES = [str(frequency) for frequency in range(1800000, 148000000, 997003)]
+
+def documented_names():
+    """Return every documented setting name, without duplicates, in a stable order."""
+    names = list(viewer.SETTING_DESCRIPTIONS)
+    names += [name for settings in viewer.KEY_SETTINGS.values() for name in settings]
+    names += list(viewer.SETTING_VALUES)
+    return list(dict.fromkeys(names))
+
+def random_value(rnd):
+    """Return a value in one of the shapes found in real js8call.ini files."""
+    kind = rnd.random()
+    if kind < 0.02:
+        blob = "".join(map("\\x{:x}".format, rnd.randbytes(rnd.randrange(20, 400))))
+        return f"@ByteArray({blob})"
+    if kind < 0.04:
+        return f"@Variant(\\0\\0\\0\\x7f\\0\\0\\0\\x{rnd.randrange(256):x}{rnd.choice(['QColor', 'QFont', 'QList'])})"
+    if kind < 0.08:
+        return ", ".join(rnd.choices(FREQUENCIES, k=rnd.randrange(5, 200)))
+    if kind < 0.30:
+        return rnd.choice(["true", "false"])
+    if kind < 0.45:
+        return f"\"{rnd.choice(['W1AW', 'K1ABC', 'VK3XYZ'])} {rnd.choice(['HB', 'CQ', 'SNR?'])} <MYGRID4>\""
+    if kind < 0.55:
+        return f"#{rnd.randrange(0x1000000):06x}"
+    return str(rnd.randrange(100000))
+
+def generate_settings(key_count, seed=0):
+    """Return {section: [(key, value)]} with key_count settings in total."""
+    rnd = random.Random(seed)
+    sections = list(viewer.SECTION_TO_CATEGORY)
+    documented = documented_names()
+    settings = {section: [] for section in sections}
+    used = {section: set() for section in sections}
+    
+    # Documented settings go in a section of their own category, as JS8Call writes them
+    sections_by_category = {}
+    for section, category in viewer.SECTION_TO_CATEGORY.items():
+        sections_by_category.setdefault(category, []).append(section)
+    
+    for index in range(key_count):
+        kind = rnd.random()
+        if kind < DOCUMENTED_SHARE:
+            key = rnd.choice(documented)
+            section = rnd.choice(sections_by_category.get(viewer.get_setting_category(key), ["Configuration"]))
+        elif kind < DOCUMENTED_SHARE + PARTIAL_SHARE:
+            # Matches a documented name only partially, like MyCallHistory or colorCQ2
+            key = f"{rnd.choice(documented)}{rnd.choice(NAME_WORDS)}{index}"
+            section = rnd.choice(sections)
+        else:
+            key = f"{rnd.choice(NAME_WORDS)}{rnd.choice(NAME_WORDS)}{index}"
+            section = rnd.choice(sections)
+        
+        if key in used[section]:
+            # Keys are unique within a section, so repeats get a numbered variant
+            key = f"{key}{index}"
+        used[section].add(key)
+        settings[section].append((key, random_value(rnd)))
+    
+    return settings
+
+def generate_ini(key_count, seed=0):
+    """Return the text of a synthetic js8call.ini with key_count settings."""
+    lines = []
+    for section, entries in generate_settings(key_count, seed).items():
+        if not entries:
+            continue
+        lines.append(f"[{section}]")
+        lines.extend(f"{key}={value}" for key, value in entries)
+        lines.append("")
+    return "\n".join(lines)
+
+def write_ini(path, key_count, seed=0):
+    """Write a synthetic js8call.ini with key_count settings and return its path."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(generate_ini(key_count, seed))
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic js8call.ini")
+    parser.add_argument("keys", type=int, help="Number of settings")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    # Values documentation is included in the documented names when it can be loaded
+    viewer.load_setting_values()
+    if args.output == "-":
+        sys.stdout.write(generate_ini(args.keys, args.seed))
+    else:
+        write_ini(args.output, args.keys, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,17 @@
 import os
 import sys
 import argparse
-import configparser
+import bisect
+import fnmatch
 import platform
 import re
+import time
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional
 
-from textual.app import App, ComposeResult
-from textual.binding import Binding
-from textual.containers import Horizontal, Vertical, ScrollableContainer
-from textual.screen import Screen, ModalScreen
-from textual.widgets import Header, Footer, Static, Button, DataTable, Label, ListView, ListItem
-from textual.reactive import reactive
-from textual import events
-from rich.text import Text
-from rich.panel import Panel
-from rich.console import Console
+from js8call_ini import IniFile
+from js8call_paths import get_cache_dir, get_data_dir
+from js8call_profile import START_TIME, profile_session, span, traced
 
 # Define key settings to highlight (based on js8call_ini_file_structure.md)
 KEY_SETTINGS = {
@@ -215,32 +210,55 @@ SECTION_TO_CATEGORY = {
     "Display": "Display Settings"
 }
 
+# Name-pattern rules used to guess the category of settings not listed in KEY_SETTINGS
+# (checked in order against the lowercased key; the first rule with a matching token wins)
+CATEGORY_NAME_PATTERNS = [
+    ("Color Settings", ("color",)),
+    ("Display Settings", ("font",)),
+    ("Audio Settings", ("sound", "audio")),
+    ("Waterfall Settings", ("waterfall", "plot")),
+    ("Radio Settings", ("ptt", "rig", "cat", "radio")),
+    ("Network Settings", ("udp", "tcp", "server", "aprs")),
+    ("Heartbeat Settings", ("heartbeat", "hb")),
+    ("Decode Settings", ("decode",)),
+    ("Automation Settings", ("auto", "whitelist", "blacklist")),
+]
+
+# The Textual UI lives in js8call_tui and is only imported when the TUI runs,
+# so headless commands start without loading textual or rich
+UI_NAMES = ("SettingValuesScreen", "SettingTable", "DescriptionArea", "SettingsView", "DiffScreen", "FleetScreen", "HistoryScreen", "HelpScreen", "JS8CallConfigViewer")
+
+def __getattr__(name):
+    """Resolve UI classes from js8call_tui on first access."""
+    if name in UI_NAMES:
+        import js8call_tui
+        return getattr(js8call_tui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def console_print(*messages):
+    """Print rich-markup messages to stderr, importing rich only when there is something to show."""
+    from rich.console import Console
+    console = Console(stderr=True)
+    for message in messages:
+        console.print(message)
+
 # Dictionary to store valid values and formats for settings
 SETTING_VALUES = {}
 
-def load_setting_values():
-    """Parse the JS8Call settings values markdown file to extract valid values and formats."""
-    # Find the markdown file relative to this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    md_path = os.path.join(script_dir, "docs", "js8call_settings_values.md")
-    
-    if not os.path.exists(md_path):
-        # Try with parent directory
-        md_path = os.path.join(script_dir, "..", "docs", "js8call_settings_values.md")
-        if not os.path.exists(md_path):
-            # If file is still not found, we can't load values
-            console = Console()
-            console.print("[bold yellow]Warning: js8call_settings_values.md not found, valid values information will not be available[/bold yellow]")
-            return
-    
-    # Parse the markdown file to extract settings and their valid values
+# Bump when the cached structure of parsed documentation changes
+DOC_CACHE_VERSION = 1
+
+def get_snapshot_store_path(store=None):
+    """Return the snapshot store directory: the given one, or the default under the data directory."""
+    return Path(store) if store else get_data_dir() / "snapshots"
+
+def parse_setting_values(text):
+    """Parse the settings values markdown text into a dict of setting -> values info."""
+    setting_values = {}
     current_category = None
     in_table = False
     
-    with open(md_path, "r") as f:
-        lines = f.readlines()
-        
-    for line in lines:
+    for line in text.splitlines():
         line = line.strip()
         
         # Check for category headers
@@ -263,66 +281,300 @@ def load_setting_values():
                 description = parts[2].strip()
                 
                 # Store in our dictionary
-                SETTING_VALUES[setting] = {
+                setting_values[setting] = {
                     "category": current_category,
                     "values": values,
                     "description": description
                 }
+    
+    return setting_values
+
+def load_cached_doc(doc_path, parse, cache_dir=None):
+    """Return the parsed form of a documentation file, using an on-disk cache when it is current.
+    
+    The cache entry is keyed by the file's size, mtime and SHA-256 digest, so the
+    file is only re-parsed after it changes. Cache failures fall back to parsing.
+    """
+    import hashlib
+    import pickle
+    
+    with open(doc_path, "rb") as f:
+        data = f.read()
+    stat = os.stat(doc_path)
+    cache_key = (DOC_CACHE_VERSION, stat.st_size, stat.st_mtime_ns, hashlib.sha256(data).hexdigest())
+    
+    cache_path = Path(cache_dir or get_cache_dir()) / (Path(doc_path).stem + ".pickle")
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, parsed = pickle.load(f)
+        if cached_key == cache_key:
+            return parsed
+    except Exception:
+        # Missing, stale or unreadable cache - parse the file instead
+        pass
+    
+    parsed = parse(data.decode("utf-8"))
+    
+    # Write the new entry atomically so a concurrent launch never sees a partial file
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            pickle.dump((cache_key, parsed), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # A read-only or missing cache directory only costs us the re-parse next time
+        pass
+    
+    return parsed
+
+@traced()
+def load_setting_values(cache_dir=None):
+    """Load valid values and formats for settings from the JS8Call settings values markdown file."""
+    # Find the markdown file relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    md_path = os.path.join(script_dir, "docs", "js8call_settings_values.md")
+    
+    if not os.path.exists(md_path):
+        # Try with parent directory
+        md_path = os.path.join(script_dir, "..", "docs", "js8call_settings_values.md")
+        if not os.path.exists(md_path):
+            # If file is still not found, we can't load values
+            console_print("[bold yellow]Warning: js8call_settings_values.md not found, valid values information will not be available[/bold yellow]")
+            return
+    
+    # Parse the markdown file (or reuse the cached parse) to extract settings and their valid values
+    SETTING_VALUES.update(load_cached_doc(md_path, parse_setting_values, cache_dir))
+
+class _SubstringAutomaton:
+    """Aho-Corasick automaton that finds which of a fixed set of patterns occur in a text."""
+    
+    def __init__(self, patterns):
+        # Trie transitions, failure links and the lowest pattern index ending at each node
+        self._goto = [{}]
+        self._fail = [0]
+        self._first = [None]
+        
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._first.append(None)
+                node = next_node
+            if self._first[node] is None:
+                self._first[node] = index
+        
+        # Breadth-first pass to wire failure links and inherit matches through them
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                inherited = self._first[self._fail[child]]
+                if inherited is not None and (self._first[child] is None or inherited < self._first[child]):
+                    self._first[child] = inherited
+                queue.append(child)
+    
+    def first_match(self, text):
+        """Return the lowest index of a pattern contained in text, or None."""
+        goto, fail, first = self._goto, self._fail, self._first
+        best = first[0]
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found = first[node]
+            if found is not None and (best is None or found < best):
+                best = found
+        return best
+
+class SettingMetadataIndex:
+    """Lookup index over a documentation table keyed by setting name.
+    
+    Resolves a setting key to the documented name it matches, in the same order
+    of preference as a linear scan: exact match, case-insensitive match, then the
+    first documented name that contains or is contained in the key (ignoring case).
+    Results are memoized per key.
+    """
+    
+    def __init__(self, mapping, partial=True):
+        self._mapping = mapping
+        self._partial = partial
+        # Tables are built on first lookup (and rebuilt if the mapping changes size)
+        self._size = None
+    
+    def _build(self):
+        """(Re)build the lookup tables from the current contents of the mapping."""
+        names = list(self._mapping)
+        lowered = [name.lower() for name in names]
+        
+        self._size = len(names)
+        self._cache = {}
+        self._names = names
+        self._by_lower = {}
+        for name, name_lower in zip(names, lowered):
+            self._by_lower.setdefault(name_lower, name)
+        
+        if self._partial:
+            # Documented names that occur inside a key
+            self._contained = _SubstringAutomaton(lowered)
+            # All documented names joined, to find names that contain a key with one search
+            self._haystack = "\n".join(lowered)
+            self._offsets = []
+            offset = 0
+            for name_lower in lowered:
+                self._offsets.append(offset)
+                offset += len(name_lower) + 1
+    
+    def _first_containing(self, key_lower):
+        """Return the index of the first documented name containing key_lower, or None."""
+        if "\n" in key_lower:
+            # A key with a separator could match across two names; fall back to a scan
+            for index, name in enumerate(self._names):
+                if key_lower in name.lower():
+                    return index
+            return None
+        
+        position = self._haystack.find(key_lower)
+        if position == -1:
+            return None
+        return bisect.bisect_right(self._offsets, position) - 1
+    
+    def resolve(self, key):
+        """Return the documented name that key matches, or None."""
+        if len(self._mapping) != self._size:
+            # The mapping was modified (e.g. reloaded) since the index was built
+            self._build()
+        
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        
+        # Try to find an exact match first
+        if key in self._mapping:
+            match = key
+        else:
+            # Try case-insensitive match
+            key_lower = key.lower()
+            match = self._by_lower.get(key_lower)
+            
+            # Try to find a partial match in either direction
+            if match is None and self._partial:
+                candidates = [
+                    index for index in (self._contained.first_match(key_lower), self._first_containing(key_lower))
+                    if index is not None
+                ]
+                if candidates:
+                    match = self._names[min(candidates)]
+        
+        self._cache[key] = match
+        return match
+
+class SettingClassifier:
+    """Assigns each setting key its category and key-setting flag in one memoized pass.
+    
+    Categories come from a case-insensitive match against KEY_SETTINGS first, then
+    from the first name-pattern rule whose token occurs in the key, and default to
+    "Other Settings". A key is a key setting when any KEY_SETTINGS name occurs in it.
+    """
+    
+    def __init__(self, key_settings, name_patterns):
+        self._key_settings_table = key_settings
+        self._name_patterns = name_patterns
+        self._cache = {}
+        self._results = {}
+        # The matchers are compiled on the first cache miss
+        self._by_lower = None
+    
+    def _build(self):
+        """Compile the lookup tables from KEY_SETTINGS and the name-pattern rules."""
+        key_settings = self._key_settings_table
+        name_patterns = self._name_patterns
+        
+        # Case-insensitive exact names, first category wins
+        self._by_lower = {}
+        for category, settings in key_settings.items():
+            for setting in settings:
+                self._by_lower.setdefault(setting.lower(), category)
+        
+        # Name-pattern tokens in rule order, so the lowest token index is the first rule
+        tokens = []
+        self._token_categories = []
+        for category, rule_tokens in name_patterns:
+            for token in rule_tokens:
+                tokens.append(token)
+                self._token_categories.append(category)
+        self._patterns = _SubstringAutomaton(tokens)
+        
+        # Key-setting names are matched case-sensitively
+        self._key_settings = _SubstringAutomaton(
+            [setting for settings in key_settings.values() for setting in settings]
+        )
+    
+    def classify_key(self, key):
+        """Return the (category, is_key_setting) pair for a setting key."""
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        
+        if self._by_lower is None:
+            self._build()
+        
+        key_lower = key.lower()
+        category = self._by_lower.get(key_lower)
+        if category is None:
+            # If not found, try to guess based on name patterns
+            token = self._patterns.first_match(key_lower)
+            category = "Other Settings" if token is None else self._token_categories[token]
+        
+        result = (category, self._key_settings.first_match(key) is not None)
+        # Only a few distinct pairs exist, so every cached key shares one tuple per pair
+        result = self._cache[key] = self._results.setdefault(result, result)
+        return result
+    
+    def classify(self, keys):
+        """Return the (category, is_key_setting) pairs for a batch of setting keys."""
+        cache = self._cache
+        classify_key = self.classify_key
+        return [cache[key] if key in cache else classify_key(key) for key in keys]
+
+# Indexes over the documentation tables, built once on first use
+SETTING_VALUES_INDEX = SettingMetadataIndex(SETTING_VALUES, partial=False)
+SETTING_DESCRIPTIONS_INDEX = SettingMetadataIndex(SETTING_DESCRIPTIONS)
+SETTING_CLASSIFIER = SettingClassifier(KEY_SETTINGS, CATEGORY_NAME_PATTERNS)
 
 def get_setting_values(key):
     """Get the valid values/format for a setting."""
-    # Try to find an exact match first
-    if key in SETTING_VALUES:
-        return SETTING_VALUES[key]
-    
-    # Try case-insensitive match
-    key_lower = key.lower()
-    for setting_key, values in SETTING_VALUES.items():
-        if setting_key.lower() == key_lower:
-            return values
+    match = SETTING_VALUES_INDEX.resolve(key)
     
     # Return None if no match found
-    return None
+    if match is None:
+        return None
+    return SETTING_VALUES[match]
 
 def is_documented_setting(key):
     """Check if a setting is documented in js8call_ini_file_structure.md."""
-    # Check for exact match
-    if key in SETTING_DESCRIPTIONS:
-        return True
-    
-    # Check for case-insensitive match
-    key_lower = key.lower()
-    for setting_key in SETTING_DESCRIPTIONS.keys():
-        if setting_key.lower() == key_lower:
-            return True
-    
-    # Check for partial match in documented settings
-    for setting_key in SETTING_DESCRIPTIONS.keys():
-        if setting_key.lower() in key_lower or key_lower in setting_key.lower():
-            return True
-    
-    # Not documented
-    return False
+    return SETTING_DESCRIPTIONS_INDEX.resolve(key) is not None
 
 def get_setting_description(key):
     """Get a comprehensive description for a setting."""
-    # Try to find an exact match first
-    if key in SETTING_DESCRIPTIONS:
-        return SETTING_DESCRIPTIONS[key]
-    
-    # Try case-insensitive match
-    key_lower = key.lower()
-    for setting_key, description in SETTING_DESCRIPTIONS.items():
-        if setting_key.lower() == key_lower:
-            return description
-    
-    # Try to find a partial match
-    for setting_key, description in SETTING_DESCRIPTIONS.items():
-        if setting_key.lower() in key_lower or key_lower in setting_key.lower():
-            return description
+    match = SETTING_DESCRIPTIONS_INDEX.resolve(key)
     
     # Default description if nothing matches
-    return "Configuration setting for JS8Call"
+    if match is None:
+        return "Configuration setting for JS8Call"
+    return SETTING_DESCRIPTIONS[match]
 
 def get_default_ini_path():
     """Get the default path to JS8Call.ini based on the operating system."""
@@ -338,6 +590,7 @@ def get_default_ini_path():
         # Linux path: ~/.config/JS8Call/js8call.ini
         return Path(os.path.expanduser("~/.config/JS8Call/js8call.ini"))
 
+@traced()
 def find_js8call_ini_file():
     """Attempt to find the JS8Call.ini file in standard locations."""
     # Get the default path based on OS
@@ -374,8 +627,12 @@ def find_js8call_ini_file():
     # If we got here, no file was found
     return None
 
+@traced()
 def read_js8call_ini(file_path=None):
-    """Read the JS8Call.ini file from the specified location or default."""
+    """Read the JS8Call.ini file from the specified location or default.
+    
+    Returns an (IniFile, path) tuple, or (None, None) if the file can't be read.
+    """
     if file_path:
         ini_path = Path(file_path)
     else:
@@ -383,31 +640,26 @@ def read_js8call_ini(file_path=None):
         ini_path = find_js8call_ini_file()
         
         if ini_path is None:
-            console = Console()
-            console.print("[bold red]Error: JS8Call.ini file not found in any standard location[/bold red]")
-            console.print("[bold yellow]Please specify the path manually with the -f option[/bold yellow]")
+            console_print(
+                "[bold red]Error: JS8Call.ini file not found in any standard location[/bold red]",
+                "[bold yellow]Please specify the path manually with the -f option[/bold yellow]",
+            )
             return None, None
     
     if not ini_path.exists():
-        console = Console()
-        console.print(f"[bold red]Error: JS8Call.ini file not found at {ini_path}[/bold red]")
+        console_print(f"[bold red]Error: JS8Call.ini file not found at {ini_path}[/bold red]")
         return None, None
     
-    config = configparser.ConfigParser()
     try:
-        config.read(ini_path)
+        config = IniFile.from_path(ini_path)
         return config, str(ini_path)
     except Exception as e:
-        console = Console()
-        console.print(f"[bold red]Error reading config file: {e}[/bold red]")
+        console_print(f"[bold red]Error reading config file: {e}[/bold red]")
         return None, None
 
 def is_key_setting(key):
     """Check if a key is in our list of key settings."""
-    for category in KEY_SETTINGS.values():
-        if any(setting in key for setting in category):
-            return True
-    return False
+    return SETTING_CLASSIFIER.classify_key(key)[1]
 
 def get_category_for_key(key):
     """Get the category a key belongs to."""
@@ -418,720 +670,424 @@ def get_category_for_key(key):
 
 def get_setting_category(key):
     """Determine which category a setting belongs to."""
-    # Check if it's in one of our defined categories
-    for category, settings in KEY_SETTINGS.items():
-        # Try exact match first
-        if key in settings:
-            return category
-        
-        # Try case-insensitive match
-        key_lower = key.lower()
-        if any(s.lower() == key_lower for s in settings):
-            return category
-    
-    # If not found, try to guess based on name patterns
-    key_lower = key.lower()
-    if "color" in key_lower:
-        return "Color Settings"
-    elif "font" in key_lower:
-        return "Display Settings"
-    elif "sound" in key_lower or "audio" in key_lower:
-        return "Audio Settings"
-    elif "waterfall" in key_lower or "plot" in key_lower:
-        return "Waterfall Settings"
-    elif "ptt" in key_lower or "rig" in key_lower or "cat" in key_lower or "radio" in key_lower:
-        return "Radio Settings"
-    elif "udp" in key_lower or "tcp" in key_lower or "server" in key_lower or "aprs" in key_lower:
-        return "Network Settings"
-    elif "heartbeat" in key_lower or "hb" in key_lower:
-        return "Heartbeat Settings"
-    elif "decode" in key_lower:
-        return "Decode Settings"
-    elif "auto" in key_lower or "whitelist" in key_lower or "blacklist" in key_lower:
-        return "Automation Settings"
-    
-    # Default
-    return "Other Settings"
+    return SETTING_CLASSIFIER.classify_key(key)[0]
 
+@traced()
 def organize_settings_by_category(config):
     """Organize all settings from the config into our standard categories."""
     categorized_settings = {category: {} for category in STANDARD_CATEGORIES}
     categorized_settings["Other Settings"] = {}  # For anything not categorized
     
-    # Go through each section and setting, assigning to the appropriate category
-    for section in config.sections():
-        for key, value in config[section].items():
-            category = get_setting_category(key)
-            categorized_settings[category][key] = value
+    # Gather every setting, then classify all the keys at once
+    items = [item for section in config.sections() for item in config[section].items()]
+    classified = SETTING_CLASSIFIER.classify([key for key, _ in items])
+    
+    # Assign each setting to the appropriate category
+    for (key, value), (category, _) in zip(items, classified):
+        categorized_settings[category][key] = value
     
     # Remove empty categories
     return {k: v for k, v in categorized_settings.items() if v}
 
-class SettingValuesScreen(ModalScreen):
-    """Modal screen to display valid values and format for a setting."""
+@traced()
+def organize_setting_records(config):
+    """Organize the config's displayed settings into {category: [SettingRecord]}.
+    
+    Categories come in the standard order with "Other Settings" last, and each
+    list is sorted by key. As in organize_settings_by_category, a key found in
+    several sections shows the value from the last one; shadowed values are
+    never decoded.
+    """
+    return dict(iter_setting_records(config))
+
+def iter_setting_records(config):
+    """Yield (category, [SettingRecord]) like organize_setting_records, each category as soon as it is sorted."""
+    # Key -> the section its displayed value comes from
+    sections = {}
+    for section in config.sections():
+        entries = config[section]
+        sections.update(dict.fromkeys(entries, entries))
+    keys = list(sections)
+    
+    # Build the records in file order, which decodes the values sequentially, then sort them
+    grouped = {}
+    for key, (category, is_key) in zip(keys, SETTING_CLASSIFIER.classify(keys)):
+        entries = sections[key]
+        grouped.setdefault(category, []).append(SettingRecord(key, entries[key], is_key, entries.name, category))
+    for category in STANDARD_CATEGORIES + ["Other Settings"]:
+        if category in grouped:
+            records = grouped[category]
+            records.sort(key=RECORD_KEY)
+            yield category, records
+
+class SettingRecord:
+    """A displayed setting with the metadata needed to act on it.
+    
+    The UI keeps exactly one record per setting: category lists, table rows and
+    the search index all share the same objects. Section and category names are
+    interned (shared by every record), so each record only adds its key and
+    value. Records order by key, and documentation is looked up on access from
+    the memoized indexes.
+    """
     
-    BINDINGS = [
-        # Any key will dismiss this screen
-        Binding("escape", "dismiss", "Back"),
-        Binding("q", "dismiss", "Back"),
-    ]
+    __slots__ = ("key", "value", "is_key", "section", "category")
     
-    def __init__(self, setting_key, setting_value, setting_values):
-        super().__init__()
-        self.setting_key = setting_key
-        self.setting_value = setting_value
-        self.setting_values = setting_values
-        
-    def compose(self) -> ComposeResult:
-        """Create child widgets for the values screen."""
-        # Create a simple modal dialog with the setting information
-        with Vertical(id="values-dialog"):
-            yield Static(f"Valid Values for: [bold]{self.setting_key}[/bold]", id="values-title")
-            
-            with ScrollableContainer(id="values-content"):
-                if self.setting_values:
-                    # Format the values information nicely
-                    values_text = f"[bold underline]Valid Values/Format:[/bold underline]\n{self.setting_values['values']}\n\n"
-                    values_text += f"[bold underline]Description:[/bold underline]\n{self.setting_values['description']}\n\n"
-                    values_text += f"[bold underline]Current Value:[/bold underline]\n{self.setting_value}"
-                    
-                    yield Static(values_text)
-                else:
-                    yield Static("No valid values information available for this setting.")
-            
-            yield Static("Press any key to close", id="values-footer")
+    def __init__(self, key, value, is_key=False, section=None, category=None):
+        self.key = key
+        self.value = value
+        self.is_key = is_key
+        self.section = section
+        self.category = category
     
-    def on_key(self, event: events.Key) -> None:
-        """Handle key press events - any key dismisses this screen."""
-        # Dismiss the screen
-        self.dismiss()
-        
-        # We still want to allow navigation keys to be processed after dismissal
-        # So we don't prevent default
-        event.prevent_default = False
-
-class SettingTable(DataTable):
-    """A data table for displaying configuration settings."""
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.add_column("Setting", width=30)  # Slightly reduce setting column width
-        self.add_column("Value")  # Remove fixed width to let it expand to fill available space
-        self.cursor_type = "row"  # Ensure entire row is highlighted
-
-    def update_category_settings(self, category_settings, category_name, show_all=False):
-        """Update the table with settings from the given category."""
-        self.clear()
-        
-        if not category_settings:
-            return
-            
-        # Sort the keys for better display
-        for key, value in sorted(category_settings.items()):
-            # Skip undocumented settings if show_all is False
-            if not show_all and not is_documented_setting(key):
-                continue
-            
-            # Format value for better display
-            if len(value) > 100:
-                # For very long values, use rich text that can wrap nicely
-                display_value = Text(value)
-                display_value.no_wrap = False
-            else:
-                display_value = value
-                
-            # Highlight key settings
-            key_style = "bold" if is_key_setting(key) else ""
-            
-            # Add the row with styling
-            self.add_row(
-                Text(key, style=key_style), 
-                display_value
-            )
+    def __repr__(self):
+        return f"SettingRecord({self.key!r}, {self.value!r}, section={self.section!r}, category={self.category!r})"
     
-    # Keep the original update_settings method for backward compatibility
-    def update_settings(self, config_section, section_name, show_all=False):
-        """Update the table with settings from the given section (kept for backward compatibility)."""
-        self.clear()
-        
-        if not config_section:
-            return
-            
-        # Sort the keys for better display
-        for key, value in sorted(config_section.items()):
-            # Skip undocumented settings if show_all is False
-            if not show_all and not is_documented_setting(key):
-                continue
-            
-            # Format value for better display
-            if len(value) > 100:
-                # For very long values, use rich text that can wrap nicely
-                display_value = Text(value)
-                display_value.no_wrap = False
-            else:
-                display_value = value
-                
-            # Highlight key settings
-            key_style = "bold" if is_key_setting(key) else ""
-            
-            # Add the row with styling
-            self.add_row(
-                Text(key, style=key_style), 
-                display_value
-            )
-
-class DescriptionArea(Static):
-    """Multiline area for displaying setting descriptions."""
+    def __lt__(self, other):
+        return self.key < other.key
     
-    def update_description(self, key="", value="", description=""):
-        """Update the description area with information about a setting."""
-        if not key:
-            self.update("")
-            return
-        
-        # Get description if not provided
-        if not description:
-            description = get_setting_description(key)
-        
-        # Create multiline display focusing on description
-        if description:
-            # Fix for safer text splitting - always use integers for slicing
-            description_length = len(description)
-            
-            # For short descriptions, just display as-is
-            if description_length <= 100:
-                formatted_text = f"[bold]{description}[/bold]"
-            else:
-                # For longer descriptions, split into 3 lines with proper sentence/word breaks
-                # Calculate approximately how many chars per line (aiming for 3 lines)
-                chars_per_line = description_length // 3
-                
-                # Find first break point at a sentence or word boundary
-                first_break = description.find(". ", 0, int(chars_per_line * 1.5))
-                if first_break == -1:
-                    # No sentence break found, try word break
-                    first_break = description.rfind(" ", int(chars_per_line * 0.8), int(chars_per_line * 1.2))
-                    if first_break == -1:
-                        # Still no good break, just use the calculated position
-                        first_break = chars_per_line
-                
-                # Find second break point
-                second_break = description.find(". ", first_break + 1, int(first_break + chars_per_line * 1.5))
-                if second_break == -1:
-                    # No sentence break found, try word break
-                    second_break = description.rfind(" ", int(first_break + chars_per_line * 0.8), 
-                                                  int(first_break + chars_per_line * 1.2))
-                    if second_break == -1:
-                        # Still no good break, just use first_break + chars_per_line
-                        second_break = first_break + chars_per_line
-                
-                # Make sure our break points are good integers
-                first_break = max(0, int(first_break))
-                second_break = max(first_break + 1, int(second_break))
-                
-                # Extract our 3 lines, handling punctuation at the break points
-                line1 = description[:first_break + (2 if first_break < len(description)-2 and 
-                                                 description[first_break:first_break+2] == ". " else 1)]
-                line2 = description[first_break + (2 if first_break < len(description)-2 and 
-                                                 description[first_break:first_break+2] == ". " else 1):second_break + 
-                                  (2 if second_break < len(description)-2 and 
-                                   description[second_break:second_break+2] == ". " else 1)]
-                line3 = description[second_break + (2 if second_break < len(description)-2 and 
-                                                 description[second_break:second_break+2] == ". " else 1):]
-                
-                # Format the text
-                formatted_text = f"[bold]{line1}[/bold]\n{line2}\n{line3}"
-            
-            self.update(formatted_text)
-        else:
-            # Fallback if no description
-            self.update("No detailed information available for this setting.")
-
-class SettingsView(Screen):
-    """Main screen for the JS8Call Configuration Viewer."""
-    
-    BINDINGS = [
-        Binding("q", "quit", "Quit"),
-        Binding("h", "focus_categories", "Categories"),
-        Binding("l", "focus_settings", "Settings"),
-        Binding("j", "next_setting", "Next"),
-        Binding("k", "prev_setting", "Previous"),
-        Binding("tab", "toggle_focus", "Toggle Focus"),
-        Binding("f1", "help", "Help"),
-        Binding("v", "show_values", "Values"),
-    ]
+    @property
+    def description(self):
+        return get_setting_description(self.key)
     
-    def __init__(self, config, config_path, show_all=False):
-        super().__init__()
-        self.config = config
-        self.config_path = config_path
-        self.show_all = show_all
-        self.current_category = None
-        self.categories = []
-        self.categorized_settings = organize_settings_by_category(config)
-        
-    def compose(self) -> ComposeResult:
-        """Create child widgets for the app."""
-        yield Header(show_clock=True)
-        
-        with Horizontal():
-            # Category sidebar (20% of width)
-            with Vertical(id="sidebar", classes="sidebar"):
-                yield Static("Categories", id="sidebar-header", classes="sidebar-header")
-                yield ListView(*[], id="categories-list")
-            
-            # Settings display (80% of width)
-            with Vertical(id="settings-area"):
-                yield Static("", id="section-title", classes="section-title")
-                with ScrollableContainer(id="table-container"):
-                    yield SettingTable(id="settings-table")
-        
-        # Description area above the status bar
-        yield DescriptionArea("", id="description-area", classes="description-area")
-        
-        # Status bar and footer - status bar acts as the separator
-        yield Static("", id="status-bar", classes="status-bar")
-        yield Footer()
-    
-    def on_mount(self) -> None:
-        """Set up the application when it first starts."""
-        # Populate the categories list
-        categories_list = self.query_one("#categories-list", ListView)
-        
-        # Create list items for each non-empty category in our standard order
-        items = []
-        for category in STANDARD_CATEGORIES:
-            if category in self.categorized_settings and self.categorized_settings[category]:
-                self.categories.append(category)
-                items.append(ListItem(Label(category)))
-        
-        # Add "Other Settings" at the end if it has any items
-        if "Other Settings" in self.categorized_settings and self.categorized_settings["Other Settings"]:
-            self.categories.append("Other Settings")
-            items.append(ListItem(Label("Other Settings")))
-        
-        # Add items one by one
-        for item in items:
-            categories_list.append(item)
-        
-        # Select the first category by default
-        if self.categories:
-            self.current_category = self.categories[0]
-            self.update_table()
-            
-            # First select and focus the categories list to ensure proper highlighting
-            categories_list.focus()
-            if len(categories_list.children) > 0:
-                # This will highlight the first item when we have focus
-                categories_list.index = 0  # Set index to first item
-            
-            # Then move focus to the table, leaving the category highlighted
-            table = self.query_one("#settings-table")
-            table.focus()
-            
-            # Make sure the first row is highlighted in the table
-            if table.row_count > 0:
-                # Move cursor to first row
-                table.move_cursor(row=0, column=0)
-                # Trigger description update for the first row
-                self.update_selected_row_description()
-    
-    def update_selected_row_description(self):
-        """Update the description area based on the currently selected row in the table."""
-        table = self.query_one("#settings-table")
-        # Safety check - make sure we have rows and a valid cursor position
-        if table.row_count > 0 and 0 <= table.cursor_row < table.row_count:
-            # Get the actual row key at the current cursor position
-            try:
-                # Try to get row key from cursor position
-                row_key = list(table.rows.keys())[table.cursor_row]
-                row = table.get_row(row_key)
-                
-                # Update description area with the full description
-                if row:
-                    setting_key = str(row[0])
-                    setting_value = str(row[1])
-                    description = get_setting_description(setting_key)
-                    
-                    # Update description area
-                    description_area = self.query_one("#description-area", DescriptionArea)
-                    description_area.update_description(setting_key, setting_value, description)
-            except (IndexError, KeyError):
-                # Handle any issues gracefully
-                pass
-    
-    def update_table(self):
-        """Update the settings table with data from the current category."""
-        if not self.current_category or self.current_category not in self.categorized_settings:
-            return
-        
-        # Update section title
-        section_title = self.query_one("#section-title", Static)
-        section_title.update(f"Category: {self.current_category}")
-        
-        # Update table data
-        table = self.query_one("#settings-table", SettingTable)
-        category_settings = self.categorized_settings[self.current_category]
-        table.update_category_settings(category_settings, self.current_category, self.show_all)
-        
-        # Update status bar with compact file path and author credit
-        setting_count = len(table.rows)
-        status_bar = self.query_one("#status-bar", Static)
-        
-        # Compact info with file path and subtle author credit
-        status_msg = f" File: {self.config_path} [dim]• By Tiran Dagan[/dim]"
-        status_bar.update(status_msg)
-        
-        # Clear description area
-        description_area = self.query_one("#description-area", DescriptionArea)
-        description_area.update_description()
-        
-        # Show description of first setting if available
-        if table.row_count > 0:
-            try:
-                # Get the first row key
-                first_row_key = list(table.rows.keys())[0]
-                row = table.get_row(first_row_key)
-                
-                if row:
-                    setting_key = str(row[0])
-                    setting_value = str(row[1])
-                    description = get_setting_description(setting_key)
-                    description_area.update_description(setting_key, setting_value, description)
-            except (IndexError, KeyError):
-                # Handle case where row access fails
-                pass
-    
-    def on_list_view_selected(self, event: ListView.Selected) -> None:
-        """Handle selection of a category in the list."""
-        if isinstance(event.item, ListItem):
-            # Find the index of the selected item
-            list_view = self.query_one("#categories-list")
-            items = list(list_view.children)
-            if event.item in items:
-                index = items.index(event.item)
-                if 0 <= index < len(self.categories):
-                    self.current_category = self.categories[index]
-                    self.update_table()
-                    
-                    # Focus on the table after selecting a category
-                    self.query_one("#settings-table").focus()
-    
-    def on_key(self, event: events.Key) -> None:
-        """Handle key press events."""
-        # Check if we're focused on the table and it's a navigation key
-        if self.focused and self.focused.id == "settings-table":
-            if event.key in ("up", "down", "j", "k", "home", "end", "page_up", "page_down"):
-                # Let the key be processed normally
-                event.prevent_default = False
-                # Update the description area after a short delay to allow the cursor to move
-                self.set_timer(0.05, self.update_selected_row_description)
-            else:
-                # Allow other keys to be processed normally
-                event.prevent_default = False
-    
-    def action_focus_categories(self) -> None:
-        """Focus on the categories list."""
-        self.query_one("#categories-list").focus()
-    
-    def action_focus_settings(self) -> None:
-        """Focus on the settings table."""
-        self.query_one("#settings-table").focus()
-    
-    def action_next_setting(self) -> None:
-        """Move to the next setting."""
-        table = self.query_one("#settings-table")
-        if table.cursor_row < len(table.rows) - 1:
-            table.move_cursor(row_offset=1)
-            self.update_selected_row_description()
-    
-    def action_prev_setting(self) -> None:
-        """Move to the previous setting."""
-        table = self.query_one("#settings-table")
-        if table.cursor_row > 0:
-            table.move_cursor(row_offset=-1)
-            self.update_selected_row_description()
-    
-    def action_toggle_focus(self) -> None:
-        """Toggle focus between categories and settings."""
-        if self.focused.id == "categories-list":
-            self.query_one("#settings-table").focus()
-        else:
-            self.query_one("#categories-list").focus()
+    @property
+    def documented(self):
+        return is_documented_setting(self.key)
+    
+    @property
+    def valid_values(self):
+        return get_setting_values(self.key)
 
-    def action_show_values(self) -> None:
-        """Show the valid values screen for the current setting."""
-        # Get the current setting from the table
-        table = self.query_one("#settings-table")
-        
-        # Make sure the table has focus and there are rows
-        if table.row_count > 0 and 0 <= table.cursor_row < table.row_count:
-            try:
-                # Get the current row at cursor position
-                row_key = list(table.rows.keys())[table.cursor_row]
-                row = table.get_row(row_key)
-                
-                if row:
-                    setting_key = str(row[0])
-                    setting_value = str(row[1])
-                    setting_values = get_setting_values(setting_key)
-                    
-                    # Show the values screen as a modal dialog
-                    values_screen = SettingValuesScreen(setting_key, setting_value, setting_values)
-                    self.app.push_screen(values_screen)
-            except (IndexError, KeyError):
-                # Handle any issues gracefully
-                pass
+# Sort key for lists of SettingRecords
+RECORD_KEY = attrgetter("key")
 
-    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
-        """Handle selection of a setting in the table."""
-        if event.row_key is None:
-            return
-            
-        table = self.query_one("#settings-table")
-        row = table.get_row(event.row_key)
-        
-        # Update description area with the full description
-        if row:
-            setting_key = str(row[0])
-            setting_value = str(row[1])
-            description = get_setting_description(setting_key)
-            
-            # Update description area
-            description_area = self.query_one("#description-area", DescriptionArea)
-            description_area.update_description(setting_key, setting_value, description)
+def find_setting_record(records, key):
+    """Return the index of a key in records sorted by key, or where it would be inserted."""
+    low, high = 0, len(records)
+    while low < high:
+        middle = (low + high) // 2
+        if records[middle].key < key:
+            low = middle + 1
+        else:
+            high = middle
+    return low
 
-class HelpScreen(Screen):
-    """Help screen for the application."""
-    
-    BINDINGS = [
-        Binding("escape", "app.pop_screen", "Back"),
-        Binding("q", "app.pop_screen", "Back")
-    ]
+def command_get(args):
+    """Print the settings matching a key or glob pattern without starting the TUI."""
+    config, config_path = read_js8call_ini(args.file)
+    if config is None:
+        return 2
+    
+    categorized_settings = organize_settings_by_category(config)
+    pattern = args.pattern.lower()
+    category_filter = args.category.lower() if args.category else None
+    
+    # Keys are matched case-insensitively, categories by name or name prefix
+    matches = []
+    for category, settings in categorized_settings.items():
+        if category_filter and not category.lower().startswith(category_filter):
+            continue
+        for key, value in sorted(settings.items()):
+            if fnmatch.fnmatchcase(key.lower(), pattern):
+                matches.append((category, key, value))
+    
+    if args.json:
+        import json
+        records = [
+            {
+                "key": key,
+                "value": value,
+                "category": category,
+                "description": get_setting_description(key),
+                "documented": is_documented_setting(key),
+            }
+            for category, key, value in matches
+        ]
+        print(json.dumps(records, indent=2, ensure_ascii=False))
+    elif len(matches) == 1 and not any(char in args.pattern for char in "*?["):
+        # A single exact key prints just its value, for easy use in scripts
+        print(matches[0][2])
+    else:
+        for category, key, value in matches:
+            print(f"{key}={value}")
     
-    def compose(self) -> ComposeResult:
-        """Create child widgets for the help screen."""
-        yield Static("JS8Call Configuration Viewer - Help", id="help-title")
-        
-        with ScrollableContainer():
-            yield Static("""
-Keyboard Shortcuts:
------------------
-[Tab]    - Toggle focus between categories and settings
-[h]      - Focus on categories
-[l]      - Focus on settings
-[j]      - Move to next setting
-[k]      - Move to previous setting
-[Enter]  - Select item
-[F1]     - Show/hide this help
-[v]      - Show valid values for current setting
-[q]      - Quit application
-
-About this application:
----------------------
-This tool displays JS8Call settings from your js8call.ini file with descriptions 
-of what each setting does and how it affects JS8Call's behavior.
+    return 0 if matches else 1
 
-The left sidebar shows configuration categories, and the right panel displays 
-the settings in the selected category.
+def command_export(args):
+    """Export many ini files to JSON-lines/CSV using a pool of worker processes."""
+    from js8call_export import run_export
+    return run_export(args)
 
-By default, only documented settings are shown. If you launched with --all, 
-all settings including undocumented ones will be shown.
+def command_export_sqlite(args):
+    """Load many ini files into an indexed SQLite database using a pool of worker processes."""
+    from js8call_sqlite import run_export_sqlite
+    return run_export_sqlite(args)
 
-The description area at the bottom shows detailed information about the 
-currently selected setting.
+def command_validate(args):
+    """Check the values in many ini files against the documented formats using a pool of worker processes."""
+    from js8call_validate import run_validate
+    return run_validate(args)
 
-Navigate with arrow keys or hjkl keys and select items with Enter.
+def command_diff(args):
+    """Show the settings that changed between two or more snapshots of an ini file."""
+    if len(args.paths) < 2:
+        console_print("[bold red]Error: diff needs at least two ini files[/bold red]")
+        return 2
+    
+    if not args.tui:
+        from js8call_diff import run_diff
+        return run_diff(args)
+    
+    for path in args.paths:
+        if not os.path.isfile(path):
+            console_print(f"[bold red]Error: JS8Call.ini file not found at {path}[/bold red]")
+            return 2
+    
+    from js8call_tui import JS8CallConfigViewer
+    app = JS8CallConfigViewer(show_all=args.all, diff_paths=args.paths)
+    app.run()
+    return 0
 
-Copyright and Attribution:
-------------------------
-© 2023-2024 Tiran Dagan (tiran@tirandagan.com)
-All rights reserved.
+def command_fleet(args):
+    """Show how each setting's values are spread across many station configs."""
+    from js8call_export import expand_paths
+    paths = list(expand_paths(args.paths))
+    if not paths:
+        console_print("[bold red]Error: no ini files found[/bold red]")
+        return 2
+    
+    if args.json:
+        from js8call_fleet import run_fleet_report
+        return run_fleet_report(paths, args.jobs, args.all)
+    
+    from js8call_tui import JS8CallConfigViewer
+    app = JS8CallConfigViewer(show_all=args.all, fleet_paths=paths, jobs=args.jobs)
+    app.run()
+    return 0
 
-This software is provided for educational and personal use only.
-Redistribution requires written permission from the author.
-            """, id="help-content")
-        
-        yield Button("Close", id="close-help")
+def command_snapshot(args):
+    """Store the current ini file in the snapshot store, if it changed since its last snapshot."""
+    config, config_path = read_js8call_ini(args.file)
+    if config is None:
+        return 2
+    
+    from js8call_history import SnapshotStore
+    store = SnapshotStore(get_snapshot_store_path(args.store))
+    source = args.name or os.path.abspath(config_path)
+    try:
+        snapshot, changes = store.add(config, source)
+    except (OSError, ValueError) as e:
+        console_print(f"[bold red]Error writing snapshot store {store.path}: {e}[/bold red]")
+        return 2
     
-    def on_button_pressed(self, event: Button.Pressed) -> None:
-        """Handle button press."""
-        if event.button.id == "close-help":
-            self.app.pop_screen()
+    if snapshot is None:
+        console_print(f"Unchanged since the last snapshot of {source}")
+    else:
+        console_print(f"Snapshot {snapshot['id']} of {source}: {changes} setting(s) changed")
+    return 0
 
-class JS8CallConfigViewer(App):
-    """Main application class."""
-    
-    CSS = """
-    Screen {
-        background: $surface;
-    }
-    
-    #sidebar {
-        width: 20%;
-        border-right: solid $primary;
-    }
-    
-    .sidebar-header {
-        background: $accent;
-        color: $text;
-        text-align: center;
-        text-style: bold;
-        padding: 1;
-    }
-    
-    #settings-area {
-        width: 80%;
-    }
-    
-    .section-title {
-        background: $accent;
-        color: $text;
-        text-align: center;
-        text-style: bold;
-        padding: 1;
-    }
-    
-    #settings-table {
-        height: 100%;
-        border: solid $primary;
-    }
-    
-    /* Make the second column (Value) expand to fill space */
-    .datatable--header-cell.column-1,
-    .datatable--cell.column-1 {
-        width: 1fr;
-    }
-    
-    #table-container {
-        height: 1fr;
-    }
-    
-    #categories-list {
-        border: none;
-        padding: 0 1;
-        background: $surface;
-        height: 1fr;
-    }
-    
-    .description-area {
-        padding: 0 1;
-        height: 3;
-        background: $boost;
-        color: $text;
-        border-top: none;
-    }
-    
-    .status-bar {
-        padding: 0;
-        background: $surface-lighten-1;
-        color: $text;
-        height: 1;
-        border-top: solid $primary;
-    }
-    
-    #help-title {
-        background: $accent;
-        color: $text;
-        text-align: center;
-        text-style: bold;
-        padding: 1;
-    }
-    
-    #help-content {
-        padding: 1 2;
-    }
-    
-    #close-help {
-        margin: 1 0;
-        dock: bottom;
-        width: 20;
-        align: center middle;
-    }
-    
-    #values-dialog {
-        width: 70%;
-        height: 70%;
-        border: solid $primary;
-        background: $surface;
-    }
-    
-    #values-title {
-        background: $accent;
-        color: $text;
-        text-align: center;
-        text-style: bold;
-        padding: 1;
-    }
-    
-    #values-content {
-        padding: 1 2;
-        height: 1fr;
-        overflow-y: auto;
-    }
-    
-    #values-footer {
-        background: $surface-lighten-1;
-        color: $text;
-        text-align: center;
-        padding: 1;
-        border-top: solid $primary;
-    }
-    
-    Header {
-        height: 1;
-        padding: 0;
-    }
-    
-    Footer {
-        height: 1;
-        padding: 0;
-    }
-    """
-    
-    BINDINGS = [
-        Binding("q", "quit", "Quit"),
-        Binding("f1", "show_help", "Help"),
-    ]
-    
-    def __init__(self, config_path=None, show_all=False):
-        super().__init__()
-        self.config_path = config_path
-        self.show_all = show_all
+def command_history(args):
+    """Print every value a setting had across the stored snapshots of an ini file."""
+    if args.name:
+        source = args.name
+    else:
+        config_path = args.file or find_js8call_ini_file()
+        if config_path is None:
+            console_print(
+                "[bold red]Error: JS8Call.ini file not found in any standard location[/bold red]",
+                "[bold yellow]Please specify the path manually with the -f option or the snapshot name with --name[/bold yellow]",
+            )
+            return 2
+        source = os.path.abspath(config_path)
+    
+    from js8call_history import SnapshotStore, format_time
+    store = SnapshotStore(get_snapshot_store_path(args.store))
+    versions = store.history(source, args.key, args.section)
+    
+    if args.json:
+        import json
+        record = {
+            "key": args.key,
+            "category": get_setting_category(args.key),
+            "description": get_setting_description(args.key),
+            "source": source,
+            "versions": [
+                {
+                    "snapshot": version.snapshot["id"],
+                    "captured": version.captured,
+                    "section": version.section,
+                    "value": version.value,
+                }
+                for version in versions
+            ],
+        }
+        print(json.dumps(record, indent=2, ensure_ascii=False))
+    else:
+        for version in versions:
+            value = "(removed)" if version.value is None else version.value
+            print(f"{format_time(version.captured)}  [{version.section}] {args.key}={value}")
     
-    def on_mount(self) -> None:
-        """Set up the application after it has been mounted."""
-        # Load valid values for settings
-        load_setting_values()
-        
-        # Read the config file
-        result = read_js8call_ini(self.config_path)
-        if result:
-            config, config_path = result
-            if config:
-                self.push_screen(SettingsView(config, config_path, self.show_all))
-            else:
-                self.exit()
-        else:
-            self.exit()
+    return 0 if versions else 1
+
+def command_serve(args):
+    """Keep ini files parsed in memory and answer queries about them over a Unix domain socket."""
+    import socket
+    if not hasattr(socket, "AF_UNIX"):
+        console_print("[bold red]Error: serve needs Unix domain sockets, which this platform lacks[/bold red]")
+        return 2
+    
+    paths = args.paths or [args.file or find_js8call_ini_file()]
+    for path in paths:
+        if path is None:
+            console_print(
+                "[bold red]Error: JS8Call.ini file not found in any standard location[/bold red]",
+                "[bold yellow]Please specify the path manually with the -f option[/bold yellow]",
+            )
+            return 2
+        if not os.path.isfile(path):
+            console_print(f"[bold red]Error: JS8Call.ini file not found at {path}[/bold red]")
+            return 2
+    
+    from js8call_query import get_socket_path
+    from js8call_serve import run_serve
+    return run_serve(get_socket_path(args.socket), [str(path) for path in paths])
+
+def command_query(args):
+    """Ask a running serve daemon for settings, search results, categories or invalid values.
     
-    def action_show_help(self) -> None:
-        """Show the help screen."""
-        self.push_screen(HelpScreen())
+    The installed command answers queries in js8call_query.main without importing
+    this module; this path serves `python js8call_config_viewer.py query` and
+    queries after global options.
+    """
+    from js8call_query import get_socket_path, run_query
+    return run_query(args, get_socket_path(args.socket))
 
-def main():
+def main(argv=None):
+    # Everything before this point is module import time
+    main_start = time.perf_counter()
+    
     # Set up command line arguments
     parser = argparse.ArgumentParser(description="JS8Call Configuration Viewer")
     parser.add_argument("-f", "--file", help="Path to JS8Call.ini file (auto-detected if not specified)")
     parser.add_argument("-a", "--all", action="store_true", help="Show all settings, including undocumented ones")
-    args = parser.parse_args()
-    
-    # Run the app
-    app = JS8CallConfigViewer(config_path=args.file, show_all=args.all)
-    app.run()
+    parser.add_argument("-w", "--watch", action="store_true", help="Reload and highlight settings when the file changes on disk")
+    parser.add_argument("--db", metavar="PATH", help="Browse a database written by export-sqlite (read-only); -f picks the file in it")
+    parser.add_argument("--latency-report", action="store_true", help="Print key-to-description latency statistics on exit")
+    parser.add_argument("--profile", metavar="PATH", help="Write a Chrome trace (chrome://tracing, Perfetto) of the startup and UI stages")
+    parser.add_argument("--cprofile", metavar="PATH", help="Write a cProfile dump (for pstats or snakeviz)")
+    parser.add_argument("--mem-report", action="store_true", help="Print retained and peak memory per stage on exit (slower: traces every allocation)")
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    
+    # Headless query command (never imports the UI stack)
+    get_parser = subparsers.add_parser("get", help="Print settings matching a key or glob pattern")
+    get_parser.add_argument("pattern", help="Setting key or glob pattern, e.g. MyCall or 'Heartbeat*' (case-insensitive)")
+    get_parser.add_argument("-f", "--file", default=argparse.SUPPRESS, help="Path to JS8Call.ini file (auto-detected if not specified)")
+    get_parser.add_argument("-c", "--category", help="Only match settings in this category (name or prefix, e.g. 'Network')")
+    get_parser.add_argument("--json", action="store_true", help="Print matches as JSON with category and description")
+    get_parser.set_defaults(handler=command_get)
+    
+    # Batch export of many ini files (e.g. a fleet of station backups)
+    export_parser = subparsers.add_parser("export", help="Export many ini files to JSON-lines or CSV")
+    export_parser.add_argument("paths", nargs="+", help="Ini files, directories (searched recursively) or glob patterns")
+    export_parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    export_parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Output format: one JSON object per file, or one CSV row per setting")
+    export_parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    export_parser.add_argument("--wide", metavar="PATH", help="Also write a wide CSV matrix with one row per file and one column per setting")
+    export_parser.add_argument("--chunk-size", type=int, default=8, help="Files handed to a worker at a time")
+    export_parser.set_defaults(handler=command_export)
+    
+    export_sqlite_parser = subparsers.add_parser("export-sqlite", help="Load many ini files into an indexed SQLite database")
+    export_sqlite_parser.add_argument("paths", nargs="+", help="Ini files, directories (searched recursively) or glob patterns")
+    export_sqlite_parser.add_argument("-o", "--output", required=True, help="Database file to write (replaced if it exists)")
+    export_sqlite_parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    export_sqlite_parser.add_argument("--chunk-size", type=int, default=64, help="Files handed to a worker at a time")
+    export_sqlite_parser.set_defaults(handler=command_export_sqlite)
+    
+    # Value checks for station audits (e.g. in CI)
+    validate_parser = subparsers.add_parser("validate", help="Check setting values in ini files against their documented formats")
+    validate_parser.add_argument("paths", nargs="+", help="Ini files, directories (searched recursively) or glob patterns")
+    validate_parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    validate_parser.add_argument("--chunk-size", type=int, default=64, help="Files handed to a worker at a time")
+    validate_parser.add_argument("--json", action="store_true", help="Print one JSON object per file with its invalid values")
+    validate_parser.set_defaults(handler=command_validate)
+    
+    # Differences between snapshots of an ini file (e.g. last week's backup and today's file)
+    diff_parser = subparsers.add_parser("diff", help="Show settings that changed between two or more ini files")
+    diff_parser.add_argument("paths", nargs="+", help="Ini files in order, oldest first; each is compared with the next")
+    diff_parser.add_argument("-a", "--all", action="store_true", default=argparse.SUPPRESS, help="Include undocumented settings")
+    diff_parser.add_argument("--json", action="store_true", help="Print the changes as JSON with category and description")
+    diff_parser.add_argument("--tui", action="store_true", help="Browse the changes in the full-screen interface")
+    diff_parser.set_defaults(handler=command_diff)
+    
+    # Aggregate view of a fleet of stations (e.g. a club's collected configs)
+    fleet_parser = subparsers.add_parser("fleet", help="Show each setting's values across many station ini files")
+    fleet_parser.add_argument("paths", nargs="+", help="Ini files, directories (searched recursively) or glob patterns")
+    fleet_parser.add_argument("-a", "--all", action="store_true", default=argparse.SUPPRESS, help="Include undocumented settings")
+    fleet_parser.add_argument("-j", "--jobs", type=int, default=None, help="Files read at once (default: a thread pool sized for the CPUs)")
+    fleet_parser.add_argument("--json", action="store_true", help="Print the distributions as JSON instead of opening the interface")
+    fleet_parser.set_defaults(handler=command_fleet)
+    
+    # Snapshot store with the history of every setting
+    snapshot_parser = subparsers.add_parser("snapshot", help="Store the ini file in the snapshot store if it changed")
+    snapshot_parser.add_argument("-f", "--file", default=argparse.SUPPRESS, help="Path to JS8Call.ini file (auto-detected if not specified)")
+    snapshot_parser.add_argument("--store", metavar="DIR", help="Snapshot store directory (default: in the per-user data directory)")
+    snapshot_parser.add_argument("--name", help="Name to file the snapshot under (default: the ini file's absolute path)")
+    snapshot_parser.set_defaults(handler=command_snapshot)
+    
+    history_parser = subparsers.add_parser("history", help="Print the values a setting had across stored snapshots")
+    history_parser.add_argument("key", help="Setting key, e.g. MyGrid (case-sensitive, as in the ini file)")
+    history_parser.add_argument("-f", "--file", default=argparse.SUPPRESS, help="Path to JS8Call.ini file (auto-detected if not specified)")
+    history_parser.add_argument("--store", metavar="DIR", help="Snapshot store directory (default: in the per-user data directory)")
+    history_parser.add_argument("--name", help="Snapshot name given to the snapshot command (default: the ini file's absolute path)")
+    history_parser.add_argument("--section", help="Only this ini section (default: every section with the key)")
+    history_parser.add_argument("--json", action="store_true", help="Print the versions as JSON with category and description")
+    history_parser.set_defaults(handler=command_history)
+    
+    # Long-running daemon for scripts and dashboards that poll settings, and its client
+    serve_parser = subparsers.add_parser("serve", help="Keep ini files parsed in memory and answer queries over a Unix socket")
+    serve_parser.add_argument("paths", nargs="*", help="Ini files to serve (default: the -f file or the auto-detected one)")
+    serve_parser.add_argument("-f", "--file", default=argparse.SUPPRESS, help="Path to JS8Call.ini file (auto-detected if not specified)")
+    serve_parser.add_argument("--socket", metavar="PATH", help="Socket path (default: js8call-config-viewer.sock in $XDG_RUNTIME_DIR)")
+    serve_parser.set_defaults(handler=command_serve)
+    
+    # Shared with the thin client, which parses queries without importing this module
+    from js8call_query import add_query_arguments
+    query_parser = subparsers.add_parser("query", help="Ask a running serve daemon (get, search, category, validate or files)")
+    add_query_arguments(query_parser, file_default=argparse.SUPPRESS)
+    query_parser.set_defaults(handler=command_query)
+    
+    args = parser.parse_args(argv)
+    
+    with profile_session(args.profile, args.cprofile, args.mem_report) as tracer:
+        if tracer:
+            tracer.add("import js8call_config_viewer", START_TIME, main_start)
+        
+        if args.command:
+            return args.handler(args)
+        
+        database_file = None
+        if args.db:
+            if args.watch:
+                console_print("[bold red]Error: --watch can't be used with --db, as exported databases don't change[/bold red]")
+                return 2
+            from js8call_sqlite import open_database_file
+            database_file = open_database_file(args.db, args.file)
+            if database_file is None:
+                return 2
+        
+        # Run the app
+        with span("import js8call_tui"):
+            from js8call_tui import JS8CallConfigViewer
+        app = JS8CallConfigViewer(config_path=args.file, show_all=args.all, watch=args.watch, latency_report=args.latency_report,
+                                  database_file=database_file)
+        app.run()
+    
+    if app.latency_monitor:
+        print(app.startup_summary(), file=sys.stderr)
+        print(app.latency_monitor.summary(), file=sys.stderr)
 
 if __name__ == "__main__":
     try:
-        main()
+        sys.exit(main())
     except KeyboardInterrupt:
         print("\nExiting by user request.")
-        sys.exit(0) 
\ No newline at end of file
+        sys.exit(0)
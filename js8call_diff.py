@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Per-setting differences between parsed js8call.ini files.
+
+Sections are compared by digest first (see IniFile.section_digest), so only
+sections that actually changed are walked key by key. A chain of snapshots is
+diffed pairwise, one step at a time, so long chains of large files never need
+more than two parsed files in memory.
+"""
+
+import json
+import sys
+from collections import namedtuple
+
+from js8call_config_viewer import (
+    SETTING_CLASSIFIER,
+    STANDARD_CATEGORIES,
+    get_setting_description,
+    is_documented_setting,
+    read_js8call_ini,
+)
+from js8call_ini import IniFile
+
+# Order categories are reported in
+DIFF_CATEGORIES = STANDARD_CATEGORIES + ["Other Settings"]
+
+class SettingChange(namedtuple("SettingChange", "section key old_value new_value")):
+    """One (section, key) that differs between two configs; a missing side is None."""
+    
+    __slots__ = ()
+    
+    @property
+    def kind(self):
+        """Return "added", "removed" or "changed"."""
+        if self.old_value is None:
+            return "added"
+        if self.new_value is None:
+            return "removed"
+        return "changed"
+    
+    def describe_change(self):
+        """Return a short one-line summary of the change in value."""
+        if self.old_value is None:
+            return f"added: {self.new_value}"
+        if self.new_value is None:
+            return f"removed (was {self.old_value})"
+        return f"{self.old_value} → {self.new_value}"
+
+def diff_configs(old_config, new_config):
+    """Return the SettingChanges between two configs, in section and key order."""
+    changes = []
+    old_sections = old_config.sections()
+    new_sections = new_config.sections()
+    
+    for section in old_sections + [section for section in new_sections if section not in old_config]:
+        if section in old_config and section in new_config:
+            if old_config.section_digest(section) == new_config.section_digest(section):
+                # Identical section - nothing to compare
+                continue
+        
+        old_entries = old_config[section] if section in old_config else {}
+        new_entries = new_config[section] if section in new_config else {}
+        
+        for key, old_value in old_entries.items():
+            new_value = new_entries.get(key)
+            if new_value != old_value:
+                changes.append(SettingChange(section, key, old_value, new_value))
+        
+        for key, new_value in new_entries.items():
+            if key not in old_entries:
+                changes.append(SettingChange(section, key, None, new_value))
+    
+    return changes
+
+def effective_setting(config, key):
+    """Return the (section, value) organize_settings_by_category shows for a key (the last section wins).
+    
+    Both are None if no section has the key.
+    """
+    found = None
+    for section in config.sections():
+        if key in config[section]:
+            found = section
+    if found is None:
+        return None, None
+    return found, config[found][key]
+
+def group_changes_by_category(changes, show_all=False):
+    """Group changes into {category: [SettingChange]} in the standard category order.
+    
+    Changes to undocumented settings are left out unless show_all is True.
+    Within a category, changes are sorted by key and then section.
+    """
+    if not show_all:
+        changes = [change for change in changes if is_documented_setting(change.key)]
+    
+    grouped = {}
+    classified = SETTING_CLASSIFIER.classify([change.key for change in changes])
+    for change, (category, _) in zip(changes, classified):
+        grouped.setdefault(category, []).append(change)
+    
+    return {
+        category: sorted(grouped[category], key=lambda change: (change.key, change.section))
+        for category in DIFF_CATEGORIES
+        if category in grouped
+    }
+
+class DiffChain:
+    """Diffs between consecutive snapshots of a config, computed when first asked for.
+    
+    Step i compares paths[i] with paths[i + 1]. Only the files of the most
+    recently computed step are kept parsed; the change lists of every step
+    computed so far are kept, since they are small.
+    """
+    
+    def __init__(self, paths, load=IniFile.from_path):
+        self.paths = list(paths)
+        self._load = load
+        self._configs = {}
+        self._steps = {}
+    
+    def __len__(self):
+        return max(0, len(self.paths) - 1)
+    
+    def config(self, index):
+        """Return the parsed snapshot at the given index."""
+        config = self._configs.get(index)
+        if config is None:
+            config = self._load(self.paths[index])
+            # Keep only the snapshot's neighbours, which the next step may share
+            self._configs = {i: c for i, c in self._configs.items() if abs(i - index) == 1}
+            self._configs[index] = config
+        return config
+    
+    def changes(self, step):
+        """Return the SettingChanges between snapshot step and snapshot step + 1."""
+        changes = self._steps.get(step)
+        if changes is None:
+            changes = self._steps[step] = diff_configs(self.config(step), self.config(step + 1))
+        return changes
+
+def change_record(category, change):
+    """Return the JSON-serializable form of a change."""
+    return {
+        "category": category,
+        "section": change.section,
+        "key": change.key,
+        "kind": change.kind,
+        "old_value": change.old_value,
+        "new_value": change.new_value,
+        "description": get_setting_description(change.key),
+    }
+
+def print_step(old_path, new_path, grouped, hidden, stream=sys.stdout):
+    """Print one step of a diff report, grouped by category."""
+    markers = {"added": "+", "removed": "-", "changed": "~"}
+    print(f"--- {old_path}", file=stream)
+    print(f"+++ {new_path}", file=stream)
+    if not grouped:
+        print("No differences", file=stream)
+    
+    for category, changes in grouped.items():
+        print(f"{category}:", file=stream)
+        for change in changes:
+            print(f"  {markers[change.kind]} {change.key} [{change.section}]: {change.describe_change()}", file=stream)
+            if is_documented_setting(change.key):
+                print(f"      {get_setting_description(change.key)}", file=stream)
+    
+    if hidden:
+        print(f"({hidden} undocumented changes hidden, use --all to show them)", file=stream)
+    print(file=stream)
+
+def run_diff(args):
+    """Run the headless diff command from parsed command-line arguments."""
+    show_all = getattr(args, "all", False)
+    steps = []
+    changed = False
+    
+    # Read the snapshots one at a time so only two are ever held in memory
+    previous, previous_path = read_js8call_ini(args.paths[0])
+    if previous is None:
+        return 2
+    for path in args.paths[1:]:
+        config, config_path = read_js8call_ini(path)
+        if config is None:
+            return 2
+        
+        changes = diff_configs(previous, config)
+        grouped = group_changes_by_category(changes, show_all)
+        changed = changed or bool(changes)
+        
+        if args.json:
+            records = [change_record(category, change) for category, group in grouped.items() for change in group]
+            steps.append({"old": previous_path, "new": config_path, "changes": records})
+        else:
+            hidden = len(changes) - sum(len(group) for group in grouped.values())
+            print_step(previous_path, config_path, grouped, hidden)
+        previous, previous_path = config, config_path
+    
+    if args.json:
+        print(json.dumps(steps, indent=2, ensure_ascii=False))
+    
+    # Like diff(1): 0 when identical, 1 when anything differs
+    return 1 if changed else 0
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Batch export of many js8call.ini files to JSON-lines or CSV.
+
+Files are parsed and categorized in a process pool and streamed to the output
+one record at a time, in input order. Only a bounded window of parsed files is
+held in memory, however many files are exported.
+"""
+
+import csv
+import glob
+import json
+import os
+import pickle
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from js8call_config_viewer import organize_settings_by_category, read_js8call_ini
+
+# Columns of the long CSV format (one row per setting per file)
+LONG_COLUMNS = ["file", "category", "key", "value"]
+
+def expand_paths(paths):
+    """Expand files, directories (searched recursively for *.ini) and glob patterns into ini files."""
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(path, "**", "*.ini"), recursive=True))
+        elif glob.has_magic(path):
+            matches = sorted(glob.glob(path, recursive=True))
+        else:
+            matches = [path]
+        
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                yield match
+
+def parse_file(path):
+    """Read and categorize one ini file into an export record."""
+    config, _ = read_js8call_ini(path)
+    if config is None:
+        return {"file": path, "error": "could not read file", "settings": []}
+    
+    categorized_settings = organize_settings_by_category(config)
+    settings = [
+        (category, key, value)
+        for category, category_settings in categorized_settings.items()
+        for key, value in sorted(category_settings.items())
+    ]
+    return {"file": path, "error": None, "settings": settings}
+
+def parse_files(paths):
+    """Parse a chunk of files in a worker process."""
+    return [parse_file(path) for path in paths]
+
+def chunked(iterable, size):
+    """Yield lists of up to size items from an iterable."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_records(paths, jobs=None, chunk_size=8, process_chunk=parse_files, initializer=None):
+    """Yield a record per file, in input order, processing chunks of files in a pool of worker processes.
+    
+    process_chunk turns a list of paths into a list of records (by default export
+    records); initializer runs once in each worker process.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    chunks = chunked(paths, chunk_size)
+    
+    if jobs == 1:
+        # No pool - parse in this process (useful for debugging and tiny batches)
+        for chunk in chunks:
+            yield from process_chunk(chunk)
+        return
+    
+    # Keep a bounded window of chunks in flight so memory does not grow with the number of files
+    window = jobs * 2
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(process_chunk, chunk))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+class JsonLinesWriter:
+    """Writes one JSON object per file."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def write(self, record):
+        settings = [
+            {"category": category, "key": key, "value": value}
+            for category, key, value in record["settings"]
+        ]
+        line = {"file": record["file"], "error": record["error"], "settings": settings}
+        self.stream.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+class LongCsvWriter:
+    """Writes one CSV row per setting per file."""
+    
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.writer.writerow(LONG_COLUMNS)
+    
+    def write(self, record):
+        self.writer.writerows(
+            (record["file"], category, key, value) for category, key, value in record["settings"]
+        )
+
+class WideMatrixSpool:
+    """Builds the wide file-by-setting CSV matrix without keeping every file in memory.
+    
+    Records are spooled to a temporary file while the set of setting columns is
+    collected; the matrix is written in a second pass once all columns are known.
+    """
+    
+    def __init__(self):
+        self.columns = set()
+        self.spool = tempfile.TemporaryFile()
+    
+    def add(self, record):
+        values = {key: value for _, key, value in record["settings"]}
+        self.columns.update(values)
+        pickle.dump((record["file"], values), self.spool, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def write(self, stream):
+        columns = sorted(self.columns, key=str.lower)
+        writer = csv.DictWriter(stream, fieldnames=["file"] + columns, restval="")
+        writer.writeheader()
+        
+        self.spool.seek(0)
+        while True:
+            try:
+                path, values = pickle.load(self.spool)
+            except EOFError:
+                break
+            values["file"] = path
+            writer.writerow(values)
+        self.spool.close()
+
+def open_output(path):
+    """Open an output path for writing text, with "-" meaning stdout."""
+    if path in (None, "-"):
+        return sys.stdout, False
+    return open(path, "w", newline="", encoding="utf-8"), True
+
+def run_export(args):
+    """Run the export command from parsed command-line arguments."""
+    paths = list(expand_paths(args.paths))
+    if not paths:
+        print("No ini files matched the given paths", file=sys.stderr)
+        return 1
+    
+    output, close_output = open_output(args.output)
+    wide = WideMatrixSpool() if args.wide else None
+    writer = JsonLinesWriter(output) if args.format == "jsonl" else LongCsvWriter(output)
+    
+    failed = 0
+    try:
+        for record in iter_records(paths, args.jobs, args.chunk_size):
+            if record["error"]:
+                failed += 1
+            writer.write(record)
+            if wide:
+                wide.add(record)
+    finally:
+        if close_output:
+            output.close()
+    
+    if wide:
+        wide_output, close_wide = open_output(args.wide)
+        try:
+            wide.write(wide_output)
+        finally:
+            if close_wide:
+                wide_output.close()
+    
+    print(f"Exported {len(paths) - failed} of {len(paths)} files", file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Value distributions of each setting across a fleet of station configs.
+
+Station files are read and parsed by a pool of threads and handed back as each one
+finishes, in completion order, so one slow file (e.g. on a network share) never
+holds up the rest. A FleetAggregate takes the stations one at a time, so a
+view of it can be refreshed while loading is still under way.
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+
+from js8call_config_viewer import STANDARD_CATEGORIES, is_documented_setting, organize_setting_records
+from js8call_ini import IniFile
+
+# Order categories are listed in
+FLEET_CATEGORIES = STANDARD_CATEGORIES + ["Other Settings"]
+
+# Seconds between checks for cancellation while waiting on slow files
+CANCEL_POLL_INTERVAL = 0.1
+
+# Distinct values listed in a one-line summary before the rest are counted
+SUMMARY_VALUES = 4
+
+def station_names(paths):
+    """Return a short, unique display name per path: the path relative to their common directory."""
+    if len(paths) < 2:
+        return [os.path.basename(path) for path in paths]
+    common = os.path.commonpath([os.path.abspath(os.path.dirname(path)) for path in paths])
+    return [os.path.relpath(os.path.abspath(path), common) for path in paths]
+
+def load_stations(paths, jobs=None, cancelled=None):
+    """Yield (path, config, error) for every path as soon as its file has been parsed.
+    
+    Files are read by jobs daemon threads (by default as many as a
+    ThreadPoolExecutor would use). Daemon threads never hold up exiting, even
+    while stuck on an unresponsive network share. Exactly one of config (an
+    IniFile) and error (a message) is None. While waiting, cancelled() is
+    polled and loading stops once it returns True.
+    """
+    pending = queue.SimpleQueue()
+    for path in paths:
+        pending.put(path)
+    results = queue.SimpleQueue()
+    stop = threading.Event()
+    
+    def work():
+        while not stop.is_set():
+            try:
+                path = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results.put((path, IniFile.from_path(path), None))
+            except Exception as e:
+                results.put((path, None, str(e)))
+    
+    jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+    for _ in range(min(jobs, len(paths))):
+        threading.Thread(target=work, name="js8call-fleet", daemon=True).start()
+    
+    try:
+        remaining = len(paths)
+        while remaining:
+            try:
+                result = results.get(timeout=CANCEL_POLL_INTERVAL)
+            except queue.Empty:
+                if cancelled is not None and cancelled():
+                    return
+                continue
+            remaining -= 1
+            yield result
+    finally:
+        # Don't start on files nobody will look at any more
+        stop.set()
+
+class SettingDistribution:
+    """The values one setting takes across the stations that set it."""
+    
+    __slots__ = ("key", "category", "stations_by_value", "station_count")
+    
+    def __init__(self, key, category):
+        self.key = key
+        self.category = category
+        # Value -> stations with that value, in the order they were added
+        self.stations_by_value = {}
+        self.station_count = 0
+    
+    def add(self, station, value):
+        self.stations_by_value.setdefault(value, []).append(station)
+        self.station_count += 1
+    
+    def value_counts(self):
+        """Return [(value, count)], most common first and ties in value order."""
+        return sorted(
+            ((value, len(stations)) for value, stations in self.stations_by_value.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+    
+    @property
+    def majority_value(self):
+        """The value more stations use than any other, or None if no single value leads."""
+        counts = self.value_counts()
+        if not counts or (len(counts) > 1 and counts[1][1] == counts[0][1]):
+            return None
+        return counts[0][0]
+    
+    def deviating_stations(self):
+        """Return [(station, value)] for the stations whose value differs from the majority, by station.
+        
+        Without a majority value, no station is considered to deviate.
+        """
+        majority = self.majority_value
+        if majority is None:
+            return []
+        return sorted(
+            (station, value)
+            for value, stations in self.stations_by_value.items() if value != majority
+            for station in stations
+        )
+    
+    def summary(self, total_stations):
+        """Return a one-line summary, e.g. "3/4 • FN31 ×2, FN42 ×1"."""
+        counts = self.value_counts()
+        parts = [f"{value} ×{count}" for value, count in counts[:SUMMARY_VALUES]]
+        if len(counts) > SUMMARY_VALUES:
+            parts.append(f"+{len(counts) - SUMMARY_VALUES} more")
+        return f"{self.station_count}/{total_stations} • " + ", ".join(parts)
+
+class FleetAggregate:
+    """Per-setting value distributions over the stations added so far."""
+    
+    def __init__(self):
+        self.stations = []
+        # (station, error message) for files that could not be read
+        self.errors = []
+        # Category -> {key: SettingDistribution}
+        self.categories = {}
+    
+    def add_station(self, station, config):
+        """Add a parsed station config; return the categories whose settings changed."""
+        self.stations.append(station)
+        category_records = organize_setting_records(config)
+        for category, records in category_records.items():
+            distributions = self.categories.setdefault(category, {})
+            for record in records:
+                distribution = distributions.get(record.key)
+                if distribution is None:
+                    distribution = distributions[record.key] = SettingDistribution(record.key, category)
+                distribution.add(station, record.value)
+        return set(category_records)
+    
+    def add_error(self, station, message):
+        """Record a station whose file could not be read."""
+        self.errors.append((station, message))
+    
+    def get_visible_categories(self, show_all=False):
+        """Return the categories with settings to show, in the standard order."""
+        return [
+            category for category in FLEET_CATEGORIES
+            if category in self.categories and (show_all or any(map(is_documented_setting, self.categories[category])))
+        ]
+    
+    def category_settings(self, category, show_all=False):
+        """Return a category's SettingDistributions sorted by key (documented ones only unless show_all)."""
+        distributions = self.categories.get(category, {})
+        return [
+            distributions[key] for key in sorted(distributions)
+            if show_all or is_documented_setting(key)
+        ]
+
+def distribution_record(distribution, total_stations):
+    """Return the JSON-serializable form of a setting's distribution."""
+    return {
+        "category": distribution.category,
+        "key": distribution.key,
+        "stations": distribution.station_count,
+        "unset": total_stations - distribution.station_count,
+        "majority": distribution.majority_value,
+        "values": [
+            {"value": value, "count": count, "stations": sorted(distribution.stations_by_value[value])}
+            for value, count in distribution.value_counts()
+        ],
+        "deviating": [{"station": station, "value": value} for station, value in distribution.deviating_stations()],
+    }
+
+def run_fleet_report(paths, jobs=None, show_all=False, stream=sys.stdout):
+    """Print the fleet's per-setting distributions as JSON; returns 2 if any file could not be read."""
+    names = dict(zip(paths, station_names(paths)))
+    fleet = FleetAggregate()
+    for path, config, error in load_stations(paths, jobs):
+        if config is None:
+            fleet.add_error(names[path], error)
+        else:
+            fleet.add_station(names[path], config)
+    
+    total = len(fleet.stations)
+    report = {
+        "stations": sorted(fleet.stations),
+        "errors": [{"station": station, "error": error} for station, error in sorted(fleet.errors)],
+        "settings": [
+            distribution_record(distribution, total)
+            for category in fleet.get_visible_categories(show_all)
+            for distribution in fleet.category_settings(category, show_all)
+        ],
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False), file=stream)
+    return 2 if fleet.errors else 0
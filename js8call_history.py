@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Append-only store of js8call.ini snapshots with per-setting history.
+
+A store is a directory of four JSON-lines files that are only ever appended to:
+    
+    values.jsonl     [value id, text] for every distinct value ever seen
+    sections.jsonl   {"digest", "entries": {key: value id}} per distinct section content
+    index.jsonl      {"snapshot", "changes": [[section, key, value id or null]]}
+    snapshots.jsonl  {"id", "source", "captured", "sections": [[name, digest]]}
+
+Sections are addressed by the digest of their raw bytes (IniFile.section_digest),
+so a section that did not change since any earlier snapshot costs nothing to
+store and is never even decoded. Values are stored once however many sections
+and snapshots share them. The index records, per snapshot, only the settings
+whose value changed, so a setting's history is a dictionary lookup once the
+store is open, without touching old ini files.
+
+A snapshot line is written last; index lines of an interrupted snapshot are
+ignored when the store is read back, and its id is never reused. Writers hold
+an exclusive lock on the store's lock file and read what other processes
+appended before assigning ids, so several snapshots can be taken at once
+(e.g. one cron job per station).
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# Files of a store, in the order a snapshot writes to them
+VALUES_FILE = "values.jsonl"
+SECTIONS_FILE = "sections.jsonl"
+INDEX_FILE = "index.jsonl"
+SNAPSHOTS_FILE = "snapshots.jsonl"
+STORE_FILES = (VALUES_FILE, SECTIONS_FILE, INDEX_FILE, SNAPSHOTS_FILE)
+
+# Held exclusively while a snapshot is written
+LOCK_FILE = "lock"
+
+@contextmanager
+def locked(directory):
+    """Hold an exclusive lock on a store directory's lock file, waiting for other writers."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, LOCK_FILE), "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    # Retries for about 10 seconds before giving up, so keep waiting
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        # Closing the file releases the lock
+        yield
+
+class SettingVersion:
+    """One value a setting had, from the snapshot it first appeared in."""
+    
+    __slots__ = ("snapshot", "section", "value")
+    
+    def __init__(self, snapshot, section, value):
+        self.snapshot = snapshot
+        self.section = section
+        # None when the setting was removed in this snapshot
+        self.value = value
+    
+    @property
+    def captured(self):
+        """Seconds since the epoch when the snapshot was taken."""
+        return self.snapshot["captured"]
+
+class SnapshotStore:
+    """A directory of ini snapshots, read into memory on first use."""
+    
+    def __init__(self, path):
+        self.path = str(path)
+        self._loaded = False
+    
+    def _load(self):
+        """Read the store's files and build the in-memory indexes."""
+        if self._loaded:
+            return
+        self._values = []
+        self._value_ids = {}
+        self._sections = {}
+        self._snapshots = {}
+        self._latest = {}
+        # (source, section, key) -> [(snapshot id, value id or None)]
+        self._history = {}
+        # Index changes whose snapshot line hasn't been read (yet), by snapshot id
+        self._unmatched = {}
+        # Ids of interrupted snapshots are skipped, so their index lines never match a later one
+        self._next_id = 0
+        # Bytes of each file read so far
+        self._offsets = dict.fromkeys(STORE_FILES, 0)
+        self._loaded = True
+        self._refresh()
+    
+    def _read_new(self, name):
+        """Yield the records appended to one of the store's files since it was last read."""
+        try:
+            f = open(os.path.join(self.path, name), "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self._offsets[name])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Still being written, or cut short by a crash; the next read starts here again
+                    break
+                self._offsets[name] += len(line)
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A write cut short by a crash
+                    continue
+    
+    def _refresh(self):
+        """Read what was appended to the store since it was last read, e.g. by another process."""
+        for value_id, text in self._read_new(VALUES_FILE):
+            if value_id == len(self._values):
+                self._values.append(text)
+                self._value_ids[text] = value_id
+        
+        for record in self._read_new(SECTIONS_FILE):
+            self._sections[record["digest"]] = record["entries"]
+        
+        for snapshot in self._read_new(SNAPSHOTS_FILE):
+            self._add_snapshot(snapshot, self._unmatched.pop(snapshot["id"], []))
+        
+        for record in self._read_new(INDEX_FILE):
+            snapshot_id = record["snapshot"]
+            self._next_id = max(self._next_id, snapshot_id + 1)
+            snapshot = self._snapshots.get(snapshot_id)
+            if snapshot is None:
+                # The snapshot line is written last, or never if the snapshot was interrupted
+                self._unmatched.setdefault(snapshot_id, []).extend(record["changes"])
+            else:
+                self._add_changes(snapshot, record["changes"])
+    
+    def _add_snapshot(self, snapshot, changes):
+        self._snapshots[snapshot["id"]] = snapshot
+        self._latest[snapshot["source"]] = snapshot
+        self._next_id = max(self._next_id, snapshot["id"] + 1)
+        self._add_changes(snapshot, changes)
+    
+    def _add_changes(self, snapshot, changes):
+        for section, key, value_id in changes:
+            self._history.setdefault((snapshot["source"], section, key), []).append((snapshot["id"], value_id))
+    
+    def snapshots(self, source=None):
+        """Return the snapshots (of one source, if given) in the order they were taken."""
+        self._load()
+        return [snapshot for snapshot in self._snapshots.values() if source is None or snapshot["source"] == source]
+    
+    def sources(self):
+        """Return the sources with snapshots, in the order they were first snapshotted."""
+        self._load()
+        return list(dict.fromkeys(snapshot["source"] for snapshot in self._snapshots.values()))
+    
+    def add(self, config, source, captured=None):
+        """Store a snapshot of a parsed IniFile; return (snapshot or None if unchanged, changed settings)."""
+        self._load()
+        with locked(self.path):
+            # Ids continue from whatever other writers stored since this store was read
+            self._refresh()
+            return self._add_locked(config, source, captured)
+    
+    def _add_locked(self, config, source, captured):
+        sections = [(name, config.section_digest(name).hex()) for name in config.sections()]
+        previous = self._latest.get(source)
+        if previous is not None and [tuple(item) for item in previous["sections"]] == sections:
+            return None, 0
+        
+        previous_entries = {}
+        if previous is not None:
+            previous_entries = {name: self._sections[digest] for name, digest in previous["sections"]}
+        
+        new_values = []
+        new_sections = []
+        changes = []
+        for name, digest in sections:
+            old = previous_entries.pop(name, {})
+            entries = self._sections.get(digest)
+            if entries is None:
+                # New section content - store its values, decoding only this section
+                entries = {}
+                for key, value in config[name].items():
+                    value_id = self._value_ids.get(value)
+                    if value_id is None:
+                        value_id = self._value_ids[value] = len(self._values)
+                        self._values.append(value)
+                        new_values.append([value_id, value])
+                    entries[key] = value_id
+                self._sections[digest] = entries
+                new_sections.append({"digest": digest, "entries": entries})
+            
+            if entries is not old:
+                changes.extend([name, key, value_id] for key, value_id in entries.items() if old.get(key) != value_id)
+                changes.extend([name, key, None] for key in old if key not in entries)
+        
+        # Sections that disappeared remove all their settings
+        for name, old in previous_entries.items():
+            changes.extend([name, key, None] for key in old)
+        
+        snapshot = {
+            "id": self._next_id,
+            "source": source,
+            "captured": time.time() if captured is None else captured,
+            "sections": [list(item) for item in sections],
+        }
+        self._append(VALUES_FILE, new_values)
+        self._append(SECTIONS_FILE, new_sections)
+        self._append(INDEX_FILE, [{"snapshot": snapshot["id"], "changes": changes}])
+        self._append(SNAPSHOTS_FILE, [snapshot])
+        
+        self._add_snapshot(snapshot, changes)
+        return snapshot, len(changes)
+    
+    def _append(self, name, records):
+        """Append records to one of the store's files (with the store locked and just refreshed)."""
+        if not records:
+            return
+        text = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with open(os.path.join(self.path, name), "ab") as f:
+            if f.tell() > self._offsets[name]:
+                # A line cut short by a crash; end it so the new records start on a line of their own
+                text = "\n" + text
+            f.write(text.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            # Nobody else writes while the lock is held, and these records are already in memory
+            self._offsets[name] = f.tell()
+    
+    def history(self, source, key, section=None):
+        """Return a setting's SettingVersions in snapshot order, from every section unless one is given."""
+        self._load()
+        versions = []
+        sections = [section] if section else self._sections_with_key(source, key)
+        for name in sections:
+            for snapshot_id, value_id in self._history.get((source, name, key), ()):
+                value = None if value_id is None else self._values[value_id]
+                versions.append(SettingVersion(self._snapshots[snapshot_id], name, value))
+        versions.sort(key=lambda version: version.snapshot["id"])
+        return versions
+    
+    def _sections_with_key(self, source, key):
+        # Only a handful of sections ever exist, so checking each is cheap
+        names = {section for snapshot in self.snapshots(source) for section, _ in snapshot["sections"]}
+        return [name for name in sorted(names) if (source, name, key) in self._history]
+
+def format_time(seconds):
+    """Format a snapshot time for display."""
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(seconds))
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Single-pass reader for the QSettings INI dialect used by js8call.ini.
+
+Unlike configparser, keys keep their original case, values are never
+interpolated (so "%" is harmless), and values are not materialized as strings
+up front: the file is scanned once and each setting is stored as a compact
+(section, key, value offset, value length) record into the raw file bytes.
+Values are decoded only when they are read.
+"""
+
+import re
+import sys
+from array import array
+from collections.abc import Mapping
+
+# One match per section header or key=value line; comment and blank lines are skipped
+LINE_PATTERN = re.compile(
+    rb"^[ \t]*(?:\[(?P<section>[^\]\r\n]*)\][^\r\n]*|(?P<key>[^=\r\n;#\[][^=\r\n]*)=[ \t]*(?P<value>[^\r\n]*))",
+    re.MULTILINE,
+)
+
+# Whitespace bytes trimmed from the end of values
+TRAILING_WHITESPACE = (0x20, 0x09)
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+class IniSection(Mapping):
+    """Read-only mapping of key -> value for one section, decoding values on access."""
+    
+    def __init__(self, ini, name, entries):
+        self._ini = ini
+        self.name = name
+        self._entries = entries
+    
+    def __getitem__(self, key):
+        return self._ini.value_at(self._entries[key])
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __repr__(self):
+        return f"<IniSection: {self.name}>"
+
+class IniFile:
+    """A parsed QSettings INI file.
+    
+    Provides the subset of the configparser interface the viewer relies on
+    (sections(), has_section(), config[section].items()) on top of compact
+    per-setting records.
+    """
+    
+    def __init__(self, data):
+        if data.startswith(UTF8_BOM):
+            data = data[len(UTF8_BOM):]
+        self._data = data
+        
+        # Compact records, one per setting line, in file order
+        self._record_sections = array("I")
+        self._record_keys = []
+        self._value_offsets = array("Q")
+        self._value_lengths = array("Q")
+        
+        # Section name -> {key: record index}; a repeated key keeps its last value like QSettings
+        self._sections = {}
+        self._section_names = []
+        # Section name -> [(start, end)] byte ranges of its header and lines (more than one if the header repeats)
+        self._section_spans = {}
+        self._section_digests = {}
+        self._parse()
+    
+    @classmethod
+    def from_path(cls, path):
+        """Read and parse an ini file from disk."""
+        with open(path, "rb") as f:
+            return cls(f.read())
+    
+    def _parse(self):
+        """Scan the file once, recording sections and value locations."""
+        data = self._data
+        sections = self._sections
+        section_ids = {}
+        section_index = None
+        entries = None
+        section_spans = self._section_spans
+        span_start = 0
+        span_name = None
+        
+        record_sections = self._record_sections
+        record_keys = self._record_keys
+        value_offsets = self._value_offsets
+        value_lengths = self._value_lengths
+        
+        for match in LINE_PATTERN.finditer(data):
+            section = match.group("section")
+            if section is None and entries is None:
+                # Settings before any section header belong to [General], as in QSettings
+                section = b"General"
+            
+            if section is not None:
+                # Interned so every file (and every record built from it) shares one copy of each name
+                name = sys.intern(section.strip().decode("utf-8", "replace"))
+                if name not in sections:
+                    sections[name] = {}
+                    section_ids[name] = len(section_ids)
+                    self._section_names.append(name)
+                    section_spans[name] = []
+                if span_name is not None:
+                    section_spans[span_name].append((span_start, match.start()))
+                span_name = name
+                span_start = match.start() if entries is not None else 0
+                entries = sections[name]
+                section_index = section_ids[name]
+                if match.group("key") is None:
+                    continue
+            
+            start, end = match.span("value")
+            while end > start and data[end - 1] in TRAILING_WHITESPACE:
+                end -= 1
+            
+            # Keys are interned too, so reloaded and compared snapshots share them
+            key = sys.intern(match.group("key").strip().decode("utf-8", "replace"))
+            entries[key] = len(record_keys)
+            record_sections.append(section_index)
+            record_keys.append(key)
+            value_offsets.append(start)
+            value_lengths.append(end - start)
+        
+        if span_name is not None:
+            section_spans[span_name].append((span_start, len(data)))
+    
+    def value_at(self, index):
+        """Decode the value of the record at the given index."""
+        offset = self._value_offsets[index]
+        return self._data[offset:offset + self._value_lengths[index]].decode("utf-8", "replace")
+    
+    def section_digest(self, section):
+        """Return a digest of the raw bytes of a section, computed once per section.
+        
+        Two sections with equal digests hold the same settings, so diffs can skip
+        them without decoding or comparing a single value. (Sections that differ
+        only in whitespace or comments get different digests and are compared key
+        by key, which is slower but still correct.)
+        """
+        digest = self._section_digests.get(section)
+        if digest is None:
+            import hashlib
+            data = memoryview(self._data)
+            hasher = hashlib.blake2b(digest_size=16)
+            for start, end in self._section_spans[section]:
+                hasher.update(data[start:end])
+            digest = self._section_digests[section] = hasher.digest()
+        return digest
+    
+    def records(self):
+        """Yield (section, key, value offset, value length) for every setting line in file order."""
+        section_names = self._section_names
+        for index, key in enumerate(self._record_keys):
+            yield (section_names[self._record_sections[index]], key,
+                   self._value_offsets[index], self._value_lengths[index])
+    
+    def sections(self):
+        """Return the section names in file order."""
+        return list(self._sections)
+    
+    def has_section(self, section):
+        """Check whether the file has the given section."""
+        return section in self._sections
+    
+    def __contains__(self, section):
+        return section in self._sections
+    
+    def __getitem__(self, section):
+        return IniSection(self, section, self._sections[section])
+    
+    def __iter__(self):
+        return iter(self._sections)
+    
+    def __len__(self):
+        return len(self._sections)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Per-user directories of the JS8Call Configuration Viewer.
+
+Kept apart from js8call_config_viewer so the query client (see js8call_query)
+can find the default socket without importing the viewer.
+"""
+
+import os
+import platform
+from pathlib import Path
+
+def get_cache_dir():
+    """Get the per-user cache directory for this tool based on the operating system."""
+    system = platform.system()
+    
+    if system == "Windows":
+        # Windows path: %LOCALAPPDATA%\js8call-config-viewer\Cache
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return Path(base) / "js8call-config-viewer" / "Cache"
+    elif system == "Darwin":  # macOS
+        # macOS path: ~/Library/Caches/js8call-config-viewer
+        return Path(os.path.expanduser("~/Library/Caches/js8call-config-viewer"))
+    else:  # Linux and others
+        # Linux path: $XDG_CACHE_HOME/js8call-config-viewer (~/.cache by default)
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        return Path(base) / "js8call-config-viewer"
+
+def get_data_dir():
+    """Get the per-user data directory for this tool (e.g. the snapshot store) based on the operating system."""
+    system = platform.system()
+    
+    if system == "Windows":
+        # Windows path: %APPDATA%\js8call-config-viewer
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+        return Path(base) / "js8call-config-viewer"
+    elif system == "Darwin":  # macOS
+        # macOS path: ~/Library/Application Support/js8call-config-viewer
+        return Path(os.path.expanduser("~/Library/Application Support/js8call-config-viewer"))
+    else:  # Linux and others
+        # Linux path: $XDG_DATA_HOME/js8call-config-viewer (~/.local/share by default)
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        return Path(base) / "js8call-config-viewer"
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Opt-in profiling: named timing spans written as a Chrome trace, with optional memory accounting.
+
+The trace file opens in chrome://tracing or https://ui.perfetto.dev. Nothing is
+recorded until enable() is called; until then span() hands back a shared no-op
+context manager and @traced functions call straight through after a single
+global check, so the hooks cost next to nothing in normal runs.
+"""
+
+import functools
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Trace timestamps count from here, when the app's own modules start importing
+START_TIME = time.perf_counter()
+
+# The active Tracer, or None when profiling is off
+TRACER = None
+
+# Finished cProfile profiles of worker threads while --cprofile is on, else None
+THREAD_PROFILES = None
+
+# Appended to the memory report's name of a span recorded off the main thread
+BACKGROUND_LABEL = " [background]"
+
+class Tracer:
+    """Collects completed spans as Chrome trace events.
+    
+    With memory=True it also runs tracemalloc and records how much memory each
+    span retained (allocated and still alive when it ended) and its peak above
+    the starting point. Nested spans count towards their parents. tracemalloc
+    only keeps process-wide totals, so a span's figures include allocations by
+    other threads running at the same time; spans from background threads
+    (such as the main screen's loader) are labelled as such in the report.
+    """
+    
+    def __init__(self, memory=False):
+        import threading
+        
+        self.events = []
+        self.thread_names = {}
+        self.pid = os.getpid()
+        self._current_thread = threading.current_thread
+        self._main_thread = threading.main_thread()
+        
+        # Span name -> [calls, total retained bytes, largest peak bytes]
+        self.memory_stats = {}
+        # [start bytes, peak bytes] of every open span on any thread
+        self._open_memory = []
+        self._memory_lock = threading.Lock()
+        # Highest total seen, since resetting tracemalloc's peak for each span loses it
+        self._highest_peak = 0
+        self._tracemalloc = None
+        if memory:
+            import tracemalloc
+            tracemalloc.start()
+            self._tracemalloc = tracemalloc
+    
+    def add(self, name, start, end, args=None):
+        """Record a span from two time.perf_counter() readings."""
+        thread = self._current_thread()
+        self.thread_names[thread.ident] = thread.name
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start - START_TIME) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        # list.append is atomic, so worker threads can record spans too
+        self.events.append(event)
+    
+    def _note_peak(self):
+        """Fold the peak since the last reset into every open span and return the current total."""
+        current, peak = self._tracemalloc.get_traced_memory()
+        for memory in self._open_memory:
+            memory[1] = max(memory[1], peak)
+        self._highest_peak = max(self._highest_peak, peak)
+        return current
+    
+    def begin(self):
+        """Note the start of a span; pass the result to end()."""
+        memory = None
+        if self._tracemalloc:
+            with self._memory_lock:
+                # Keep the open spans' peaks (on every thread) before resetting it for this one
+                current = self._note_peak()
+                self._tracemalloc.reset_peak()
+                memory = [current, current]
+                self._open_memory.append(memory)
+        return time.perf_counter(), memory
+    
+    def end(self, name, state, args=None):
+        """Record a span started by begin()."""
+        end = time.perf_counter()
+        start, memory = state
+        if memory is not None:
+            with self._memory_lock:
+                current = self._note_peak()
+                index = next(index for index, open_memory in enumerate(self._open_memory) if open_memory is memory)
+                del self._open_memory[index]
+            
+            retained = current - memory[0]
+            peak = memory[1] - memory[0]
+            args = dict(args or (), retained_kb=round(retained / 1024), peak_kb=round(peak / 1024))
+            # The trace shows the thread itself, the memory report only the name
+            stats_name = name if self._current_thread() is self._main_thread else name + BACKGROUND_LABEL
+            stats = self.memory_stats.setdefault(stats_name, [0, 0, 0])
+            stats[0] += 1
+            stats[1] += retained
+            stats[2] = max(stats[2], peak)
+        self.add(name, start, end, args)
+    
+    def memory_summary(self):
+        """Return a table of retained and peak memory per span name, in first-call order."""
+        lines = [f"{'Stage':<40} {'calls':>6} {'retained':>10} {'peak':>10}"]
+        for name, (calls, retained, peak) in self.memory_stats.items():
+            lines.append(f"{name:<40} {calls:>6} {format_bytes(retained):>10} {format_bytes(peak):>10}")
+        if self._tracemalloc:
+            with self._memory_lock:
+                current = self._note_peak()
+            lines.append(
+                f"{'Total while profiling (now / peak)':<40} {'':>6} {format_bytes(current):>10} {format_bytes(self._highest_peak):>10}"
+            )
+        if any(name.endswith(BACKGROUND_LABEL) for name in self.memory_stats):
+            lines.append(f"{BACKGROUND_LABEL.strip()} stages ran in a worker thread; like every stage, they include allocations made meanwhile by other threads")
+        return "\n".join(lines)
+    
+    def close(self):
+        """Stop tracemalloc if this tracer started it."""
+        if self._tracemalloc:
+            self._tracemalloc.stop()
+    
+    def write(self, path):
+        """Write the trace as Chrome trace-event JSON."""
+        import json
+        
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f)
+
+def format_bytes(size):
+    """Format a byte count as a short human-readable string."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+class _Span:
+    """Context manager that records one span on exit."""
+    
+    __slots__ = ("tracer", "name", "args", "state")
+    
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+    
+    def __enter__(self):
+        self.state = self.tracer.begin()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.tracer.end(self.name, self.state, self.args)
+
+class _NullSpan:
+    """Context manager that does nothing, used while profiling is off."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+def span(name, **args):
+    """Return a context manager timing its block as a named span (a no-op unless profiling)."""
+    tracer = TRACER
+    if tracer is None:
+        return NULL_SPAN
+    return _Span(tracer, name, args)
+
+def traced(name=None):
+    """Decorator timing every call of a function as a span named after it."""
+    def decorate(function):
+        span_name = name or function.__qualname__
+        
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = TRACER
+            if tracer is None:
+                return function(*args, **kwargs)
+            state = tracer.begin()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                tracer.end(span_name, state)
+        
+        return wrapper
+    return decorate
+
+def since_start(name):
+    """Return the seconds since START_TIME, recording them as a span (e.g. time to first paint) if profiling."""
+    now = time.perf_counter()
+    tracer = TRACER
+    if tracer is not None:
+        tracer.add(name, START_TIME, now)
+    return now - START_TIME
+
+def enable(memory=False):
+    """Start recording spans (and memory use, if asked) and return the Tracer."""
+    global TRACER
+    TRACER = Tracer(memory)
+    return TRACER
+
+def disable():
+    """Stop recording spans."""
+    global TRACER
+    TRACER = None
+
+@contextmanager
+def profile_thread():
+    """Profile a block running in a worker thread with cProfile, if --cprofile is on.
+    
+    A cProfile profiler only sees the thread that enabled it, so worker threads
+    run their own; profile_session merges them into its dump.
+    """
+    profiles = THREAD_PROFILES
+    profiler = None
+    if profiles is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one profiler at a time, and the main one already sees every thread
+            profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiles.append(profiler)
+
+class profile_session:
+    """Context manager profiling the code it wraps, for --profile, --cprofile and --mem-report.
+    
+    Writes spans to a trace file and/or a cProfile dump, and prints per-span
+    memory use to stderr if mem_report is set. Any output may be left out; with
+    none asked for it does nothing. Entering it returns the Tracer, or None.
+    """
+    
+    def __init__(self, trace_path=None, cprofile_path=None, mem_report=False):
+        self.trace_path = trace_path
+        self.cprofile_path = cprofile_path
+        self.mem_report = mem_report
+        self.tracer = None
+        self.profiler = None
+    
+    def __enter__(self):
+        if self.trace_path or self.mem_report:
+            self.tracer = enable(memory=self.mem_report)
+        if self.cprofile_path:
+            import cProfile
+            global THREAD_PROFILES
+            THREAD_PROFILES = []
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        return self.tracer
+    
+    def __exit__(self, *exc_info):
+        if self.profiler is not None:
+            import pstats
+            global THREAD_PROFILES
+            self.profiler.disable()
+            stats = pstats.Stats(self.profiler)
+            # Worker threads that finished while profiling
+            for profiler in THREAD_PROFILES:
+                stats.add(profiler)
+            THREAD_PROFILES = None
+            stats.dump_stats(self.cprofile_path)
+        if self.tracer is not None:
+            disable()
+            if self.mem_report:
+                print(self.tracer.memory_summary(), file=sys.stderr)
+            self.tracer.close()
+            if self.trace_path:
+                self.tracer.write(self.trace_path)
+        return False
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Thin client for the serve daemon, and the command-line entry point.
+
+A query is only worth sending to the daemon if asking costs less than parsing
+the ini file. This module imports nothing but the standard library's socket
+and json (and argparse), and main() answers `query` commands before the
+viewer module (with its documentation tables, rich, the search and validation
+modules) is ever imported. Every other command is handed on to
+js8call_config_viewer.main.
+
+The protocol is described in js8call_serve.
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+
+OPERATIONS = ("get", "search", "category", "validate", "files")
+
+# Name of the default socket in the per-user runtime directory
+SOCKET_NAME = "js8call-config-viewer.sock"
+
+def get_socket_path(socket_path=None):
+    """Return the serve daemon's socket path: the given one, or the default in the per-user runtime directory."""
+    if socket_path:
+        return str(socket_path)
+    # $XDG_RUNTIME_DIR is private to the user and cleared at logout
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    from js8call_paths import get_cache_dir
+    return str(get_cache_dir() / "serve.sock")
+
+def print_error(message, hint=None):
+    """Print an error (and what to do about it) to stderr, without loading rich."""
+    print(f"Error: {message}", file=sys.stderr)
+    if hint:
+        print(hint, file=sys.stderr)
+
+def is_serving(socket_path):
+    """Check whether a server is already listening on a socket path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+class ServeClient:
+    """A connection to a serve daemon that can carry any number of requests."""
+    
+    def __init__(self, socket_path, timeout=10):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(str(socket_path))
+        except OSError:
+            self.sock.close()
+            raise
+        self.reader = self.sock.makefile("rb")
+    
+    def request(self, op, **params):
+        """Send one request and return the decoded response object."""
+        params["op"] = op
+        self.sock.sendall(json.dumps(params, ensure_ascii=False).encode() + b"\n")
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("the server closed the connection")
+        return json.loads(line)
+    
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def add_query_arguments(parser, file_default=None):
+    """Add the query command's arguments to an argparse parser."""
+    parser.add_argument("op", choices=OPERATIONS, help="What to ask for")
+    parser.add_argument("terms", nargs="*", help="Key or glob pattern (get), search text (search), category name (category), or a key and value to check (validate)")
+    parser.add_argument("-f", "--file", default=file_default, help="Which served file to ask about (default: the first one)")
+    parser.add_argument("-c", "--category", help="Only match settings in this category (get)")
+    parser.add_argument("--socket", metavar="PATH", help=f"Socket path (default: {SOCKET_NAME} in $XDG_RUNTIME_DIR)")
+    parser.add_argument("--json", action="store_true", help="Print the answer as JSON")
+
+def run_query(args, socket_path):
+    """Send one query to a serve daemon and print the answer like the matching command would."""
+    if not hasattr(socket, "AF_UNIX"):
+        print_error("query needs Unix domain sockets, which this platform lacks")
+        return 2
+    
+    terms = args.terms
+    request = {}
+    if args.op == "get":
+        if len(terms) != 1:
+            print_error("get needs one key or glob pattern")
+            return 2
+        request = {"pattern": terms[0], "category": args.category}
+    elif args.op == "search":
+        request = {"query": " ".join(terms)}
+    elif args.op == "category":
+        request = {"name": " ".join(terms)}
+    elif args.op == "validate":
+        if len(terms) not in (0, 2):
+            print_error("validate takes either nothing or a key and a value")
+            return 2
+        if terms:
+            request = {"key": terms[0], "value": terms[1]}
+    if getattr(args, "file", None):
+        # The server may run in another directory
+        request["file"] = os.path.abspath(args.file)
+    
+    try:
+        with ServeClient(socket_path) as client:
+            response = client.request(args.op, **request)
+    except (OSError, ValueError) as e:
+        print_error(f"could not query the server on {socket_path}: {e}", "Start it with: js8call-config-viewer serve")
+        return 2
+    if not response.get("ok"):
+        print_error(response.get("error"))
+        return 2
+    
+    result = response["result"]
+    listing = args.op == "files" or (args.op == "category" and not terms)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif args.op == "get" and len(result) == 1 and not any(char in terms[0] for char in "*?["):
+        # A single exact key prints just its value, as with get
+        print(result[0]["value"])
+    elif args.op == "files":
+        for entry in result:
+            loaded = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["loaded"]))
+            print(f"{entry['file']}: {entry['settings']} settings, loaded {loaded}")
+    elif listing:
+        for entry in result:
+            print(f"{entry['category']} ({entry['settings']})")
+    elif args.op == "validate" and terms:
+        print(result["problem"] or "valid")
+    elif args.op == "validate":
+        for problem in result:
+            print(f"[{problem['section']}] {problem['key']}={problem['value']}: {problem['problem']}")
+    else:
+        for record in result:
+            print(f"{record['key']}={record['value']}")
+    
+    # Like get and validate: 1 when nothing matches or a value is invalid
+    if args.op == "validate":
+        return 1 if (result["problem"] if terms else result) else 0
+    return 0 if listing or result else 1
+
+def main(argv=None):
+    """Entry point of the js8call-config-viewer command: answer queries here, hand anything else to the viewer."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] != ["query"]:
+        from js8call_config_viewer import main as viewer_main
+        return viewer_main(argv)
+    
+    import argparse
+    parser = argparse.ArgumentParser(prog="js8call-config-viewer query", description="Ask a running serve daemon")
+    add_query_arguments(parser)
+    args = parser.parse_args(argv[1:])
+    return run_query(args, get_socket_path(args.socket))
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\nExiting by user request.")
+        sys.exit(0)
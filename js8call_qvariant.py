@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Decoding of the typed values QSettings writes into js8call.ini.
+
+QSettings escapes non-ASCII characters (EOTCharacter=\\x2662), writes string
+lists as comma-separated values, and stores other types with an @ prefix:
+@ByteArray(...) for binary data such as window geometry, @Rect/@Size/@Point,
+and @Variant(...) for anything else, as a QDataStream-serialized QVariant.
+
+decode_value() turns a raw value into plain Python data (str, bytes, list,
+dict, int, ...), following QSettings' own rules. It is only called when a
+value is looked at, and results are kept in a bounded LRU cache. Types JS8Call
+registers itself (e.g. its frequency lists) are not self-describing, so they
+decode to an OpaqueValue holding the type name and raw bytes.
+"""
+
+import struct
+from functools import lru_cache
+
+# Decoded values kept by decode_value
+DECODE_CACHE_SIZE = 256
+
+# Characters that follow a backslash in QSettings escapes
+ESCAPES = {
+    "a": "\a", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v",
+    '"': '"', "'": "'", "?": "?", "\\": "\\", ";": ";", ",": ",", "=": "=",
+}
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+OCTAL_DIGITS = frozenset("01234567")
+
+# Nested @Variant data deeper than this is left undecoded
+MAX_DEPTH = 32
+
+# Type ids of the Qt 4.0 data stream format QSettings uses for @Variant, even in Qt 5
+QT_BOOL, QT_INT, QT_UINT, QT_LONGLONG, QT_ULONGLONG, QT_DOUBLE, QT_CHAR = 1, 2, 3, 4, 5, 6, 7
+QT_MAP, QT_LIST, QT_STRING, QT_STRINGLIST, QT_BYTEARRAY = 8, 9, 10, 11, 12
+QT_RECT, QT_SIZE, QT_POINT, QT_HASH, QT_COLOR, QT_USER, QT_FLOAT = 19, 21, 25, 28, 67, 127, 135
+
+class OpaqueValue:
+    """Data of a type only the application that wrote it knows how to read."""
+    
+    __slots__ = ("type_name", "data")
+    
+    def __init__(self, type_name, data):
+        self.type_name = type_name
+        self.data = data
+    
+    def __repr__(self):
+        return f"<{self.type_name}: {len(self.data)} bytes>"
+    
+    def __eq__(self, other):
+        return isinstance(other, OpaqueValue) and (self.type_name, self.data) == (other.type_name, other.data)
+
+class DataStreamError(ValueError):
+    """Raised for QDataStream data that is truncated or malformed."""
+
+def needs_decoding(raw):
+    """Check whether a raw value might decode to something other than itself."""
+    return raw.startswith("@") or any(char in raw for char in '\\",')
+
+def code_point(digits, base):
+    """Return the character for an escaped code, or U+FFFD if it is out of range."""
+    code = int(digits, base)
+    return chr(code) if code <= 0x10FFFF else "\ufffd"
+
+def unescape(raw):
+    """Split a raw QSettings value into its unescaped list elements, and whether it was a list.
+    
+    Mirrors QSettings: double quotes protect commas and edge spaces, and an
+    unquoted comma separates the elements of a string list.
+    """
+    elements = []
+    current = []
+    in_quotes = False
+    is_list = False
+    index = 0
+    length = len(raw)
+    while index < length:
+        char = raw[index]
+        index += 1
+        if char == "\\" and index < length:
+            char = raw[index]
+            index += 1
+            if char in ("x", "X"):
+                end = index
+                while end < length and raw[end] in HEX_DIGITS:
+                    end += 1
+                current.append(code_point(raw[index:end], 16) if end > index else "x")
+                index = end
+            elif char in OCTAL_DIGITS:
+                end = index
+                while end < length and raw[end] in OCTAL_DIGITS:
+                    end += 1
+                current.append(code_point(raw[index - 1:end], 8))
+                index = end
+            else:
+                current.append(ESCAPES.get(char, char))
+        elif char == '"':
+            in_quotes = not in_quotes
+        elif char == "," and not in_quotes:
+            is_list = True
+            elements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    elements.append("".join(current) if not is_list else "".join(current).strip())
+    return elements, is_list
+
+class DataStreamReader:
+    """Reads QDataStream data in the Qt 4.0 format (big-endian) from bytes."""
+    
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+    
+    def read(self, size):
+        end = self.offset + size
+        if end > len(self.data):
+            raise DataStreamError(f"data ends {end - len(self.data)} bytes early")
+        chunk = self.data[self.offset:end]
+        self.offset = end
+        return chunk
+    
+    def unpack(self, fmt):
+        values = struct.unpack(">" + fmt, self.read(struct.calcsize(">" + fmt)))
+        return values[0] if len(values) == 1 else values
+    
+    def read_bytes(self):
+        """Read a QByteArray (None when null)."""
+        size = self.unpack("I")
+        return None if size == 0xFFFFFFFF else self.read(size)
+    
+    def read_string(self):
+        """Read a QString (None when null)."""
+        data = self.read_bytes()
+        return None if data is None else data.decode("utf-16-be", "replace")
+    
+    def read_variant(self, depth=0):
+        """Read a QVariant and return its value."""
+        if depth > MAX_DEPTH:
+            raise DataStreamError("values nested too deeply")
+        # Streams older than Qt 4.2 have no is-null flag after the type
+        type_id = self.unpack("I")
+        if type_id == QT_USER:
+            type_name = (self.read_bytes() or b"").rstrip(b"\0").decode("latin-1")
+            # The layout is private to the application, so keep the rest as it is
+            return OpaqueValue(type_name, self.read(len(self.data) - self.offset))
+        return self.read_type(type_id, depth)
+    
+    def read_type(self, type_id, depth):
+        """Read the payload of a built-in type."""
+        if type_id == 0:
+            return None
+        if type_id == QT_BOOL:
+            return bool(self.unpack("B"))
+        if type_id in (QT_INT, QT_UINT, QT_LONGLONG, QT_ULONGLONG):
+            return self.unpack({QT_INT: "i", QT_UINT: "I", QT_LONGLONG: "q", QT_ULONGLONG: "Q"}[type_id])
+        if type_id == QT_DOUBLE:
+            return self.unpack("d")
+        if type_id == QT_FLOAT:
+            return self.unpack("f")
+        if type_id == QT_CHAR:
+            return chr(self.unpack("H"))
+        if type_id == QT_STRING:
+            return self.read_string()
+        if type_id == QT_BYTEARRAY:
+            return self.read_bytes()
+        if type_id == QT_STRINGLIST:
+            return [self.read_string() for _ in range(self.unpack("I"))]
+        if type_id == QT_LIST:
+            return [self.read_variant(depth + 1) for _ in range(self.unpack("I"))]
+        if type_id in (QT_MAP, QT_HASH):
+            return {self.read_string(): self.read_variant(depth + 1) for _ in range(self.unpack("I"))}
+        if type_id == QT_RECT:
+            left, top, right, bottom = self.unpack("iiii")
+            return {"x": left, "y": top, "width": right - left + 1, "height": bottom - top + 1}
+        if type_id == QT_SIZE:
+            width, height = self.unpack("ii")
+            return {"width": width, "height": height}
+        if type_id == QT_POINT:
+            x, y = self.unpack("ii")
+            return {"x": x, "y": y}
+        if type_id == QT_COLOR:
+            _, alpha, red, green, blue, _ = self.unpack("bHHHHH")
+            color = f"#{red >> 8:02x}{green >> 8:02x}{blue >> 8:02x}"
+            return color if alpha == 0xFFFF else f"{color} (alpha {alpha >> 8})"
+        return OpaqueValue(f"QMetaType {type_id}", self.read(len(self.data) - self.offset))
+
+def decode_typed(text):
+    """Decode one unescaped @-prefixed element."""
+    if text.startswith("@@"):
+        return text[1:]
+    name, _, rest = text[1:].partition("(")
+    if not rest.endswith(")"):
+        return text
+    inner = rest[:-1]
+    if name == "Invalid":
+        return None
+    if name == "String":
+        return inner
+    if name == "ByteArray":
+        return inner.encode("latin-1", "replace")
+    if name in ("Rect", "Size", "Point"):
+        fields = ("x", "y", "width", "height") if name == "Rect" else ("width", "height") if name == "Size" else ("x", "y")
+        numbers = inner.split()
+        if len(numbers) == len(fields) and all(number.lstrip("-").isdigit() for number in numbers):
+            return dict(zip(fields, map(int, numbers)))
+        return text
+    if name == "Variant":
+        try:
+            return DataStreamReader(inner.encode("latin-1", "replace")).read_variant()
+        except DataStreamError as e:
+            return OpaqueValue(f"unreadable QVariant ({e})", inner.encode("latin-1", "replace"))
+    return text
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def decode_value(raw):
+    """Decode a raw ini value into Python data; plain values come back unchanged."""
+    if not needs_decoding(raw):
+        return raw
+    elements, is_list = unescape(raw)
+    values = [decode_typed(element) if element.startswith("@") else element for element in elements]
+    return values if is_list else values[0]
+
+def describe_value(value):
+    """Return a short description of a decoded value's type and size."""
+    if isinstance(value, bytes):
+        return f"Binary data, {len(value):,} bytes"
+    if isinstance(value, list):
+        return f"List of {len(value):,} items"
+    if isinstance(value, dict):
+        return f"Map of {len(value):,} entries"
+    if isinstance(value, OpaqueValue):
+        return f"{value.type_name}, {len(value.data):,} bytes (not decodable)"
+    if value is None:
+        return "No value"
+    return type(value).__name__
+
+def format_value(value, limit=200):
+    """Format a decoded value on one line, cut to about limit characters."""
+    if isinstance(value, bytes):
+        text = value[:limit // 2].hex(" ")
+        return text + (" …" if len(value) > limit // 2 else "")
+    if isinstance(value, str):
+        text = value
+    else:
+        text = repr(value)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def is_structured(value):
+    """Check whether a decoded value has parts worth listing one per row."""
+    return isinstance(value, (bytes, list, dict, OpaqueValue))
+
+class DecodedItems:
+    """Sequence of (label, text) rows for the parts of a structured value, formatted on access.
+    
+    Only the rows that are actually displayed are ever formatted, so paging
+    through a list of a million items costs the same as through ten.
+    """
+    
+    # Bytes shown per row of binary data
+    BYTES_PER_ROW = 16
+    
+    def __init__(self, value):
+        if isinstance(value, OpaqueValue):
+            value = value.data
+        self._value = value
+        self._keys = list(value) if isinstance(value, dict) else None
+    
+    def __len__(self):
+        if isinstance(self._value, bytes):
+            return -(-len(self._value) // self.BYTES_PER_ROW)
+        return len(self._value)
+    
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        if isinstance(self._value, bytes):
+            offset = index * self.BYTES_PER_ROW
+            chunk = self._value[offset:offset + self.BYTES_PER_ROW]
+            text = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+            return f"{offset:08x}", f"{chunk.hex(' '):<{self.BYTES_PER_ROW * 3}}{text}"
+        if self._keys is not None:
+            key = self._keys[index]
+            return str(key), format_value(self._value[key])
+        return f"[{index}]", format_value(self._value[index])
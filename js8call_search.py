@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Incremental full-text search over settings, their values and their documentation.
+
+Each setting's own text (key and value) goes into a trigram inverted index.
+Documentation text (the description and the valid values/format) is shared by
+many settings, so it is stored once per distinct text and searched directly;
+a match there selects every setting that shares the text.
+"""
+
+from array import array
+
+from js8call_config_viewer import get_setting_description, get_setting_values, is_documented_setting
+
+# Own text longer than this (e.g. @ByteArray blobs) is not indexed but checked directly
+MAX_INDEXED_LENGTH = 256
+
+def trigrams(text):
+    """Return the set of three-character substrings of a string."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def documentation_text(key):
+    """Return the searchable documentation text of a setting."""
+    parts = []
+    if is_documented_setting(key):
+        parts.append(get_setting_description(key))
+    setting_values = get_setting_values(key)
+    if setting_values:
+        parts.append(setting_values["values"])
+        parts.append(setting_values["description"])
+    return "\n".join(parts)
+
+class SettingSearchIndex:
+    """Trigram index over SettingRecord table rows.
+    
+    search() returns the matching rows in the order they were given. A query
+    that contains the previous query (the usual case while typing) only
+    re-checks the previous results instead of consulting the index.
+    """
+    
+    def __init__(self, rows):
+        self.rows = list(rows)
+        
+        # Lowercased key/value text per row, and each row's documentation group
+        self._own_texts = []
+        self._doc_groups = array("I")
+        # Distinct documentation texts and the rows that share each
+        self._doc_texts = []
+        self._doc_rows = []
+        
+        # Trigram -> ascending row numbers; rows with long own text are listed separately
+        self._postings = {}
+        self._unindexed = array("I")
+        
+        self._last_query = None
+        self._last_results = None
+        self._build()
+    
+    def _build(self):
+        doc_group_ids = {}
+        postings = self._postings
+        
+        for index, record in enumerate(self.rows):
+            own_text = f"{record.key}\n{record.value}".lower()
+            self._own_texts.append(own_text)
+            
+            doc_text = documentation_text(record.key).lower()
+            group = doc_group_ids.get(doc_text)
+            if group is None:
+                group = doc_group_ids[doc_text] = len(self._doc_texts)
+                self._doc_texts.append(doc_text)
+                self._doc_rows.append(array("I"))
+            self._doc_groups.append(group)
+            self._doc_rows[group].append(index)
+            
+            if len(own_text) > MAX_INDEXED_LENGTH:
+                self._unindexed.append(index)
+                continue
+            for trigram in trigrams(own_text):
+                posting = postings.get(trigram)
+                if posting is None:
+                    posting = postings[trigram] = array("I")
+                posting.append(index)
+    
+    def __len__(self):
+        return len(self.rows)
+    
+    def _matches(self, query, index):
+        return query in self._own_texts[index] or query in self._doc_texts[self._doc_groups[index]]
+    
+    def _search_all(self, query):
+        """Return the ascending row numbers matching a query, using the index where it can."""
+        own_texts = self._own_texts
+        
+        if len(query) < 3:
+            # Too short for trigrams - scan the own texts
+            matches = {index for index, text in enumerate(own_texts) if query in text}
+        else:
+            # Intersect posting lists, smallest first, then confirm each candidate
+            postings = []
+            for trigram in trigrams(query):
+                posting = self._postings.get(trigram)
+                if posting is None:
+                    postings = []
+                    break
+                postings.append(posting)
+            
+            matches = set()
+            if postings:
+                postings.sort(key=len)
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    candidates.intersection_update(posting)
+                    if not candidates:
+                        break
+                matches = {index for index in candidates if query in own_texts[index]}
+            matches.update(index for index in self._unindexed if query in own_texts[index])
+        
+        # Add every row sharing a matching description
+        for group, text in enumerate(self._doc_texts):
+            if query in text:
+                matches.update(self._doc_rows[group])
+        return sorted(matches)
+    
+    def search(self, query):
+        """Return the rows matching a case-insensitive query; an empty query matches every row."""
+        query = query.lower()
+        if not query:
+            results = list(range(len(self.rows)))
+        elif self._last_query and self._last_query in query:
+            # The query grew, so only the previous results can still match
+            results = [index for index in self._last_results if self._matches(query, index)]
+        else:
+            results = self._search_all(query)
+        
+        self._last_query = query
+        self._last_results = results
+        rows = self.rows
+        return [rows[index] for index in results]
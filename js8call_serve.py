@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Query daemon keeping parsed js8call.ini files in memory behind a Unix domain socket.
+
+Scripts, cron jobs and dashboards that poll settings would otherwise start
+Python and re-parse the ini file on every call. The serve command parses,
+categorizes and indexes each file once, reloads it whenever it changes on disk
+(with the same FileWatcher as --watch) and answers queries from many clients at
+once, each connection in its own thread.
+
+The protocol is one JSON object per line in each direction. A request names
+an operation and its parameters; "file" picks one of the served files (the
+first one by default) and an optional "id" is echoed back:
+    
+    {"op": "get", "pattern": "MyCall"}
+    {"op": "search", "query": "heartbeat", "limit": 20}
+    {"op": "category", "name": "Network"}       (no name: list the categories)
+    {"op": "validate"}                          (or "key" and "value" to check a value)
+    {"op": "files"}
+
+and every response is {"ok": true, "result": ...} or {"ok": false, "error": message}.
+A connection can carry any number of requests, so a long-running client pays
+for connecting only once. The client (ServeClient and the query command) lives
+in js8call_query, which imports none of the modules the server needs.
+
+Every reload builds a new ServedConfig and swaps it in whole, so a request
+always sees one consistent version of a file without taking any lock.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import signal
+import socketserver
+import threading
+import time
+from functools import lru_cache
+
+from js8call_config_viewer import console_print, load_setting_values, organize_setting_records
+from js8call_ini import IniFile
+from js8call_search import SettingSearchIndex
+from js8call_query import OPERATIONS, is_serving
+from js8call_validate import validate_setting
+
+# Longest request line accepted, in bytes
+MAX_REQUEST_SIZE = 64 * 1024
+
+# Results returned by a search unless the request sets a limit
+DEFAULT_SEARCH_LIMIT = 100
+
+
+class RequestError(Exception):
+    """Raised for a request that can't be answered; the message goes back to the client."""
+
+def record_result(record):
+    """Return the JSON form of a SettingRecord, matching get --json."""
+    return {
+        "key": record.key,
+        "value": record.value,
+        "category": record.category,
+        "section": record.section,
+        "description": record.description,
+        "documented": record.documented,
+    }
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern):
+    """Compile a case-insensitive glob pattern, as the get command matches keys."""
+    return re.compile(fnmatch.translate(pattern.lower()))
+
+class ServedConfig:
+    """One parsed version of an ini file with the indexes the queries need."""
+    
+    def __init__(self, path, config, loaded=None):
+        self.path = path
+        self.loaded = time.time() if loaded is None else loaded
+        self.category_records = organize_setting_records(config)
+        self.records = [record for records in self.category_records.values() for record in records]
+        
+        # Lowercased key -> record, for exact lookups without a scan
+        self.by_key = {record.key.lower(): record for record in self.records}
+        self.problems = [
+            (record, problem)
+            for record in self.records
+            if (problem := validate_setting(record.key, record.value))
+        ]
+        self.search_index = SettingSearchIndex(self.records)
+        # The index remembers the previous query, so searches take turns
+        self._search_lock = threading.Lock()
+    
+    def get(self, pattern, category=None):
+        """Return the records whose key matches a key or glob pattern, optionally within a category."""
+        category_filter = category.lower() if category else None
+        if not any(char in pattern for char in "*?["):
+            record = self.by_key.get(pattern.lower())
+            records = [record] if record else []
+        else:
+            match = compile_pattern(pattern).match
+            records = [record for record in self.records if match(record.key.lower())]
+        if category_filter:
+            records = [record for record in records if record.category.lower().startswith(category_filter)]
+        return records
+    
+    def search(self, query):
+        """Return the records matching a full-text query over keys, values and documentation."""
+        with self._search_lock:
+            return self.search_index.search(query)
+    
+    def categories(self, name=None):
+        """Return {category: [SettingRecord]} for the categories whose name starts with name (all if None)."""
+        if not name:
+            return self.category_records
+        name = name.lower()
+        return {category: records for category, records in self.category_records.items() if category.lower().startswith(name)}
+
+class ConfigServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves ServedConfigs to clients, one thread per connection."""
+    
+    daemon_threads = True
+    # Pending connections the kernel queues while threads are busy (socketserver's default is 5)
+    request_queue_size = 128
+    
+    def __init__(self, socket_path, paths):
+        self.socket_path = socket_path
+        self.paths = [os.path.abspath(path) for path in paths]
+        # Absolute path -> current ServedConfig
+        self.configs = {}
+        self.watchers = []
+        for path in self.paths:
+            self.configs[path] = ServedConfig(path, IniFile.from_path(path))
+        
+        # Only the current user may connect
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, RequestHandler)
+        finally:
+            os.umask(umask)
+    
+    def start_watching(self):
+        """Reload each file whenever it changes on disk."""
+        from js8call_watch import FileWatcher
+        for path in self.paths:
+            watcher = FileWatcher(path, lambda data, path=path: self.reload(path, data))
+            watcher.start()
+            self.watchers.append(watcher)
+    
+    def reload(self, path, data):
+        """Swap in a new version of a file (runs in the watcher thread)."""
+        try:
+            served = ServedConfig(path, IniFile(data))
+        except Exception as e:
+            # Keep answering from the previous version until the file is readable again
+            console_print(f"[bold yellow]Could not reload {path}: {e}[/bold yellow]")
+            return
+        self.configs[path] = served
+    
+    def server_close(self):
+        for watcher in self.watchers:
+            watcher.stop()
+        self.watchers = []
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+    
+    def served(self, path=None):
+        """Return the current ServedConfig of a file, by default the first one."""
+        if path is None:
+            return self.configs[self.paths[0]]
+        served = self.configs.get(os.path.abspath(path))
+        if served is None:
+            raise RequestError(f"not serving {path}")
+        return served
+    
+    def answer(self, request):
+        """Return the result of one request."""
+        if not isinstance(request, dict):
+            raise RequestError("request must be a JSON object")
+        op = request.get("op")
+        if op not in OPERATIONS:
+            raise RequestError(f"unknown op {op!r} (expected one of {', '.join(OPERATIONS)})")
+        if op == "files":
+            return [
+                {"file": path, "loaded": self.configs[path].loaded, "settings": len(self.configs[path].records)}
+                for path in self.paths
+            ]
+        
+        served = self.served(request.get("file"))
+        if op == "get":
+            pattern = request.get("pattern") or request.get("key")
+            if not isinstance(pattern, str):
+                raise RequestError("get needs a pattern")
+            return [record_result(record) for record in served.get(pattern, request.get("category"))]
+        if op == "search":
+            query = request.get("query")
+            if not isinstance(query, str):
+                raise RequestError("search needs a query")
+            limit = request.get("limit", DEFAULT_SEARCH_LIMIT)
+            # bool is an int, but true is not a limit
+            if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+                raise RequestError("limit must be a non-negative integer")
+            return [record_result(record) for record in served.search(query)[:limit]]
+        if op == "category":
+            name = request.get("name")
+            if not name:
+                return [{"category": category, "settings": len(records)} for category, records in served.categories().items()]
+            return [record_result(record) for records in served.categories(name).values() for record in records]
+        
+        # validate: a proposed value, or every invalid value in the file
+        if "key" in request:
+            return {"key": request["key"], "value": request.get("value", ""), "problem": validate_setting(request["key"], request.get("value", ""))}
+        return [
+            {"section": record.section, "key": record.key, "value": record.value, "problem": problem}
+            for record, problem in served.problems
+        ]
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Answers line-delimited JSON requests until the client disconnects."""
+    
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_SIZE)
+            if not line:
+                return
+            if not line.endswith(b"\n") and len(line) >= MAX_REQUEST_SIZE:
+                self.respond({"ok": False, "error": f"request longer than {MAX_REQUEST_SIZE} bytes"})
+                return
+            if not line.strip():
+                continue
+            
+            request = None
+            try:
+                request = json.loads(line)
+                response = {"ok": True, "result": self.server.answer(request)}
+            except json.JSONDecodeError as e:
+                response = {"ok": False, "error": f"invalid JSON: {e}"}
+            except RequestError as e:
+                response = {"ok": False, "error": str(e)}
+            except (TypeError, ValueError, AttributeError) as e:
+                # Parameters of the wrong type, e.g. a numeric pattern
+                response = {"ok": False, "error": f"bad request: {e}"}
+            if isinstance(request, dict) and "id" in request:
+                response["id"] = request["id"]
+            self.respond(response)
+    
+    def respond(self, response):
+        try:
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away without waiting for the answer
+            pass
+
+def run_serve(socket_path, paths):
+    """Serve the files on a socket until interrupted; returns the exit status."""
+    socket_path = str(socket_path)
+    if os.path.exists(socket_path):
+        if is_serving(socket_path):
+            console_print(f"[bold red]Error: already serving on {socket_path}[/bold red]")
+            return 2
+        # Left behind by a server that was killed
+        os.unlink(socket_path)
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    
+    load_setting_values()
+    try:
+        server = ConfigServer(socket_path, paths)
+    except OSError as e:
+        console_print(f"[bold red]Error: {e}[/bold red]")
+        return 2
+    
+    # Stop cleanly (removing the socket) when a service manager stops the daemon
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with server:
+        server.start_watching()
+        console_print(f"Serving {len(server.paths)} file(s) on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""Export of many js8call.ini files to an indexed SQLite database, and read-only access to it.
+
+The schema has one row per file, per section of a file, per distinct setting
+key (with its category), per distinct documentation (shared by every key it
+describes) and per distinct value text, and a settings table linking them:
+    
+    files        (id, path, error)
+    sections     (id, file_id, name)
+    docs         (id, description, valid_values, values_description)
+    keys         (id, key, category, is_key, documented, doc_id)
+    value_texts  (id, value)
+    settings     (file_id, section_id, key_id, value_id, shown)
+
+shown is 1 for the value the viewer displays when a key appears in several
+sections of a file (the last one). The setting_rows view joins everything
+back together for ad-hoc queries. The FTS5 tables keys_fts, docs_fts and
+values_fts index key names, documentation and values with the trigram
+tokenizer, so MATCH finds any substring of three or more characters, like the
+interface's search.
+
+Files are parsed in the export command's process pool and loaded in a single
+transaction with executemany; indexes are created after the rows are in.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+from js8call_config_viewer import (
+    SETTING_CLASSIFIER,
+    SETTING_DESCRIPTIONS,
+    SETTING_DESCRIPTIONS_INDEX,
+    SETTING_VALUES,
+    SETTING_VALUES_INDEX,
+    STANDARD_CATEGORIES,
+    SettingRecord,
+    console_print,
+    load_setting_values,
+)
+from js8call_ini import IniFile
+
+# Bump when the schema changes; older databases are refused
+SCHEMA_VERSION = 1
+
+# Setting rows written per executemany batch
+BATCH_SIZE = 50000
+
+SCHEMA = """
+CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT NOT NULL, error TEXT);
+CREATE TABLE sections (id INTEGER PRIMARY KEY, file_id INTEGER NOT NULL REFERENCES files(id), name TEXT NOT NULL);
+CREATE TABLE docs (id INTEGER PRIMARY KEY, description TEXT, valid_values TEXT, values_description TEXT);
+CREATE TABLE keys (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    category TEXT NOT NULL,
+    is_key INTEGER NOT NULL,
+    documented INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL REFERENCES docs(id)
+);
+CREATE TABLE value_texts (id INTEGER PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE settings (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    key_id INTEGER NOT NULL REFERENCES keys(id),
+    value_id INTEGER NOT NULL REFERENCES value_texts(id),
+    shown INTEGER NOT NULL
+);
+"""
+
+# Created once the rows are loaded, which is much faster than maintaining them during the load
+INDEXES = """
+CREATE UNIQUE INDEX keys_by_key ON keys(key);
+CREATE INDEX keys_by_category ON keys(category, key);
+CREATE INDEX sections_by_file ON sections(file_id);
+CREATE INDEX settings_by_file ON settings(file_id, key_id);
+CREATE INDEX settings_by_key ON settings(key_id, file_id);
+CREATE VIEW setting_rows AS
+    SELECT files.path AS file, sections.name AS section, keys.key, value_texts.value, keys.category,
+           keys.documented, settings.shown, docs.description
+    FROM settings
+    JOIN files ON files.id = settings.file_id
+    JOIN sections ON sections.id = settings.section_id
+    JOIN keys ON keys.id = settings.key_id
+    JOIN docs ON docs.id = keys.doc_id
+    JOIN value_texts ON value_texts.id = settings.value_id;
+"""
+
+FTS_TABLES = """
+CREATE VIRTUAL TABLE keys_fts USING fts5(key, content='keys', content_rowid='id', tokenize='trigram');
+CREATE VIRTUAL TABLE docs_fts USING fts5(
+    description, valid_values, values_description, content='docs', content_rowid='id', tokenize='trigram'
+);
+CREATE VIRTUAL TABLE values_fts USING fts5(value, content='value_texts', content_rowid='id', tokenize='trigram');
+INSERT INTO keys_fts(keys_fts) VALUES ('rebuild');
+INSERT INTO docs_fts(docs_fts) VALUES ('rebuild');
+INSERT INTO values_fts(values_fts) VALUES ('rebuild');
+"""
+
+# Shortest query the trigram index can answer; shorter ones are scanned with LIKE
+MIN_MATCH_LENGTH = 3
+
+# Order categories are listed in
+CATEGORY_ORDER = STANDARD_CATEGORIES + ["Other Settings"]
+
+def execute_script(connection, script):
+    """Run ;-separated statements one at a time (executescript would commit the open transaction first)."""
+    for statement in script.split(";"):
+        if statement.strip():
+            connection.execute(statement)
+
+def classify_key(key):
+    """Return (category, is_key, documented name or None, valid-values name or None) for a setting key.
+    
+    Only the names of the matching documentation entries are returned, so
+    worker processes can do the matching without sending the text back.
+    """
+    category, is_key = SETTING_CLASSIFIER.classify_key(key)
+    return category, is_key, SETTING_DESCRIPTIONS_INDEX.resolve(key), SETTING_VALUES_INDEX.resolve(key)
+
+def read_sections_file(path):
+    """Read one ini file into a record of its sections, their (key, value) pairs and its keys' classification."""
+    try:
+        config = IniFile.from_path(path)
+    except Exception as e:
+        return {"file": path, "error": str(e), "sections": [], "keys": {}}
+    sections = [(name, list(config[name].items())) for name in config.sections()]
+    keys = {key: classify_key(key) for _, items in sections for key, _ in items}
+    if not keys:
+        # Not a settings file (or an empty one): don't count it as exported or open it by default
+        return {"file": path, "error": "no settings found", "sections": [], "keys": {}}
+    return {"file": path, "error": None, "sections": sections, "keys": keys}
+
+def read_sections_files(paths):
+    """Read a chunk of files in a worker process."""
+    return [read_sections_file(path) for path in paths]
+
+class DatabaseWriter:
+    """Loads file records into a fresh database, assigning ids itself so rows can be batched."""
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.file_count = 0
+        self.section_count = 0
+        # Key -> id, documentation -> id and value text -> id, so each is stored once
+        self._key_ids = {}
+        self._doc_ids = {}
+        self._value_ids = {}
+        self._pending = {"files": [], "sections": [], "docs": [], "keys": [], "value_texts": [], "settings": []}
+    
+    def _key_id(self, key, classification):
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = self._key_ids[key] = len(self._key_ids) + 1
+            category, is_key, description_name, values_name = classification
+            setting_values = SETTING_VALUES[values_name] if values_name is not None else {}
+            doc = (
+                SETTING_DESCRIPTIONS[description_name] if description_name is not None else None,
+                setting_values.get("values"),
+                setting_values.get("description"),
+            )
+            doc_id = self._doc_ids.get(doc)
+            if doc_id is None:
+                doc_id = self._doc_ids[doc] = len(self._doc_ids) + 1
+                self._pending["docs"].append((doc_id,) + doc)
+            self._pending["keys"].append((key_id, key, category, is_key, description_name is not None, doc_id))
+        return key_id
+    
+    def _value_id(self, value):
+        value_id = self._value_ids.get(value)
+        if value_id is None:
+            value_id = self._value_ids[value] = len(self._value_ids) + 1
+            self._pending["value_texts"].append((value_id, value))
+        return value_id
+    
+    def add(self, record):
+        """Queue one file record from read_sections_file."""
+        self.file_count += 1
+        file_id = self.file_count
+        self._pending["files"].append((file_id, record["file"], record["error"]))
+        
+        # As in the viewer, a key in several sections shows the value of the last one
+        shown_in = {}
+        for index, (_, items) in enumerate(record["sections"]):
+            shown_in.update(dict.fromkeys((key for key, _ in items), index))
+        
+        keys = record["keys"]
+        settings = self._pending["settings"]
+        for index, (name, items) in enumerate(record["sections"]):
+            self.section_count += 1
+            section_id = self.section_count
+            self._pending["sections"].append((section_id, file_id, name))
+            settings.extend(
+                (file_id, section_id, self._key_id(key, keys[key]), self._value_id(value), shown_in[key] == index)
+                for key, value in items
+            )
+        if len(settings) >= BATCH_SIZE:
+            self.flush()
+    
+    def flush(self):
+        """Write the queued rows."""
+        statements = {
+            "files": "INSERT INTO files VALUES (?, ?, ?)",
+            "sections": "INSERT INTO sections VALUES (?, ?, ?)",
+            "docs": "INSERT INTO docs VALUES (?, ?, ?, ?)",
+            "keys": "INSERT INTO keys VALUES (?, ?, ?, ?, ?, ?)",
+            "value_texts": "INSERT INTO value_texts VALUES (?, ?)",
+            "settings": "INSERT INTO settings VALUES (?, ?, ?, ?, ?)",
+        }
+        for table, rows in self._pending.items():
+            if rows:
+                self.connection.executemany(statements[table], rows)
+                rows.clear()
+    
+    def finish(self):
+        """Write the remaining rows, then build the indexes and the full-text tables.
+        
+        Returns whether the full-text tables could be created (SQLite without
+        FTS5 or the trigram tokenizer still gets every other table).
+        """
+        self.flush()
+        execute_script(self.connection, INDEXES)
+        # Statistics let the planner walk a category's keys in order instead of sorting them
+        self.connection.execute("ANALYZE")
+        self.connection.execute("SAVEPOINT full_text")
+        try:
+            execute_script(self.connection, FTS_TABLES)
+            full_text = True
+        except sqlite3.OperationalError:
+            # No FTS5 module or trigram tokenizer
+            self.connection.execute("ROLLBACK TO full_text")
+            full_text = False
+        self.connection.execute("RELEASE full_text")
+        self.connection.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("schema_version", str(SCHEMA_VERSION)), ("full_text", "trigram" if full_text else "none")],
+        )
+        return full_text
+
+def run_export_sqlite(args):
+    """Run the export-sqlite command from parsed command-line arguments."""
+    from js8call_export import expand_paths, iter_records
+    paths = list(expand_paths(args.paths))
+    if not paths:
+        print("No ini files matched the given paths", file=sys.stderr)
+        return 1
+    
+    load_setting_values()
+    # Build the database next to the output and move it into place once complete
+    directory = os.path.dirname(os.path.abspath(args.output))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".export-", suffix=".sqlite")
+    os.close(fd)
+    failed = 0
+    try:
+        # Autocommit mode, so the one transaction is exactly the BEGIN ... COMMIT below
+        connection = sqlite3.connect(temp_path, isolation_level=None)
+        try:
+            # A half-written database is thrown away, so the journal only needs to serve rollbacks
+            connection.execute("PRAGMA journal_mode = MEMORY")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.execute("BEGIN")
+            execute_script(connection, SCHEMA)
+            writer = DatabaseWriter(connection)
+            for record in iter_records(paths, args.jobs, args.chunk_size, read_sections_files, load_setting_values):
+                if record["error"]:
+                    failed += 1
+                writer.add(record)
+            full_text = writer.finish()
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        # mkstemp creates the file private; give it the mode a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, args.output)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    
+    print(
+        f"Exported {len(paths) - failed} of {len(paths)} files to {args.output}"
+        + ("" if full_text else " (without full-text search: this SQLite has no FTS5 trigram tokenizer)"),
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+# Columns of a SettingRecord, for the FROM clause below
+RECORD_COLUMNS = "keys.key, value_texts.value, keys.is_key, sections.name, keys.category"
+RECORD_FROM = """
+    FROM settings
+    JOIN keys ON keys.id = settings.key_id
+    JOIN value_texts ON value_texts.id = settings.value_id
+    JOIN sections ON sections.id = settings.section_id
+"""
+
+class QueryRecords(Sequence):
+    """The SettingRecords of a query, sorted by key and fetched a page at a time as rows are looked at.
+    
+    A SettingTable only reads the rows in its viewport, so a category of any
+    size is shown without reading more than a page or two from the database.
+    """
+    
+    PAGE_SIZE = 256
+    # Pages kept per query (the oldest is dropped first)
+    MAX_PAGES = 64
+    
+    def __init__(self, database, where, params):
+        self._database = database
+        self._where = where
+        self._params = tuple(params)
+        self._length = None
+        self._pages = {}
+    
+    def __len__(self):
+        if self._length is None:
+            self._length = self._database.query(f"SELECT count(*) {RECORD_FROM} WHERE {self._where}", self._params)[0][0]
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        
+        page_number, offset = divmod(index, self.PAGE_SIZE)
+        page = self._pages.get(page_number)
+        if page is None:
+            rows = self._database.query(
+                f"SELECT {RECORD_COLUMNS} {RECORD_FROM} WHERE {self._where} ORDER BY keys.key LIMIT ? OFFSET ?",
+                self._params + (self.PAGE_SIZE, page_number * self.PAGE_SIZE),
+            )
+            page = [
+                SettingRecord(key, value, bool(is_key), sys.intern(section), sys.intern(category))
+                for key, value, is_key, section, category in rows
+            ]
+            if len(self._pages) >= self.MAX_PAGES:
+                del self._pages[next(iter(self._pages))]
+            self._pages[page_number] = page
+        return page[offset]
+    
+    def keys(self):
+        """Return every row's setting key, without building records."""
+        return [row[0] for row in self._database.query(f"SELECT keys.key {RECORD_FROM} WHERE {self._where} ORDER BY keys.key", self._params)]
+
+class DatabaseSearchIndex:
+    """Full-text search over one file's settings in the database, with the interface of SettingSearchIndex."""
+    
+    def __init__(self, database_file, show_all):
+        self._database_file = database_file
+        self._show_all = show_all
+        self._all = database_file.records(show_all=show_all)
+    
+    def __len__(self):
+        return len(self._all)
+    
+    def search(self, query):
+        """Return the rows matching a case-insensitive query over keys, values and documentation."""
+        if not query:
+            return self._all
+        database = self._database_file.database
+        if database.full_text and len(query) >= MIN_MATCH_LENGTH:
+            phrase = '"' + query.replace('"', '""') + '"'
+            condition = (
+                "(settings.key_id IN (SELECT rowid FROM keys_fts WHERE keys_fts MATCH ?)"
+                " OR keys.doc_id IN (SELECT rowid FROM docs_fts WHERE docs_fts MATCH ?)"
+                " OR settings.value_id IN (SELECT rowid FROM values_fts WHERE values_fts MATCH ?))"
+            )
+            params = (phrase,) * 3
+        else:
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            docs = " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in ("description", "valid_values", "values_description"))
+            condition = (
+                "(keys.key LIKE ? ESCAPE '\\' OR value_texts.value LIKE ? ESCAPE '\\'"
+                f" OR keys.doc_id IN (SELECT id FROM docs WHERE {docs}))"
+            )
+            params = (pattern,) * 5
+        return self._database_file.records(show_all=self._show_all, condition=condition, params=params)
+
+class SettingsDatabase:
+    """A database written by export-sqlite, opened read-only."""
+    
+    def __init__(self, path):
+        self.path = str(path)
+        if not os.path.isfile(self.path):
+            raise ValueError(f"{self.path} does not exist")
+        # Read-only, so the interface can never change an export
+        self.connection = sqlite3.connect(Path(self.path).absolute().as_uri() + "?mode=ro", uri=True, check_same_thread=False)
+        # Queries come from the UI thread and its workers
+        self._lock = threading.Lock()
+        try:
+            meta = dict(self.query("SELECT name, value FROM meta"))
+        except sqlite3.DatabaseError:
+            self.connection.close()
+            raise ValueError(f"{self.path} is not a database written by export-sqlite")
+        if meta.get("schema_version") != str(SCHEMA_VERSION):
+            self.connection.close()
+            raise ValueError(f"{self.path} was written by another version of export-sqlite; export it again")
+        self.full_text = meta.get("full_text") == "trigram"
+    
+    def query(self, sql, params=()):
+        """Run a query and return all of its rows."""
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+    
+    def files(self):
+        """Return (id, path, error) for every exported file, in export order."""
+        return self.query("SELECT id, path, error FROM files ORDER BY id")
+    
+    def find_file(self, path=None):
+        """Return the DatabaseFile for an exported path (the first readable file if None), or None."""
+        for file_id, stored_path, error in self.files():
+            if error:
+                continue
+            if path is None or stored_path == path or os.path.abspath(stored_path) == os.path.abspath(path):
+                return DatabaseFile(self, file_id, stored_path)
+        return None
+    
+    def close(self):
+        self.connection.close()
+
+class DatabaseFile:
+    """One exported ini file, with its settings queried from the database as they are needed."""
+    
+    def __init__(self, database, file_id, path):
+        self.database = database
+        self.file_id = file_id
+        self.path = path
+    
+    def _where(self, show_all, category=None, condition=None):
+        clauses = ["settings.file_id = ?", "settings.shown"]
+        params = [self.file_id]
+        if not show_all:
+            clauses.append("keys.documented")
+        if category is not None:
+            clauses.append("keys.category = ?")
+            params.append(category)
+        if condition:
+            clauses.append(condition)
+        return " AND ".join(clauses), params
+    
+    def categories(self, show_all=False):
+        """Return the categories with settings to show, in sidebar order."""
+        where, params = self._where(show_all)
+        counts = dict(self.database.query(f"SELECT keys.category, count(*) {RECORD_FROM} WHERE {where} GROUP BY keys.category", params))
+        return [category for category in CATEGORY_ORDER if counts.get(category)]
+    
+    def records(self, category=None, show_all=False, condition=None, params=()):
+        """Return the displayed settings (of one category, if given) as lazily fetched SettingRecords sorted by key."""
+        where, where_params = self._where(show_all, category, condition)
+        return QueryRecords(self.database, where, where_params + list(params))
+    
+    def search_index(self, show_all=False):
+        return DatabaseSearchIndex(self, show_all)
+
+def open_database_file(database_path, file_path=None):
+    """Open an exported database read-only and find a file in it, printing an error and returning None on failure."""
+    try:
+        database = SettingsDatabase(database_path)
+    except (ValueError, sqlite3.Error) as e:
+        console_print(f"[bold red]Error opening database: {e}[/bold red]")
+        return None
+    database_file = database.find_file(file_path)
+    if database_file is None:
+        console_print(
+            f"[bold red]Error: {file_path + ' is not' if file_path else 'no readable ini file is'} in {database_path}[/bold red]",
+            "[bold yellow]Pick one of its files with the -f option[/bold yellow]",
+        )
+        database.close()
+    return database_file
@@ -0,0 +1,1814 @@
+#!/usr/bin/env python3
+"""Textual user interface for the JS8Call Configuration Viewer."""
+
+import os
+import textwrap
+import time
+from collections.abc import Mapping, Sequence
+
+from textual.app import App, ComposeResult
+from textual.binding import Binding
+from textual.containers import Horizontal, Vertical, ScrollableContainer
+from textual.geometry import Size
+from textual.markup import escape
+from textual.message import Message
+from textual.reactive import reactive
+from textual.screen import Screen, ModalScreen
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Header, Footer, Static, Button, Input, Label, ListView, ListItem
+from textual.worker import get_current_worker
+from textual import events
+from rich.cells import cell_len, set_cell_size
+from rich.segment import Segment
+
+from js8call_config_viewer import (
+    STANDARD_CATEGORIES,
+    SettingRecord,
+    find_setting_record,
+    get_setting_category,
+    get_setting_description,
+    get_snapshot_store_path,
+    is_documented_setting,
+    is_key_setting,
+    iter_setting_records,
+    load_setting_values,
+    read_js8call_ini,
+)
+from js8call_diff import DiffChain, diff_configs, effective_setting, group_changes_by_category
+from js8call_fleet import FleetAggregate, load_stations, station_names
+from js8call_history import SnapshotStore, format_time
+from js8call_ini import IniFile
+from js8call_profile import profile_thread, since_start, span, traced
+from js8call_qvariant import DecodedItems, decode_value, describe_value, format_value, is_structured, needs_decoding
+from js8call_search import SettingSearchIndex
+from js8call_validate import validate_setting
+
+class DecodedRows(Sequence):
+    """SettingTable rows for the parts of a decoded value, built only for the rows on screen."""
+    
+    def __init__(self, value):
+        self._items = DecodedItems(value)
+    
+    def __getitem__(self, index):
+        label, text = self._items[index]
+        return SettingRecord(label, text)
+    
+    def __len__(self):
+        return len(self._items)
+
+class SettingValuesScreen(ModalScreen):
+    """Modal screen to display valid values and format for a setting."""
+    
+    BINDINGS = [
+        # Any key will dismiss this screen
+        Binding("escape", "dismiss", "Back"),
+        Binding("q", "dismiss", "Back"),
+    ]
+    
+    # Keys that page through the decoded value's table instead of closing the screen
+    TABLE_KEYS = ("up", "down", "j", "k", "pageup", "pagedown", "home", "end")
+    
+    def __init__(self, setting_key, setting_value, setting_values):
+        super().__init__()
+        self.setting_key = setting_key
+        self.setting_value = setting_value
+        self.setting_values = setting_values
+        # The value decoded from its QSettings form, if it has one
+        self.decoded_value = decode_value(setting_value) if needs_decoding(setting_value) else setting_value
+        
+    def compose(self) -> ComposeResult:
+        """Create child widgets for the values screen."""
+        # Create a simple modal dialog with the setting information
+        with Vertical(id="values-dialog"):
+            yield Static(f"Valid Values for: [bold]{self.setting_key}[/bold]", id="values-title")
+            
+            with ScrollableContainer(id="values-content"):
+                if self.setting_values:
+                    # Format the values information nicely
+                    values_text = f"[bold underline]Valid Values/Format:[/bold underline]\n{self.setting_values['values']}\n\n"
+                    values_text += f"[bold underline]Description:[/bold underline]\n{self.setting_values['description']}\n\n"
+                    values_text += f"[bold underline]Current Value:[/bold underline]\n{self.setting_value}"
+                    
+                    yield Static(values_text)
+                else:
+                    yield Static("No valid values information available for this setting.")
+                
+                if self.decoded_value != self.setting_value:
+                    summary = describe_value(self.decoded_value) if is_structured(self.decoded_value) else format_value(self.decoded_value)
+                    yield Static(f"\n[bold underline]Decoded Value:[/bold underline]\n{escape(summary)}")
+            
+            if is_structured(self.decoded_value):
+                yield DecodedTable(id="decoded-table", headers=("Item", "Value"))
+                yield Static("↑/↓/PgUp/PgDn to page through the value • any other key to close", id="values-footer")
+            else:
+                yield Static("Press any key to close", id="values-footer")
+    
+    def on_mount(self) -> None:
+        """Fill the decoded value's table; its rows are only formatted as they come into view."""
+        if is_structured(self.decoded_value):
+            table = self.query_one("#decoded-table", DecodedTable)
+            table.set_rows(DecodedRows(self.decoded_value))
+            table.focus()
+    
+    def on_key(self, event: events.Key) -> None:
+        """Handle key press events - any key dismisses this screen."""
+        if event.key in self.TABLE_KEYS and is_structured(self.decoded_value):
+            table = self.query_one("#decoded-table", DecodedTable)
+            if event.key == "j":
+                table.action_cursor_down()
+            elif event.key == "k":
+                table.action_cursor_up()
+            return
+        
+        # Dismiss the screen
+        self.dismiss()
+        
+        # We still want to allow navigation keys to be processed after dismissal
+        # So we don't prevent default
+        event.prevent_default = False
+
+class SettingRows(Mapping):
+    """Row index -> row mapping for a SettingTable, mirroring DataTable.rows."""
+    
+    def __init__(self, rows):
+        self._rows = rows
+    
+    def __getitem__(self, row_key):
+        return self._rows[row_key]
+    
+    def __iter__(self):
+        return iter(range(len(self._rows)))
+    
+    def __len__(self):
+        return len(self._rows)
+
+class SettingTable(ScrollView, can_focus=True):
+    """A virtualized data table for displaying configuration settings.
+    
+    Rows are kept as a plain list in display order (sorted by key), and only the
+    rows inside the viewport plus a small overscan are ever rendered, so opening
+    a category with thousands of settings costs the same as one with a handful.
+    Row keys are row indexes, so jumping to any row is O(1).
+    """
+    
+    COMPONENT_CLASSES = {
+        "setting-table--header",
+        "setting-table--cursor",
+        "setting-table--key-setting",
+        "setting-table--changed",
+        "setting-table--invalid",
+    }
+    
+    DEFAULT_CSS = """
+    SettingTable {
+        background: $surface;
+        color: $text;
+        overflow-x: hidden;
+    }
+    
+    SettingTable > .setting-table--header {
+        background: $panel;
+        color: $text;
+        text-style: bold;
+    }
+    
+    SettingTable > .setting-table--cursor {
+        background: $accent 40%;
+    }
+    
+    SettingTable:focus > .setting-table--cursor {
+        background: $accent;
+    }
+    
+    SettingTable > .setting-table--key-setting {
+        text-style: bold;
+    }
+    
+    SettingTable > .setting-table--changed {
+        background: $warning 50%;
+    }
+    
+    SettingTable > .setting-table--invalid {
+        color: $error;
+        text-style: bold;
+    }
+    """
+    
+    BINDINGS = [
+        Binding("up", "cursor_up", "Cursor Up", show=False),
+        Binding("down", "cursor_down", "Cursor Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("home", "scroll_top", "Top", show=False),
+        Binding("end", "scroll_bottom", "Bottom", show=False),
+        Binding("enter", "select_cursor", "Select", show=False),
+    ]
+    
+    # Width of the setting name column, and rows rendered beyond each edge of the viewport
+    KEY_COLUMN_WIDTH = 30
+    OVERSCAN = 10
+    
+    # How long rows changed by a live reload stay highlighted
+    CHANGE_HIGHLIGHT_SECONDS = 3.0
+    
+    cursor_row = reactive(0)
+    
+    class RowHighlighted(Message):
+        """Posted when the cursor moves to a different row."""
+        
+        def __init__(self, table, cursor_row):
+            super().__init__()
+            self.table = table
+            self.cursor_row = cursor_row
+        
+        @property
+        def control(self):
+            return self.table
+    
+    class RowSelected(Message):
+        """Posted when a row is selected with Enter or a click."""
+        
+        def __init__(self, table, cursor_row):
+            super().__init__()
+            self.table = table
+            self.cursor_row = cursor_row
+        
+        @property
+        def control(self):
+            return self.table
+    
+    def __init__(self, *args, headers=("Setting", "Value"), check_values=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Titles of the two columns
+        self.headers = headers
+        # Whether rows are setting values to check against their documented formats
+        self.check_values = check_values
+        # Each row is a SettingRecord, so a row position resolves to its setting directly
+        self._rows = []
+        # Rendered row strips for the viewport and overscan, keyed by render state
+        self._line_cache = {}
+        # Keys of rows currently highlighted as changed
+        self._changed_keys = set()
+    
+    @property
+    def row_count(self):
+        """Number of rows in the table."""
+        return len(self._rows)
+    
+    @property
+    def rows(self):
+        """Mapping of row keys to rows (row keys are row indexes)."""
+        return SettingRows(self._rows)
+    
+    def get_row(self, row_key):
+        """Get the cell values (setting, value) of a row."""
+        record = self._rows[row_key]
+        return [record.key, record.value]
+    
+    def get_record(self, row):
+        """Get the SettingRecord shown at a row position."""
+        return self._rows[row]
+    
+    @property
+    def cursor_record(self):
+        """The SettingRecord under the cursor, or None if the table is empty."""
+        if not self._rows:
+            return None
+        return self._rows[self.cursor_row]
+    
+    def clear(self):
+        """Remove all rows from the table."""
+        self.set_rows([])
+    
+    def set_rows(self, rows):
+        """Replace the table contents with SettingRecord rows in display order."""
+        self._rows = rows
+        self._line_cache.clear()
+        self.virtual_size = Size(0, len(rows) + 1)
+        self.set_reactive(SettingTable.cursor_row, 0)
+        self.scroll_to(y=0, animate=False)
+        self.refresh()
+    
+    def replace_rows(self, rows, changed_keys=(), highlight=True):
+        """Swap in updated rows, keeping the cursor on the same setting and briefly highlighting changed keys (unless highlight is False)."""
+        cursor_key = self._rows[self.cursor_row].key if self._rows else None
+        # A key removed and another added keeps the count but shifts the rows between them
+        same_keys = len(rows) == len(self._rows) and all(
+            old.key == new.key for old, new in zip(self._rows, rows)
+        )
+        self._rows = rows
+        self.virtual_size = Size(0, len(rows) + 1)
+        
+        changed_keys = set(changed_keys)
+        if same_keys:
+            # Values changed in place, so only the changed rows need re-rendering
+            changed_indexes = {self.index_of(key) for key in changed_keys}
+            self._line_cache = {
+                cache_key: strip for cache_key, strip in self._line_cache.items()
+                if cache_key[0] not in changed_indexes
+            }
+        else:
+            # Rows were added or removed, shifting every index after them
+            self._line_cache.clear()
+        
+        if changed_keys and highlight:
+            self._changed_keys |= changed_keys
+            self.set_timer(self.CHANGE_HIGHLIGHT_SECONDS, lambda: self._end_change_highlight(changed_keys))
+        
+        if cursor_key is not None:
+            self.set_reactive(SettingTable.cursor_row, self.validate_cursor_row(self.index_of(cursor_key)))
+            self._scroll_cursor_into_view()
+        self.refresh()
+    
+    def _end_change_highlight(self, keys):
+        self._changed_keys -= keys
+        self.refresh()
+    
+    def index_of(self, key):
+        """Return the row index of a setting key, or where it would be inserted."""
+        return find_setting_record(self._rows, key)
+    
+    @staticmethod
+    def prepare_rows(category_settings, show_all=False, category=None, sections=None):
+        """Build the SettingRecord rows for a category, in display order.
+        
+        sections maps keys to the section their value was read from.
+        """
+        rows = []
+        sections = sections or {}
+        
+        # Sort the keys for better display
+        for key, value in sorted((category_settings or {}).items()):
+            # Skip undocumented settings if show_all is False
+            if not show_all and not is_documented_setting(key):
+                continue
+            
+            # Highlight key settings
+            rows.append(SettingRecord(key, value, is_key_setting(key), sections.get(key), category))
+        
+        return rows
+    
+    def update_category_settings(self, category_settings, category_name, show_all=False):
+        """Update the table with settings from the given category."""
+        self.set_rows(self.prepare_rows(category_settings, show_all, category_name))
+    
+    # Keep the original update_settings method for backward compatibility
+    def update_settings(self, config_section, section_name, show_all=False):
+        """Update the table with settings from the given section (kept for backward compatibility)."""
+        self.update_category_settings(config_section, section_name, show_all)
+    
+    def move_cursor(self, row=None, column=None, animate=False):
+        """Move the cursor to the given row (the column is ignored, the cursor spans the row)."""
+        if row is not None:
+            self.cursor_row = row
+    
+    def validate_cursor_row(self, row):
+        return max(0, min(row, len(self._rows) - 1))
+    
+    def watch_cursor_row(self, old_row, new_row):
+        self._scroll_cursor_into_view()
+        self.refresh()
+        if self._rows:
+            self.post_message(self.RowHighlighted(self, new_row))
+    
+    def _visible_row_count(self):
+        """Number of data rows that fit below the header."""
+        return max(1, self.scrollable_content_region.height - 1)
+    
+    def _scroll_cursor_into_view(self):
+        """Scroll the least amount needed to keep the cursor row on screen."""
+        top = int(self.scroll_y)
+        visible = self._visible_row_count()
+        if self.cursor_row < top:
+            self.scroll_to(y=self.cursor_row, animate=False)
+        elif self.cursor_row >= top + visible:
+            self.scroll_to(y=self.cursor_row - visible + 1, animate=False)
+    
+    def action_cursor_up(self):
+        self.cursor_row -= 1
+    
+    def action_cursor_down(self):
+        self.cursor_row += 1
+    
+    def action_page_up(self):
+        self.cursor_row -= self._visible_row_count()
+    
+    def action_page_down(self):
+        self.cursor_row += self._visible_row_count()
+    
+    def action_scroll_top(self):
+        self.cursor_row = 0
+    
+    def action_scroll_bottom(self):
+        self.cursor_row = len(self._rows) - 1
+    
+    def action_select_cursor(self):
+        if self._rows:
+            self.post_message(self.RowSelected(self, self.cursor_row))
+    
+    def on_click(self, event: events.Click) -> None:
+        """Move the cursor to the clicked row, selecting it if it was already highlighted."""
+        offset = event.get_content_offset(self)
+        if offset is None or offset.y == 0:
+            return
+        row = int(self.scroll_y) + offset.y - 1
+        if row >= len(self._rows):
+            return
+        if row == self.cursor_row:
+            self.action_select_cursor()
+        else:
+            self.cursor_row = row
+    
+    @staticmethod
+    def _fit(text, width):
+        """Pad or crop text to exactly width cells, with an ellipsis when cropped."""
+        if width <= 0:
+            return ""
+        # Only the first width characters can ever be shown, so skip the rest of long values
+        text = text[:width + 1]
+        if cell_len(text) > width:
+            return set_cell_size(text, width - 1) + "…"
+        return set_cell_size(text, width)
+    
+    def _render_cells(self, key, value, width, style, key_style, value_style=None):
+        """Render one line of the two columns, each padded by a space on both sides."""
+        value_width = width - self.KEY_COLUMN_WIDTH - 4
+        segments = [
+            Segment(f" {self._fit(key, self.KEY_COLUMN_WIDTH)} ", key_style),
+            Segment(f" {self._fit(value, value_width)} ", value_style or style),
+        ]
+        return Strip(segments).adjust_cell_length(width, style)
+    
+    def _render_row(self, index, width):
+        """Render the strip for a data row, reusing it while nothing about it changes."""
+        record = self._rows[index]
+        key, value, is_key = record.key, record.value, record.is_key
+        is_cursor = index == self.cursor_row
+        is_changed = key in self._changed_keys
+        cache_key = (index, width, is_cursor, self.has_focus, is_changed)
+        strip = self._line_cache.get(cache_key)
+        if strip is None:
+            style = self.rich_style
+            if is_changed:
+                style += self.get_component_rich_style("setting-table--changed")
+            if is_cursor:
+                style += self.get_component_rich_style("setting-table--cursor")
+            key_style = style + self.get_component_rich_style("setting-table--key-setting") if is_key else style
+            value_style = None
+            if self.check_values and validate_setting(key, value):
+                # Invalid values are marked inline; the description area says what is wrong
+                value_style = style + self.get_component_rich_style("setting-table--invalid")
+                value = "✗ " + value
+            strip = self._line_cache[cache_key] = self._render_cells(key, value, width, style, key_style, value_style)
+        return strip
+    
+    def render_lines(self, crop):
+        # Drop strips that have scrolled well out of view, then render the viewport
+        top = int(self.scroll_y)
+        keep_from = top - self.OVERSCAN
+        keep_to = top + self.size.height + self.OVERSCAN
+        if len(self._line_cache) > 4 * (self.size.height + 2 * self.OVERSCAN):
+            self._line_cache = {
+                cache_key: strip for cache_key, strip in self._line_cache.items()
+                if keep_from <= cache_key[0] < keep_to
+            }
+        lines = super().render_lines(crop)
+        
+        # Pre-render the overscan rows so short scrolls only reuse cached strips
+        width = self.size.width
+        for index in range(max(0, keep_from), min(len(self._rows), keep_to)):
+            self._render_row(index, width)
+        return lines
+    
+    def render_line(self, y):
+        width = self.size.width
+        if y == 0:
+            # The header stays fixed while the rows scroll beneath it
+            style = self.rich_style + self.get_component_rich_style("setting-table--header")
+            return self._render_cells(*self.headers, width, style, style)
+        
+        index = int(self.scroll_y) + y - 1
+        if index >= len(self._rows):
+            return Strip.blank(width, self.rich_style)
+        return self._render_row(index, width)
+
+class DecodedTable(SettingTable):
+    """SettingTable listing the parts of a decoded value, whose labels (indexes, offsets) are short."""
+    
+    KEY_COLUMN_WIDTH = 12
+
+class DescriptionArea(Static):
+    """Multiline area for displaying setting descriptions."""
+    
+    # Lines of description shown (the area's height)
+    MAX_LINES = 3
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Laid-out markup keyed by (description, width); descriptions are shared by many settings
+        self._markup_cache = {}
+        self._description = ""
+        # Setting keys most recently queued by prepare_layouts
+        self._prepared_keys = ()
+    
+    def layout_description(self, description, width):
+        """Wrap a description to the given width, bolding the first line and eliding overflow."""
+        cache_key = (description, width)
+        markup = self._markup_cache.get(cache_key)
+        if markup is None:
+            lines = textwrap.wrap(description, max(width, 10)) or [""]
+            if len(lines) > self.MAX_LINES:
+                # Elide the rest of the text on the last line that fits
+                last = lines[self.MAX_LINES - 1]
+                lines = lines[:self.MAX_LINES - 1] + [last[:max(0, width - 1)].rstrip() + "…"]
+            first, *rest = [escape(line) for line in lines]
+            markup = self._markup_cache[cache_key] = "\n".join([f"[bold]{first}[/bold]"] + rest)
+        return markup
+    
+    def prepare_layouts(self, keys):
+        """Lay out the descriptions of some settings for the current width in a worker thread."""
+        self._prepared_keys = keys
+        width = self.content_size.width
+        if not width:
+            # Not laid out yet; on_resize will prepare them
+            return
+        
+        def prepare():
+            for description in {get_setting_description(key) for key in keys}:
+                self.layout_description(description, width)
+        
+        self.run_worker(prepare, thread=True, exclusive=True, group="description-layout")
+    
+    def on_resize(self, event: events.Resize) -> None:
+        """Drop layouts for the old width and lay out the current and prepared descriptions again."""
+        self._markup_cache.clear()
+        if self._description:
+            self.update(self.layout_description(self._description, self.content_size.width))
+        self.prepare_layouts(self._prepared_keys)
+    
+    @traced()
+    def update_description(self, key="", value="", description=""):
+        """Update the description area with information about a setting."""
+        if not key:
+            self._description = ""
+            self.update("")
+            return
+        
+        # Get description if not provided
+        if not description:
+            description = get_setting_description(key)
+        
+        if description:
+            self._description = description
+            self.update(self.layout_description(description, self.content_size.width))
+        else:
+            # Fallback if no description
+            self._description = ""
+            self.update("No detailed information available for this setting.")
+
+class SettingsView(Screen):
+    """Main screen for the JS8Call Configuration Viewer."""
+    
+    BINDINGS = [
+        Binding("q", "quit", "Quit"),
+        Binding("h", "focus_categories", "Categories"),
+        Binding("l", "focus_settings", "Settings"),
+        Binding("j", "next_setting", "Next"),
+        Binding("k", "prev_setting", "Previous"),
+        Binding("tab", "toggle_focus", "Toggle Focus"),
+        Binding("f1", "help", "Help"),
+        Binding("v", "show_values", "Values"),
+        Binding("t", "show_history", "History"),
+        Binding("slash", "start_search", "Search"),
+        Binding("escape", "end_search", "End Search", show=False),
+    ]
+    
+    # Keys that move the table cursor
+    NAVIGATION_KEYS = ("up", "down", "j", "k", "home", "end", "pageup", "pagedown")
+    
+    def __init__(self, config_path=None, show_all=False, watch=False, database_file=None):
+        super().__init__()
+        # Read by a worker after the screen first paints (see load_config)
+        self.config = None
+        self.config_path = config_path
+        # A DatabaseFile to query instead of reading an ini file (see js8call_sqlite)
+        self.database_file = database_file
+        self.show_all = show_all
+        self.watch = watch
+        self.current_category = None
+        self.categories = []
+        # The one copy of every displayed setting: {category: [SettingRecord]} sorted by key, filled in as categories load
+        self.category_records = {}
+        # Bumped whenever category_records changes, so work started on older records can tell it is stale
+        self._records_generation = 0
+        self.loaded = False
+        
+        # Table rows per category (the documented records unless show_all), dropped when the category's records change
+        self._category_rows = {}
+        
+        # Live reload state (see start_watching)
+        self._watcher = None
+        self._watched_config = None
+        self._reload_status = ""
+        
+        # Search state: the query while searching (else None) and the index, built on first search
+        self.search_query = None
+        self._search_index = None
+        self._search_index_generation = None
+        
+        # Description updates: whether one is queued, and when the oldest unanswered key arrived
+        self._description_pending = False
+        self._key_time = None
+        
+    def compose(self) -> ComposeResult:
+        """Create child widgets for the app."""
+        yield Header(show_clock=True)
+        
+        with Horizontal():
+            # Category sidebar (20% of width)
+            with Vertical(id="sidebar", classes="sidebar"):
+                yield Static("Categories", id="sidebar-header", classes="sidebar-header")
+                yield ListView(*[], id="categories-list")
+            
+            # Settings display (80% of width)
+            with Vertical(id="settings-area"):
+                yield Static("", id="section-title", classes="section-title")
+                yield Input(placeholder="Search keys, values and descriptions", id="search-input")
+                with ScrollableContainer(id="table-container"):
+                    yield SettingTable(id="settings-table", check_values=True)
+        
+        # Description area above the status bar
+        yield DescriptionArea("", id="description-area", classes="description-area")
+        
+        # Status bar and footer - status bar acts as the separator
+        yield Static("", id="status-bar", classes="status-bar")
+        yield Footer()
+    
+    @traced()
+    def on_mount(self) -> None:
+        """Paint the empty screen straight away and load the config in the background."""
+        self.query_one("#section-title", Static).update("Loading...")
+        self.update_status_bar()
+        self.call_after_refresh(self.app.record_startup, "shell")
+        self.run_worker(self.load_config, thread=True, group="config-load")
+    
+    def load_config(self):
+        """Read and categorize the config, handing each category to the UI as it is ready (runs in a worker thread)."""
+        worker = get_current_worker()
+        
+        def deliver(callback, *args):
+            # The app may be shutting down by the time the call runs
+            self.app.call_from_thread(lambda: callback(*args) if self.is_attached else None)
+        
+        # --cprofile only sees the main thread unless the worker is profiled too
+        with profile_thread():
+            load_setting_values()
+            if self.database_file is not None:
+                # Categories are counted in SQL; their rows are only fetched as the table shows them
+                deliver(self.config_loaded, None, self.database_file.path)
+                for category in self.database_file.categories(self.show_all):
+                    if worker.is_cancelled:
+                        return
+                    deliver(self.add_category, category, self.database_file.records(category, self.show_all))
+                deliver(self.loading_finished)
+                return
+            
+            config, config_path = read_js8call_ini(self.config_path)
+            if config is None:
+                self.app.call_from_thread(self.app.exit)
+                return
+            deliver(self.config_loaded, config, config_path)
+            
+            with span("categorize settings"):
+                for category, records in iter_setting_records(config):
+                    if worker.is_cancelled:
+                        return
+                    deliver(self.add_category, category, records)
+            deliver(self.loading_finished)
+    
+    def config_loaded(self, config, config_path):
+        """Take over the parsed config."""
+        self.config = config
+        self.config_path = config_path
+        self._watched_config = config
+        self.update_status_bar()
+    
+    @traced()
+    def add_category(self, category, records):
+        """Add a category's records, showing it in the sidebar and opening it if it is the first."""
+        self.category_records[category] = records
+        self._records_generation += 1
+        if category in self.get_visible_categories():
+            self.categories.append(category)
+            self.query_one("#categories-list", ListView).append(ListItem(Label(category)))
+        
+        # A search started while loading must see the new settings
+        self._search_index = None
+        if self.search_query is not None:
+            self.start_search_index()
+        
+        if self.current_category is None and self.categories:
+            # Open the first category as soon as its rows exist
+            self.current_category = self.categories[0]
+            self.update_table()
+            categories_list = self.query_one("#categories-list", ListView)
+            categories_list.index = 0
+            table = self.query_one("#settings-table", SettingTable)
+            table.focus()
+            if table.row_count > 0:
+                table.move_cursor(row=0, column=0)
+                self.update_selected_row_description()
+            self.call_after_refresh(self.app.record_startup, "first category")
+    
+    def loading_finished(self):
+        """Wrap up once every category is loaded."""
+        self.loaded = True
+        if not self.categories:
+            self.query_one("#section-title", Static).update("No settings to show")
+        if self.watch:
+            self.start_watching()
+        self.update_status_bar()
+        self.call_after_refresh(self.app.record_startup, "all categories")
+    
+    def get_visible_categories(self):
+        """Return the non-empty categories in sidebar order."""
+        # Each non-empty category in our standard order, with "Other Settings" at the end
+        return [
+            category for category in STANDARD_CATEGORIES + ["Other Settings"]
+            if self.category_records.get(category)
+        ]
+    
+    def populate_categories(self):
+        """Fill the categories sidebar with the non-empty categories."""
+        categories_list = self.query_one("#categories-list", ListView)
+        categories_list.clear()
+        self.categories = self.get_visible_categories()
+        
+        # Add items one by one
+        for category in self.categories:
+            categories_list.append(ListItem(Label(category)))
+    
+    def start_watching(self):
+        """Reload the config whenever the file changes on disk."""
+        from js8call_watch import FileWatcher
+        self._watcher = FileWatcher(self.config_path, self._on_config_file_changed)
+        self._watcher.start()
+    
+    def on_unmount(self) -> None:
+        """Stop watching the config file when the screen goes away."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+    
+    def _on_config_file_changed(self, data):
+        """Parse and diff the rewritten file (runs in the watcher thread)."""
+        try:
+            new_config = IniFile(data)
+        except Exception:
+            # A half-written file will be picked up again on the next change
+            return
+        
+        changes = diff_configs(self._watched_config, new_config)
+        self._watched_config = new_config
+        if changes:
+            self.app.call_from_thread(self.apply_config_changes, new_config, changes)
+    
+    def apply_config_changes(self, new_config, changes):
+        """Patch the category records, cached rows and table with a list of SettingChanges."""
+        self.config = new_config
+        
+        # Work out the new displayed section and value of every changed key
+        updates_by_category = {}
+        for key in {change.key for change in changes}:
+            section, value = effective_setting(new_config, key)
+            category = get_setting_category(key)
+            records = self.category_records.get(category, [])
+            index = find_setting_record(records, key)
+            record = records[index] if index < len(records) and records[index].key == key else None
+            current = (record.section, record.value) if record else (None, None)
+            if current == (section, value):
+                # Only a value shadowed by a later section changed
+                continue
+            updates_by_category.setdefault(category, {})[key] = (section, value)
+        
+        for category, updates in updates_by_category.items():
+            records = self.patch_records(self.category_records.get(category, []), category, updates)
+            self._category_rows.pop(category, None)
+            if records:
+                self.category_records[category] = records
+            else:
+                # The category is now empty
+                self.category_records.pop(category, None)
+        self._records_generation += 1
+        changed_by_category = {category: set(updates) for category, updates in updates_by_category.items()}
+        
+        # Add or remove sidebar entries only if a category appeared or emptied
+        if self.get_visible_categories() != self.categories:
+            self.populate_categories()
+            if self.categories and self.current_category not in self.categories:
+                # The category on screen emptied, so fall back to the first one
+                self.current_category = self.categories[0]
+                self.update_table()
+            if self.categories:
+                self.query_one("#categories-list", ListView).index = self.categories.index(self.current_category)
+        
+        # The search index no longer matches the settings
+        self._search_index = None
+        if self.search_query is not None:
+            # Re-run the search against the new settings
+            self.start_search_index()
+        elif self.current_category in changed_by_category and self.current_category in self.category_records:
+            # Patch just the changed rows of the category on screen
+            table = self.query_one("#settings-table", SettingTable)
+            table.replace_rows(self.get_category_rows(self.current_category), changed_by_category[self.current_category])
+            self.update_selected_row_description()
+        
+        changed_count = sum(len(keys) for keys in changed_by_category.values())
+        self._reload_status = f"Reloaded {time.strftime('%H:%M:%S')}, {changed_count} changed"
+        self.update_status_bar()
+    
+    @staticmethod
+    def patch_records(records, category, updates):
+        """Return a copy of a category's records with {key: (section, value)} updates applied (None removes a key)."""
+        records = list(records)
+        for key in sorted(updates):
+            section, value = updates[key]
+            index = find_setting_record(records, key)
+            if index < len(records) and records[index].key == key:
+                del records[index]
+            if value is not None:
+                records.insert(index, SettingRecord(key, value, is_key_setting(key), section, category))
+        return records
+    
+    def update_status_bar(self):
+        """Show the file path, live reload state and author credit in the status bar."""
+        status_bar = self.query_one("#status-bar", Static)
+        
+        # Compact info with file path and subtle author credit
+        status_msg = f" File: {self.config_path or 'searching...'}"
+        if self.database_file is not None:
+            status_msg += f" [dim]• Database: {self.database_file.database.path} (read-only)[/dim]"
+        if not self.loaded:
+            status_msg += " [dim]• Loading...[/dim]"
+        elif self.watch:
+            status_msg += f" [dim]• Watching{': ' + self._reload_status if self._reload_status else ''}[/dim]"
+        status_msg += " [dim]• By Tiran Dagan[/dim]"
+        status_bar.update(status_msg)
+    
+    def update_selected_row_description(self):
+        """Update the description area based on the currently selected row in the table."""
+        record = self.query_one("#settings-table", SettingTable).cursor_record
+        if record is not None:
+            description_area = self.query_one("#description-area", DescriptionArea)
+            description_area.update_description(record.key, record.value, self.describe_record(record))
+    
+    @staticmethod
+    def describe_record(record):
+        """Return the description shown for a setting, led by its decoded value and any problem with it."""
+        description = record.description
+        if needs_decoding(record.value):
+            # Typed values are only decoded once the cursor reaches them
+            decoded = decode_value(record.value)
+            if decoded != record.value:
+                summary = describe_value(decoded) + " (v to browse)" if is_structured(decoded) else format_value(decoded, 80)
+                description = f"Decoded: {summary}. {description}"
+        problem = validate_setting(record.key, record.value)
+        if problem:
+            description = f"Invalid value: {problem}. {description}"
+        return description
+    
+    def get_category_rows(self, category):
+        """Return the table rows for a category: its records, or only the documented ones unless show_all."""
+        records = self.category_records[category]
+        if self.show_all or self.database_file is not None:
+            # Every record is shown (the database leaves out undocumented ones itself), so the table shares the category's list
+            return records
+        
+        rows = self._category_rows.get(category)
+        if rows is None:
+            rows = self._category_rows[category] = [record for record in records if record.documented]
+        return rows
+    
+    @traced()
+    def update_table(self):
+        """Update the settings table with data from the current category."""
+        if not self.current_category or self.current_category not in self.category_records:
+            return
+        
+        # Update section title
+        section_title = self.query_one("#section-title", Static)
+        section_title.update(f"Category: {self.current_category}")
+        
+        # Update table data, reusing the rows prepared on an earlier visit
+        table = self.query_one("#settings-table", SettingTable)
+        rows = self.get_category_rows(self.current_category)
+        table.set_rows(rows)
+        
+        # Update status bar with compact file path and author credit
+        self.update_status_bar()
+        
+        # Clear description area
+        description_area = self.query_one("#description-area", DescriptionArea)
+        description_area.update_description()
+        
+        # Lay out the category's descriptions in the background so cursor moves only hit the cache
+        if self.database_file is not None:
+            # Only the keys are read, so no records are built for rows that are never shown
+            description_area.prepare_layouts(rows.keys())
+        else:
+            description_area.prepare_layouts([record.key for record in table.rows.values()])
+        
+        # Show description of first setting if available (the cursor starts on it)
+        self.update_selected_row_description()
+    
+    def action_start_search(self) -> None:
+        """Open the search box, building the search index in the background if needed."""
+        search_input = self.query_one("#search-input", Input)
+        search_input.display = True
+        search_input.focus()
+        if self.search_query is None:
+            self.search_query = ""
+            self.start_search_index()
+    
+    def action_end_search(self) -> None:
+        """Close the search box and go back to the current category."""
+        if self.search_query is None:
+            return
+        self.end_search()
+        self.update_table()
+        self.query_one("#settings-table").focus()
+    
+    def end_search(self):
+        """Hide and clear the search box."""
+        self.search_query = None
+        search_input = self.query_one("#search-input", Input)
+        search_input.display = False
+        search_input.value = ""
+    
+    def start_search_index(self):
+        """Build the search index over every displayed setting in a worker thread."""
+        if self._search_index is not None and self._search_index_generation == self._records_generation:
+            self.run_search()
+            return
+        
+        if self.database_file is not None:
+            # The database searches its full-text index, so there is nothing to build
+            self.search_index_ready(self.database_file.search_index(self.show_all), self._records_generation)
+            return
+        
+        self._search_index = None
+        # Gather the rows here; sorting and indexing them happens off the UI thread
+        rows = [row for category in self.categories for row in self.get_category_rows(category)]
+        generation = self._records_generation
+        self.query_one("#section-title", Static).update("Search: building index...")
+        
+        def build():
+            index = SettingSearchIndex(sorted(rows))
+            self.app.call_from_thread(self.search_index_ready, index, generation)
+        
+        self.run_worker(build, thread=True, exclusive=True, group="search-index")
+    
+    def search_index_ready(self, index, generation):
+        """Install a freshly built search index and run the pending query."""
+        if generation != self._records_generation:
+            # Built from records that have changed since; the build started for the new ones will install its index
+            return
+        self._search_index = index
+        self._search_index_generation = generation
+        if self.search_query is not None:
+            self.run_search()
+    
+    def run_search(self):
+        """Show the rows matching the current query in the table."""
+        if self._search_index is None or self.search_query is None:
+            return
+        
+        rows = self._search_index.search(self.search_query)
+        table = self.query_one("#settings-table", SettingTable)
+        table.set_rows(rows)
+        
+        section_title = self.query_one("#section-title", Static)
+        section_title.update(f"Search: {self.search_query} ({len(rows)} of {len(self._search_index)} settings)")
+        if rows:
+            self.update_selected_row_description()
+        else:
+            self.query_one("#description-area", DescriptionArea).update_description()
+    
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Re-run the search on every keystroke."""
+        if event.input.id == "search-input" and self.search_query is not None:
+            self.search_query = event.value
+            self.run_search()
+    
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Move from the search box to the results."""
+        if event.input.id == "search-input":
+            self.query_one("#settings-table").focus()
+    
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        """Handle selection of a category in the list."""
+        if self.search_query is not None:
+            # Picking a category ends the search
+            self.end_search()
+        if isinstance(event.item, ListItem):
+            # Find the index of the selected item
+            list_view = self.query_one("#categories-list")
+            items = list(list_view.children)
+            if event.item in items:
+                index = items.index(event.item)
+                if 0 <= index < len(self.categories):
+                    self.current_category = self.categories[index]
+                    self.update_table()
+                    
+                    # Focus on the table after selecting a category
+                    self.query_one("#settings-table").focus()
+    
+    def on_key(self, event: events.Key) -> None:
+        """Note when navigation keys arrive, for the key-to-description latency report."""
+        if self.app.latency_monitor is None or self._description_pending:
+            # Only the first key of a burst handled by one description update is timed
+            return
+        if self.focused and self.focused.id == "settings-table" and event.key in self.NAVIGATION_KEYS:
+            self._key_time = time.perf_counter()
+    
+    def on_setting_table_row_highlighted(self, event: SettingTable.RowHighlighted) -> None:
+        """Update the description when the cursor moves, at most once per batch of queued keys."""
+        if not self._description_pending:
+            self._description_pending = True
+            # Runs once the queued messages (e.g. held-down key repeats) are processed
+            self.call_later(self.show_highlighted_description)
+    
+    def show_highlighted_description(self):
+        """Describe the setting under the cursor's latest position."""
+        self._description_pending = False
+        self.update_selected_row_description()
+        
+        if self._key_time is not None:
+            # Measure up to the screen update that shows the new description
+            key_time, self._key_time = self._key_time, None
+            monitor = self.app.latency_monitor
+            self.call_after_refresh(lambda: monitor.record(time.perf_counter() - key_time))
+    
+    def action_focus_categories(self) -> None:
+        """Focus on the categories list."""
+        self.query_one("#categories-list").focus()
+    
+    def action_focus_settings(self) -> None:
+        """Focus on the settings table."""
+        self.query_one("#settings-table").focus()
+    
+    def action_next_setting(self) -> None:
+        """Move to the next setting."""
+        table = self.query_one("#settings-table", SettingTable)
+        table.action_cursor_down()
+    
+    def action_prev_setting(self) -> None:
+        """Move to the previous setting."""
+        table = self.query_one("#settings-table", SettingTable)
+        table.action_cursor_up()
+    
+    def action_toggle_focus(self) -> None:
+        """Toggle focus between categories and settings."""
+        if self.focused.id == "categories-list":
+            self.query_one("#settings-table").focus()
+        else:
+            self.query_one("#categories-list").focus()
+
+    def action_show_values(self) -> None:
+        """Show the valid values screen for the current setting."""
+        # Get the current setting from the table
+        record = self.query_one("#settings-table", SettingTable).cursor_record
+        if record is not None:
+            # Show the values screen as a modal dialog
+            values_screen = SettingValuesScreen(record.key, record.value, record.valid_values)
+            self.app.push_screen(values_screen)
+
+    def check_action(self, action, parameters):
+        """Hide history in --db mode, where config_path is the path as exported and not a file to look up."""
+        if action == "show_history" and self.database_file is not None:
+            return False
+        return True
+    
+    def action_show_history(self) -> None:
+        """Show the stored snapshot history of the current setting."""
+        record = self.query_one("#settings-table", SettingTable).cursor_record
+        if record is not None:
+            self.app.push_screen(HistoryScreen(self.app.snapshot_store, os.path.abspath(self.config_path), record))
+
+    def on_setting_table_row_selected(self, event: SettingTable.RowSelected) -> None:
+        """Handle selection of a setting in the table."""
+        # Update description area with the full description
+        self.update_selected_row_description()
+
+class DiffScreen(Screen):
+    """Screen listing the settings that changed between consecutive snapshots of a config."""
+    
+    BINDINGS = [
+        Binding("q", "quit", "Quit"),
+        Binding("h", "focus_categories", "Categories"),
+        Binding("l", "focus_settings", "Settings"),
+        Binding("tab", "toggle_focus", "Toggle Focus"),
+        Binding("n", "next_step", "Next Diff"),
+        Binding("p", "prev_step", "Previous Diff"),
+    ]
+    
+    def __init__(self, chain, show_all=False):
+        super().__init__()
+        self.chain = chain
+        self.show_all = show_all
+        self.step = 0
+        self.current_category = None
+        self.categories = []
+        
+        # Changes grouped by category for each step viewed so far
+        self._grouped_steps = {}
+    
+    def compose(self) -> ComposeResult:
+        """Create child widgets for the diff screen."""
+        yield Header(show_clock=True)
+        
+        with Horizontal():
+            with Vertical(id="sidebar", classes="sidebar"):
+                yield Static("Changed Categories", id="sidebar-header", classes="sidebar-header")
+                yield ListView(*[], id="categories-list")
+            
+            with Vertical(id="settings-area"):
+                yield Static("", id="section-title", classes="section-title")
+                with ScrollableContainer(id="table-container"):
+                    yield SettingTable(id="settings-table")
+        
+        yield DescriptionArea("", id="description-area", classes="description-area")
+        yield Static("", id="status-bar", classes="status-bar")
+        yield Footer()
+    
+    def on_mount(self) -> None:
+        """Show the first step of the chain."""
+        self.show_step(0)
+        self.query_one("#settings-table").focus()
+    
+    def get_grouped_changes(self, step):
+        """Return {category: [SettingChange]} for a step, diffing the files on first visit."""
+        grouped = self._grouped_steps.get(step)
+        if grouped is None:
+            grouped = self._grouped_steps[step] = group_changes_by_category(self.chain.changes(step), self.show_all)
+        return grouped
+    
+    def show_step(self, step):
+        """Show the changes between snapshot step and the next one."""
+        self.step = step
+        grouped = self.get_grouped_changes(step)
+        self.categories = list(grouped)
+        
+        categories_list = self.query_one("#categories-list", ListView)
+        categories_list.clear()
+        for category in self.categories:
+            categories_list.append(ListItem(Label(f"{category} ({len(grouped[category])})")))
+        
+        change_count = sum(len(changes) for changes in grouped.values())
+        status_bar = self.query_one("#status-bar", Static)
+        status_bar.update(
+            f" Diff {step + 1} of {len(self.chain)}: {self.chain.paths[step]} → {self.chain.paths[step + 1]}"
+            f" [dim]• {change_count} changes[/dim]"
+        )
+        
+        self.current_category = self.categories[0] if self.categories else None
+        if self.categories:
+            categories_list.index = 0
+        self.update_table()
+    
+    @traced()
+    def update_table(self):
+        """Fill the table with the changes in the current category."""
+        table = self.query_one("#settings-table", SettingTable)
+        section_title = self.query_one("#section-title", Static)
+        if self.current_category is None:
+            section_title.update("No changes")
+            table.clear()
+            self.query_one("#description-area", DescriptionArea).update_description()
+            return
+        
+        section_title.update(f"Category: {self.current_category}")
+        changes = self.get_grouped_changes(self.step)[self.current_category]
+        table.set_rows([
+            SettingRecord(change.key, change.describe_change(), is_key_setting(change.key), change.section, self.current_category)
+            for change in changes
+        ])
+        self.update_selected_row_description()
+    
+    def update_selected_row_description(self):
+        """Describe the change under the cursor."""
+        table = self.query_one("#settings-table", SettingTable)
+        if self.current_category is None or not table.row_count:
+            return
+        
+        change = self.get_grouped_changes(self.step)[self.current_category][table.cursor_row]
+        description = get_setting_description(change.key)
+        self.query_one("#description-area", DescriptionArea).update(
+            f"[bold]{escape(f'{change.section}/{change.key}')}[/bold] {change.kind}\n{escape(description)}"
+        )
+    
+    def on_setting_table_row_highlighted(self, event: SettingTable.RowHighlighted) -> None:
+        """Keep the description in step with the cursor."""
+        self.update_selected_row_description()
+    
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        """Handle selection of a category in the list."""
+        list_view = self.query_one("#categories-list")
+        index = list_view.index
+        if index is not None and 0 <= index < len(self.categories):
+            self.current_category = self.categories[index]
+            self.update_table()
+            self.query_one("#settings-table").focus()
+    
+    def action_focus_categories(self) -> None:
+        """Focus on the categories list."""
+        self.query_one("#categories-list").focus()
+    
+    def action_focus_settings(self) -> None:
+        """Focus on the settings table."""
+        self.query_one("#settings-table").focus()
+    
+    def action_toggle_focus(self) -> None:
+        """Toggle focus between categories and settings."""
+        if self.focused and self.focused.id == "categories-list":
+            self.query_one("#settings-table").focus()
+        else:
+            self.query_one("#categories-list").focus()
+    
+    def action_next_step(self) -> None:
+        """Show the next pair of snapshots."""
+        if self.step < len(self.chain) - 1:
+            self.show_step(self.step + 1)
+    
+    def action_prev_step(self) -> None:
+        """Show the previous pair of snapshots."""
+        if self.step > 0:
+            self.show_step(self.step - 1)
+
+class FleetScreen(Screen):
+    """Screen showing how each setting's values are spread across a fleet of station configs.
+    
+    Station files are parsed by a worker thread pool and added as each one
+    finishes; the sidebar, table and status bar catch up a few times a second
+    while loading.
+    """
+    
+    BINDINGS = [
+        Binding("q", "quit", "Quit"),
+        Binding("h", "focus_categories", "Categories"),
+        Binding("l", "focus_settings", "Settings"),
+        Binding("j", "next_setting", "Next"),
+        Binding("k", "prev_setting", "Previous"),
+        Binding("tab", "toggle_focus", "Toggle Focus"),
+    ]
+    
+    # Seconds between view refreshes while stations are being added
+    REFRESH_INTERVAL = 0.1
+    
+    # Deviating stations listed in the description before the rest are counted
+    DEVIATING_SHOWN = 6
+    
+    def __init__(self, paths, show_all=False, jobs=None):
+        super().__init__()
+        self.paths = list(paths)
+        self.station_names = dict(zip(self.paths, station_names(self.paths)))
+        self.show_all = show_all
+        self.jobs = jobs
+        self.fleet = FleetAggregate()
+        self.current_category = None
+        self.categories = []
+        
+        # The SettingDistributions shown in the table, row for row
+        self._distributions = []
+        # Categories changed by stations added since the last refresh
+        self._changed_categories = set()
+        self._refresh_pending = False
+    
+    def compose(self) -> ComposeResult:
+        """Create child widgets for the fleet screen."""
+        yield Header(show_clock=True)
+        
+        with Horizontal():
+            with Vertical(id="sidebar", classes="sidebar"):
+                yield Static("Categories", id="sidebar-header", classes="sidebar-header")
+                yield ListView(*[], id="categories-list")
+            
+            with Vertical(id="settings-area"):
+                yield Static("Loading stations...", id="section-title", classes="section-title")
+                with ScrollableContainer(id="table-container"):
+                    yield SettingTable(id="settings-table")
+        
+        yield DescriptionArea("", id="description-area", classes="description-area")
+        yield Static("", id="status-bar", classes="status-bar")
+        yield Footer()
+    
+    def on_mount(self) -> None:
+        """Start loading the stations in the background."""
+        self.update_status_bar()
+        self.query_one("#settings-table").focus()
+        self.run_worker(self.load_stations, thread=True, group="fleet-load")
+    
+    def load_stations(self):
+        """Hand each station to the UI thread as soon as its file is parsed (runs in a worker thread)."""
+        worker = get_current_worker()
+        for path, config, error in load_stations(self.paths, self.jobs, lambda: worker.is_cancelled):
+            if worker.is_cancelled:
+                break
+            self.app.call_from_thread(self.add_station, path, config, error)
+    
+    def add_station(self, path, config, error):
+        """Add a loaded station to the aggregate and schedule a refresh of the view."""
+        name = self.station_names[path]
+        if config is None:
+            self.fleet.add_error(name, error)
+        else:
+            self._changed_categories |= self.fleet.add_station(name, config)
+        
+        if not self._refresh_pending:
+            # Batch the stations that finish before the next refresh
+            self._refresh_pending = True
+            self.set_timer(self.REFRESH_INTERVAL, self.refresh_fleet)
+    
+    def refresh_fleet(self):
+        """Bring the sidebar, table and status bar up to date with the stations added so far."""
+        self._refresh_pending = False
+        changed, self._changed_categories = self._changed_categories, set()
+        
+        # Add sidebar entries only when a category first gets settings
+        categories = self.fleet.get_visible_categories(self.show_all)
+        if categories != self.categories:
+            self.categories = categories
+            categories_list = self.query_one("#categories-list", ListView)
+            categories_list.clear()
+            for category in categories:
+                categories_list.append(ListItem(Label(category)))
+            if self.current_category is None and categories:
+                self.current_category = categories[0]
+                changed.add(self.current_category)
+            if self.current_category in categories:
+                categories_list.index = categories.index(self.current_category)
+        
+        if self.current_category in changed:
+            self.update_table(keep_cursor=True)
+        self.update_status_bar()
+    
+    def update_status_bar(self):
+        """Show loading progress and unreadable files in the status bar."""
+        loaded = len(self.fleet.stations)
+        done = loaded + len(self.fleet.errors)
+        if done < len(self.paths):
+            status_msg = f" Fleet: {done} of {len(self.paths)} files loaded"
+        else:
+            status_msg = f" Fleet: {loaded} stations"
+        if self.fleet.errors:
+            status_msg += f" [dim]• {len(self.fleet.errors)} unreadable[/dim]"
+        self.query_one("#status-bar", Static).update(status_msg)
+    
+    @traced()
+    def update_table(self, keep_cursor=False):
+        """Fill the table with the current category's settings and their value distributions."""
+        table = self.query_one("#settings-table", SettingTable)
+        if self.current_category is None:
+            return
+        
+        self.query_one("#section-title", Static).update(f"Category: {self.current_category}")
+        total = len(self.fleet.stations)
+        self._distributions = self.fleet.category_settings(self.current_category, self.show_all)
+        rows = [
+            SettingRecord(distribution.key, distribution.summary(total), is_key_setting(distribution.key), None, self.current_category)
+            for distribution in self._distributions
+        ]
+        
+        if keep_cursor:
+            # Re-render the rows whose summary changed, leaving the cursor where it is
+            previous = {record.key: record.value for record in table.rows.values()}
+            changed_keys = [record.key for record in rows if previous.get(record.key) != record.value]
+            table.replace_rows(rows, changed_keys, highlight=False)
+        else:
+            table.set_rows(rows)
+        self.update_selected_row_description()
+    
+    def update_selected_row_description(self):
+        """Describe the spread of values of the setting under the cursor."""
+        table = self.query_one("#settings-table", SettingTable)
+        description_area = self.query_one("#description-area", DescriptionArea)
+        if not self._distributions:
+            description_area.update_description()
+            return
+        
+        distribution = self._distributions[table.cursor_row]
+        total = len(self.fleet.stations)
+        heading = f"{distribution.key}: set on {distribution.station_count} of {total} stations"
+        deviating = distribution.deviating_stations()
+        if distribution.majority_value is None:
+            counts = distribution.value_counts()
+            tied = [value for value, count in counts if count == counts[0][1]]
+            spread = f"No majority: {len(tied)} values are equally common"
+        elif deviating:
+            shown = ", ".join(f"{station} = {value}" for station, value in deviating[:self.DEVIATING_SHOWN])
+            if len(deviating) > self.DEVIATING_SHOWN:
+                shown += f" and {len(deviating) - self.DEVIATING_SHOWN} more"
+            spread = f"Majority {distribution.majority_value}; deviating: {shown}"
+        else:
+            spread = f"All agree: {distribution.majority_value}"
+        
+        description_area.update(
+            f"[bold]{escape(heading)}[/bold]\n{escape(spread)}\n{escape(get_setting_description(distribution.key))}"
+        )
+    
+    def on_setting_table_row_highlighted(self, event: SettingTable.RowHighlighted) -> None:
+        """Keep the description in step with the cursor."""
+        self.update_selected_row_description()
+    
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        """Handle selection of a category in the list."""
+        index = self.query_one("#categories-list").index
+        if index is not None and 0 <= index < len(self.categories):
+            self.current_category = self.categories[index]
+            self.update_table()
+            self.query_one("#settings-table").focus()
+    
+    def action_focus_categories(self) -> None:
+        """Focus on the categories list."""
+        self.query_one("#categories-list").focus()
+    
+    def action_focus_settings(self) -> None:
+        """Focus on the settings table."""
+        self.query_one("#settings-table").focus()
+    
+    def action_next_setting(self) -> None:
+        """Move to the next setting."""
+        self.query_one("#settings-table", SettingTable).action_cursor_down()
+    
+    def action_prev_setting(self) -> None:
+        """Move to the previous setting."""
+        self.query_one("#settings-table", SettingTable).action_cursor_up()
+    
+    def action_toggle_focus(self) -> None:
+        """Toggle focus between categories and settings."""
+        if self.focused and self.focused.id == "categories-list":
+            self.query_one("#settings-table").focus()
+        else:
+            self.query_one("#categories-list").focus()
+
+class HistoryScreen(Screen):
+    """Screen listing every value one setting had across the stored snapshots of its file."""
+    
+    BINDINGS = [
+        Binding("escape", "app.pop_screen", "Back"),
+        Binding("q", "app.pop_screen", "Back"),
+        Binding("j", "next_version", "Next"),
+        Binding("k", "prev_version", "Previous"),
+    ]
+    
+    def __init__(self, store, source, record):
+        super().__init__()
+        self.store = store
+        self.source = source
+        self.record = record
+        self.versions = []
+    
+    def compose(self) -> ComposeResult:
+        """Create child widgets for the history screen."""
+        yield Header(show_clock=True)
+        
+        with Vertical(id="history-area"):
+            yield Static(f"History: {escape(self.record.key)}", id="section-title", classes="section-title")
+            with ScrollableContainer(id="table-container"):
+                yield SettingTable(id="settings-table", headers=("Snapshot", "Value"))
+        
+        yield DescriptionArea("", id="description-area", classes="description-area")
+        yield Static(" Loading snapshots...", id="status-bar", classes="status-bar")
+        yield Footer()
+    
+    def on_mount(self) -> None:
+        """Describe the setting and read its history in the background."""
+        description_area = self.query_one("#description-area", DescriptionArea)
+        description_area.update(
+            f"[bold]{escape(self.record.key)}[/bold] [dim]{escape(self.record.category or '')}[/dim]\n"
+            f"{escape(self.record.description)}"
+        )
+        self.query_one("#settings-table").focus()
+        # Opening the store reads its whole index, which can take a while for years of snapshots
+        self.run_worker(self.load_history, thread=True, group="history-load")
+    
+    def load_history(self):
+        """Look up the setting's versions (runs in a worker thread)."""
+        try:
+            versions = self.store.history(self.source, self.record.key, self.record.section)
+        except (OSError, ValueError, KeyError) as e:
+            self.app.call_from_thread(self.show_error, str(e))
+            return
+        self.app.call_from_thread(self.show_history, versions)
+    
+    def show_history(self, versions):
+        """Fill the table with the versions, newest first."""
+        self.versions = versions[::-1]
+        table = self.query_one("#settings-table", SettingTable)
+        table.set_rows([
+            SettingRecord(
+                f"#{version.snapshot['id']} {format_time(version.captured)}",
+                "(removed)" if version.value is None else version.value,
+                # Versions matching the value in the file now are shown in bold
+                version.value == self.record.value,
+                version.section,
+                self.record.category,
+            )
+            for version in self.versions
+        ])
+        
+        status_bar = self.query_one("#status-bar", Static)
+        if versions:
+            status_bar.update(
+                f" {len(versions)} versions in {len(self.store.snapshots(self.source))} snapshots of {escape(self.source)}"
+                f" [dim]• {escape(self.store.path)}[/dim]"
+            )
+        else:
+            status_bar.update(
+                f" No snapshots of this setting in {escape(self.store.path)}"
+                " [dim]• take one with the snapshot command[/dim]"
+            )
+    
+    def show_error(self, message):
+        """Report a store that could not be read."""
+        self.query_one("#status-bar", Static).update(f" [bold red]Error reading snapshot store: {escape(message)}[/bold red]")
+    
+    def action_next_version(self) -> None:
+        """Move to the next (older) version."""
+        self.query_one("#settings-table", SettingTable).action_cursor_down()
+    
+    def action_prev_version(self) -> None:
+        """Move to the previous (newer) version."""
+        self.query_one("#settings-table", SettingTable).action_cursor_up()
+
+class LatencyMonitor:
+    """Collects key-to-description latencies and summarizes them."""
+    
+    def __init__(self):
+        self.samples = []
+    
+    def record(self, seconds):
+        self.samples.append(seconds)
+    
+    def summary(self):
+        """Return a one-line summary of the recorded latencies."""
+        if not self.samples:
+            return "Key-to-description latency: no navigation keys recorded"
+        samples = sorted(self.samples)
+        
+        def percentile(fraction):
+            return samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000
+        
+        return (
+            f"Key-to-description latency over {len(samples)} updates: "
+            f"median {percentile(0.5):.1f} ms, p95 {percentile(0.95):.1f} ms, max {samples[-1] * 1000:.1f} ms"
+        )
+
+class HelpScreen(Screen):
+    """Help screen for the application."""
+    
+    BINDINGS = [
+        Binding("escape", "app.pop_screen", "Back"),
+        Binding("q", "app.pop_screen", "Back")
+    ]
+    
+    def compose(self) -> ComposeResult:
+        """Create child widgets for the help screen."""
+        yield Static("JS8Call Configuration Viewer - Help", id="help-title")
+        
+        with ScrollableContainer():
+            yield Static("""
+Keyboard Shortcuts:
+-----------------
+[Tab]    - Toggle focus between categories and settings
+[h]      - Focus on categories
+[l]      - Focus on settings
+[j]      - Move to next setting
+[k]      - Move to previous setting
+[Enter]  - Select item
+[F1]     - Show/hide this help
+[v]      - Show valid values for current setting
+[t]      - Show stored snapshot history of current setting
+[/]      - Search keys, values and descriptions (Esc to close)
+[n]/[p]  - Next/previous pair of files (diff mode)
+[q]      - Quit application
+
+About this application:
+---------------------
+This tool displays JS8Call settings from your js8call.ini file with descriptions 
+of what each setting does and how it affects JS8Call's behavior.
+
+The left sidebar shows configuration categories, and the right panel displays 
+the settings in the selected category.
+
+By default, only documented settings are shown. If you launched with --all, 
+all settings including undocumented ones will be shown.
+
+The description area at the bottom shows detailed information about the 
+currently selected setting.
+
+Navigate with arrow keys or hjkl keys and select items with Enter.
+
+Copyright and Attribution:
+------------------------
+© 2023-2024 Tiran Dagan (tiran@tirandagan.com)
+All rights reserved.
+
+This software is provided for educational and personal use only.
+Redistribution requires written permission from the author.
+            """, id="help-content")
+        
+        yield Button("Close", id="close-help")
+    
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle button press."""
+        if event.button.id == "close-help":
+            self.app.pop_screen()
+
+class JS8CallConfigViewer(App):
+    """Main application class."""
+    
+    CSS = """
+    Screen {
+        background: $surface;
+    }
+    
+    #sidebar {
+        width: 20%;
+        border-right: solid $primary;
+    }
+    
+    .sidebar-header {
+        background: $accent;
+        color: $text;
+        text-align: center;
+        text-style: bold;
+        padding: 1;
+    }
+    
+    #settings-area {
+        width: 80%;
+    }
+    
+    .section-title {
+        background: $accent;
+        color: $text;
+        text-align: center;
+        text-style: bold;
+        padding: 1;
+    }
+    
+    #settings-table {
+        height: 100%;
+        border: solid $primary;
+    }
+    
+    #table-container {
+        height: 1fr;
+    }
+    
+    #search-input {
+        display: none;
+    }
+    
+    #categories-list {
+        border: none;
+        padding: 0 1;
+        background: $surface;
+        height: 1fr;
+    }
+    
+    .description-area {
+        padding: 0 1;
+        height: 3;
+        background: $boost;
+        color: $text;
+        border-top: none;
+    }
+    
+    .status-bar {
+        padding: 0;
+        background: $surface-lighten-1;
+        color: $text;
+        height: 1;
+        border-top: solid $primary;
+    }
+    
+    #help-title {
+        background: $accent;
+        color: $text;
+        text-align: center;
+        text-style: bold;
+        padding: 1;
+    }
+    
+    #help-content {
+        padding: 1 2;
+    }
+    
+    #close-help {
+        margin: 1 0;
+        dock: bottom;
+        width: 20;
+        align: center middle;
+    }
+    
+    #values-dialog {
+        width: 70%;
+        height: 70%;
+        border: solid $primary;
+        background: $surface;
+    }
+    
+    #values-title {
+        background: $accent;
+        color: $text;
+        text-align: center;
+        text-style: bold;
+        padding: 1;
+    }
+    
+    #values-content {
+        padding: 1 2;
+        height: 1fr;
+        overflow-y: auto;
+    }
+    
+    #decoded-table {
+        height: 1fr;
+        border: solid $primary;
+    }
+    
+    #values-footer {
+        background: $surface-lighten-1;
+        color: $text;
+        text-align: center;
+        padding: 1;
+        border-top: solid $primary;
+    }
+    
+    Header {
+        height: 1;
+        padding: 0;
+    }
+    
+    Footer {
+        height: 1;
+        padding: 0;
+    }
+    """
+    
+    BINDINGS = [
+        Binding("q", "quit", "Quit"),
+        Binding("f1", "show_help", "Help"),
+    ]
+    
+    def __init__(self, config_path=None, show_all=False, watch=False, diff_paths=None, latency_report=False,
+                 fleet_paths=None, jobs=None, database_file=None):
+        super().__init__()
+        self.config_path = config_path
+        self.database_file = database_file
+        self.show_all = show_all
+        self.watch = watch
+        self.diff_paths = diff_paths
+        self.fleet_paths = fleet_paths
+        self.jobs = jobs
+        self.latency_monitor = LatencyMonitor() if latency_report else None
+        # Startup stage -> seconds from launch until it was on screen
+        self.startup_times = {}
+        # Read on first use, then shared by every history screen
+        self.snapshot_store = SnapshotStore(get_snapshot_store_path())
+    
+    def on_mount(self) -> None:
+        """Set up the application after it has been mounted."""
+        if self.diff_paths or self.fleet_paths:
+            # Load valid values for settings (the main screen loads them in its worker)
+            load_setting_values()
+        
+        if self.diff_paths:
+            # Diff mode compares snapshots instead of showing a single file
+            self.push_screen(DiffScreen(DiffChain(self.diff_paths), self.show_all))
+            return
+        
+        if self.fleet_paths:
+            # Fleet mode aggregates many station files
+            self.push_screen(FleetScreen(self.fleet_paths, self.show_all, self.jobs))
+            return
+        
+        # The main screen paints at once and reads the config file in the background
+        self.push_screen(SettingsView(self.config_path, self.show_all, self.watch, self.database_file))
+    
+    def record_startup(self, stage):
+        """Note how long after launch a startup stage first reached the screen."""
+        if stage not in self.startup_times:
+            self.startup_times[stage] = since_start(f"startup: {stage}")
+    
+    def startup_summary(self):
+        """Return a one-line summary of the startup stage times."""
+        stages = ", ".join(f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in self.startup_times.items())
+        return f"Time to first paint: {stages or 'nothing painted'}"
+    
+    def action_show_help(self) -> None:
+        """Show the help screen."""
+        self.push_screen(HelpScreen())
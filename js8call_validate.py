@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Validation of setting values against the formats documented in js8call_settings_values.md.
+
+Each free-text format ("Integer: 0-100 (dB)", "Hex color code ...", ...) is
+compiled once into a validator function, and results are cached per
+(key, value) pair, so checking the same value again (e.g. the same colors in a
+thousand station files) is a dictionary lookup. Formats that don't constrain
+the value (free text, Qt binary blobs, "typically" ranges) get no validator.
+
+Batch validation of many files uses the same process pool as the export
+command.
+"""
+
+import json
+import re
+import sys
+
+from js8call_config_viewer import SETTING_VALUES, get_setting_values, load_setting_values
+from js8call_ini import IniFile
+
+CALLSIGN_PATTERN = re.compile(
+    # Optional country prefix (e.g. VE3/), prefix with at least one letter, digit, suffix and optional /P-style suffix
+    r"(?:[A-Z0-9]{1,4}/)?(?=[A-Z0-9]{0,2}[A-Z])[A-Z0-9]{1,3}[0-9][A-Z0-9]{0,3}[A-Z](?:/[A-Z0-9]{1,4})?",
+    re.IGNORECASE,
+)
+GRID_PATTERN = re.compile(r"[A-R]{2}[0-9]{2}(?:[A-X]{2}(?:[0-9]{2})?)?", re.IGNORECASE)
+COLOR_PATTERN = re.compile(r"#[0-9A-Fa-f]{6}")
+INTEGER_PATTERN = re.compile(r"[+-]?[0-9]+")
+NUMBER_PATTERN = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+# (key, value) results kept by a SettingValidator; the oldest go first
+RESULT_CACHE_SIZE = 4096
+
+# Fields of a Qt font string: family, point size, then eight integers
+FONT_FIELDS = 10
+
+# Parts of a format string that describe the constraint
+RANGE_PATTERN = re.compile(r"(-?[0-9.]+)\s*(?:-|to)\s*\+?(-?[0-9.]+)")
+CHOICE_PATTERN = re.compile(r"(-?[0-9]+)=")
+QUOTED_PATTERN = re.compile(r'"([^"]*)"')
+
+def unquote(value):
+    """Strip the double quotes QSettings puts around values containing commas or edge spaces."""
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1]
+    return value
+
+def pattern_validator(pattern, message):
+    """Return a validator accepting values that fully match a compiled regex."""
+    def validate(value):
+        return None if pattern.fullmatch(value) else message
+    return validate
+
+def integer_validator(minimum=None, maximum=None, choices=None, power_of_two=False):
+    """Return a validator for integers, optionally within a range, among choices or powers of two."""
+    if choices is not None:
+        expected = "one of " + ", ".join(str(choice) for choice in sorted(choices))
+    elif minimum is not None:
+        expected = f"an integer from {minimum} to {maximum}"
+    elif power_of_two:
+        expected = "a power of 2"
+    else:
+        expected = "an integer"
+    message = f"expected {expected}"
+    
+    def validate(value):
+        if not INTEGER_PATTERN.fullmatch(value):
+            return message
+        number = int(value)
+        if choices is not None and number not in choices:
+            return message
+        if minimum is not None and not minimum <= number <= maximum:
+            return message
+        if power_of_two and (number <= 0 or number & (number - 1)):
+            return message
+        return None
+    return validate
+
+def number_validator(minimum=None, maximum=None):
+    """Return a validator for decimal numbers, optionally within a range."""
+    message = f"expected a number from {minimum:g} to {maximum:g}" if minimum is not None else "expected a number"
+    
+    def validate(value):
+        if not NUMBER_PATTERN.fullmatch(value):
+            return message
+        if minimum is not None and not minimum <= float(value) <= maximum:
+            return message
+        return None
+    return validate
+
+def choice_validator(choices):
+    """Return a validator accepting one of a fixed set of strings."""
+    message = "expected one of " + ", ".join(choices)
+    choices = frozenset(choices)
+    
+    def validate(value):
+        return None if value in choices else message
+    return validate
+
+def validate_font(value):
+    """Check a Qt font string: "Family,Size,Weight,Italic,Strikeout,Underline,StyleHint,Spacing,FixedPitch,Kerning"."""
+    fields = value.split(",")
+    # Newer Qt versions append more fields (and a style name), so only the first ten are checked
+    if len(fields) < FONT_FIELDS:
+        return f"expected a font with at least {FONT_FIELDS} comma-separated fields"
+    if not fields[0].strip():
+        return "font family is empty"
+    if not NUMBER_PATTERN.fullmatch(fields[1]):
+        return "font size is not a number"
+    if not all(INTEGER_PATTERN.fullmatch(field) for field in fields[2:FONT_FIELDS]):
+        return "font weight, style and flag fields must be integers"
+    return None
+
+BOOLEAN_VALIDATOR = choice_validator(["true", "false"])
+
+def compile_format(text):
+    """Compile a documented format string into a validator, or None if the format doesn't constrain values.
+    
+    A validator takes a value and returns None if it is valid, else a short message.
+    """
+    if text.startswith('"true" or "false"'):
+        return BOOLEAN_VALIDATOR
+    if text.startswith("Valid amateur callsign"):
+        return pattern_validator(CALLSIGN_PATTERN, "not a valid callsign")
+    if "Maidenhead grid" in text:
+        return pattern_validator(GRID_PATTERN, "not a valid Maidenhead grid (e.g. FN20 or IO91wm)")
+    if text.startswith("Hex color code"):
+        return pattern_validator(COLOR_PATTERN, "expected a #RRGGBB color")
+    if text.startswith('"Family,Size') or text.startswith("Same as Font format"):
+        return validate_font
+    
+    kind, _, rest = text.partition(":")
+    rest = rest.strip()
+    if kind == "String":
+        choices = QUOTED_PATTERN.findall(rest)
+        return choice_validator(choices) if choices else None
+    if kind not in ("Integer", "Double"):
+        # Free text, paths, device names and Qt-serialized data
+        return None
+    
+    # "typically" and "e.g." ranges are only guidance, so just the type is checked
+    advisory = "typically" in rest or "e.g." in rest
+    match = None if advisory else RANGE_PATTERN.match(rest)
+    if kind == "Double":
+        return number_validator(float(match.group(1)), float(match.group(2))) if match else number_validator()
+    
+    choices = {int(choice) for choice in CHOICE_PATTERN.findall(rest)}
+    if choices:
+        return integer_validator(choices=choices)
+    either = re.fullmatch(r"(-?[0-9]+) or (-?[0-9]+)", rest)
+    if either:
+        return integer_validator(choices={int(either.group(1)), int(either.group(2))})
+    if "power of 2" in rest:
+        return integer_validator(power_of_two=True)
+    if match:
+        return integer_validator(int(float(match.group(1))), int(float(match.group(2))))
+    return integer_validator()
+
+class SettingValidator:
+    """Validates setting values, compiling each documented format once and memoizing results.
+    
+    Empty values (settings never set in JS8Call) and Qt-serialized @Variant(...)
+    values are not checked.
+    """
+    
+    def __init__(self, setting_values):
+        self._setting_values = setting_values
+        # Compiled tables are rebuilt when the documentation is (re)loaded
+        self._size = None
+    
+    def _reset(self):
+        self._size = len(self._setting_values)
+        # Key -> validator (None for keys without a checkable format)
+        self._validators = {}
+        # (key, value) -> problem message or None, at most RESULT_CACHE_SIZE of them
+        self._results = {}
+        # Format text -> validator, as most formats are shared by many settings
+        self._compiled = {}
+    
+    def validator_for(self, key):
+        """Return the validator for a setting key, or None if its values aren't checked."""
+        if len(self._setting_values) != self._size:
+            self._reset()
+        try:
+            return self._validators[key]
+        except KeyError:
+            pass
+        
+        validator = None
+        setting_values = get_setting_values(key)
+        if setting_values is not None:
+            text = setting_values["values"]
+            if text not in self._compiled:
+                self._compiled[text] = compile_format(text)
+            validator = self._compiled[text]
+        self._validators[key] = validator
+        return validator
+    
+    def validate(self, key, value):
+        """Return why a value is invalid for a setting, or None if it is valid (or unchecked)."""
+        validator = self.validator_for(key)
+        if validator is None or not value:
+            return None
+        
+        cache_key = (key, value)
+        try:
+            return self._results[cache_key]
+        except KeyError:
+            pass
+        
+        value_text = unquote(value)
+        problem = None if value_text.startswith("@Variant(") else validator(value_text)
+        if len(self._results) >= RESULT_CACHE_SIZE:
+            # Values are unbounded (every station's own call and grid), so drop the oldest result
+            del self._results[next(iter(self._results))]
+        self._results[cache_key] = problem
+        return problem
+
+SETTING_VALIDATOR = SettingValidator(SETTING_VALUES)
+
+def validate_setting(key, value):
+    """Return why a value is invalid for a setting, or None if it is valid or unchecked."""
+    return SETTING_VALIDATOR.validate(key, value)
+
+def validate_file(path):
+    """Validate every setting of an ini file into a result record."""
+    try:
+        config = IniFile.from_path(path)
+    except Exception as e:
+        return {"file": path, "error": str(e), "problems": []}
+    
+    problems = []
+    for index, (section, key, _, _) in enumerate(config.records()):
+        if SETTING_VALIDATOR.validator_for(key) is None:
+            # Most settings have no checkable format, so skip decoding their values
+            continue
+        value = config.value_at(index)
+        problem = validate_setting(key, value)
+        if problem:
+            problems.append({"section": section, "key": key, "value": value, "problem": problem})
+    return {"file": path, "error": None, "problems": problems}
+
+def validate_files(paths):
+    """Validate a chunk of files in a worker process."""
+    return [validate_file(path) for path in paths]
+
+def init_worker():
+    """Load the value formats in a worker process (spawned workers don't inherit them)."""
+    if not SETTING_VALUES:
+        load_setting_values()
+
+def run_validate(args):
+    """Run the validate command; returns 1 if any value is invalid and 2 if any file could not be read."""
+    # Imported here so the interface, which only validates single values, doesn't load the process pool
+    from js8call_export import expand_paths, iter_records
+    paths = list(expand_paths(args.paths))
+    if not paths:
+        print("No ini files matched the given paths", file=sys.stderr)
+        return 2
+    
+    load_setting_values()
+    invalid_files = unreadable_files = problem_count = 0
+    for record in iter_records(paths, args.jobs, args.chunk_size, validate_files, init_worker):
+        if record["error"]:
+            unreadable_files += 1
+        elif record["problems"]:
+            invalid_files += 1
+            problem_count += len(record["problems"])
+        
+        if args.json:
+            print(json.dumps(record, ensure_ascii=False))
+        elif record["error"]:
+            print(f"{record['file']}: error: {record['error']}")
+        else:
+            for problem in record["problems"]:
+                print(f"{record['file']}: [{problem['section']}] {problem['key']}={problem['value']}: {problem['problem']}")
+    
+    print(
+        f"Checked {len(paths)} files: {problem_count} invalid values in {invalid_files} files"
+        + (f", {unreadable_files} unreadable" if unreadable_files else ""),
+        file=sys.stderr,
+    )
+    if unreadable_files:
+        return 2
+    return 1 if invalid_files else 0
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Watch a js8call.ini file for changes made while JS8Call is running.
+
+On Linux the file's directory is watched with inotify (QSettings usually
+replaces the file rather than writing it in place), so an idle watcher sleeps
+in select() and uses no CPU. Elsewhere, or if inotify is unavailable, the file
+is polled with os.stat(). Bursts of writes are coalesced with a debounce delay,
+and the callback only fires when the file's content actually changed.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify event flags (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC if hasattr(os, "O_CLOEXEC") else 0
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event header: int wd; uint32_t mask, cookie, len
+EVENT_HEADER = struct.Struct("iIII")
+
+def load_inotify():
+    """Return libc if it provides inotify, or None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+class FileWatcher:
+    """Calls on_change(data) from a background thread whenever the file's content changes.
+    
+    A change is detected when the file's size or mtime differs from the last
+    check and its SHA-256 digest differs too, so touches and rewrites of
+    identical content are ignored. The callback receives the new file bytes.
+    """
+    
+    def __init__(self, path, on_change, debounce=0.25, poll_interval=1.0, use_inotify=True):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend = None
+        
+        self._stop = threading.Event()
+        self._thread = None
+        self._stop_pipe = None
+        self._inotify_fd = None
+        
+        # Baseline the current content so only later changes are reported
+        self._fingerprint, self._digest, _ = self._read_state()
+    
+    def _stat_fingerprint(self):
+        """Return the file's (size, mtime_ns), or None if it doesn't exist."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+    
+    def _read_state(self):
+        """Return (fingerprint, digest, data) for the file's current content."""
+        fingerprint = self._stat_fingerprint()
+        if fingerprint is None:
+            return None, None, None
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None, None, None
+        return fingerprint, hashlib.sha256(data).digest(), data
+    
+    def check(self):
+        """Check the file now and call on_change if its content changed. Returns True on change."""
+        fingerprint = self._stat_fingerprint()
+        if fingerprint is None or fingerprint == self._fingerprint:
+            return False
+        
+        fingerprint, digest, data = self._read_state()
+        if fingerprint is None:
+            return False
+        self._fingerprint = fingerprint
+        if digest == self._digest:
+            # Rewritten with identical content
+            return False
+        
+        self._digest = digest
+        self.on_change(data)
+        return True
+    
+    def start(self):
+        """Start watching in a daemon thread."""
+        libc = load_inotify() if self.use_inotify else None
+        target = self._poll_loop
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                directory = os.path.dirname(self.path)
+                if libc.inotify_add_watch(fd, directory.encode(), WATCH_MASK) >= 0:
+                    self._stop_pipe = os.pipe()
+                    self._inotify_fd = fd
+                    target = self._inotify_loop
+                else:
+                    os.close(fd)
+        
+        self.backend = "inotify" if target == self._inotify_loop else "poll"
+        self._thread = threading.Thread(target=target, name="js8call-ini-watcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop watching and wait for the thread to finish."""
+        self._stop.set()
+        if self._stop_pipe:
+            os.write(self._stop_pipe[1], b"x")
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._stop_pipe:
+            os.close(self._inotify_fd)
+            for fd in self._stop_pipe:
+                os.close(fd)
+            self._stop_pipe = None
+    
+    def _inotify_loop(self):
+        """Sleep on inotify events for the file, then check once the burst is over."""
+        name = os.path.basename(self.path).encode()
+        stop_fd = self._stop_pipe[0]
+        deadline = None
+        
+        while not self._stop.is_set():
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._inotify_fd, stop_fd], [], [], timeout)
+            if stop_fd in readable:
+                break
+            
+            if self._inotify_fd in readable:
+                if self._read_events(name):
+                    # Restart the debounce delay on every write in a burst
+                    deadline = time.monotonic() + self.debounce
+            elif deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                self.check()
+    
+    def _read_events(self, name):
+        """Drain pending inotify events, returning True if any concern the watched file."""
+        relevant = False
+        while True:
+            try:
+                buffer = os.read(self._inotify_fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(buffer):
+                _, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                event_name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if event_name == name:
+                    relevant = True
+    
+    def _poll_loop(self):
+        """Poll the file's stat; fire once it has stopped changing for one interval."""
+        pending = None
+        while not self._stop.wait(self.poll_interval if pending is None else self.debounce):
+            fingerprint = self._stat_fingerprint()
+            if fingerprint == self._fingerprint:
+                pending = None
+            elif fingerprint != pending:
+                # Still changing - wait for it to settle
+                pending = fingerprint
+            else:
+                pending = None
+                self.check()
@@ -7,11 +7,11 @@ setup(
     version="0.1.0",
     description="A terminal tool to view JS8Call.ini configuration files",
     author="backstop",
-    py_modules=["js8call_config_viewer"],
+    py_modules=["js8call_config_viewer", "js8call_tui", "js8call_export", "js8call_ini", "js8call_watch", "js8call_diff", "js8call_search", "js8call_profile", "js8call_fleet", "js8call_history", "js8call_validate", "js8call_qvariant", "js8call_serve", "js8call_query", "js8call_paths", "js8call_sqlite"],
     install_requires=["rich", "textual>=0.27.0"],
     entry_points={
         "console_scripts": [
-            "js8call-config-viewer=js8call_config_viewer:main",
+            "js8call-config-viewer=js8call_query:main",
         ],
     },
     classifiers=[
@@ -0,0 +1,61 @@
+"""Tests for the snapshot store."""
+
+import os
+import tempfile
+import unittest
+
+from js8call_history import INDEX_FILE, SnapshotStore
+from js8call_ini import IniFile
+
+def config(call, grid="FN31"):
+    return IniFile(f"[Configuration]\nMyCall={call}\nMyGrid={grid}\n".encode())
+
+def values(versions):
+    return [version.value for version in versions]
+
+class SnapshotStoreWritersTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def test_two_writers_opened_before_either_wrote(self):
+        # Two snapshot runs (e.g. cron jobs for two stations) that both read the store before writing
+        first = SnapshotStore(self.path)
+        second = SnapshotStore(self.path)
+        first.snapshots()
+        second.snapshots()
+        first.add(config("W1AW"), "s1", captured=1)
+        second.add(config("W2AW", "FN42"), "s2", captured=2)
+        
+        store = SnapshotStore(self.path)
+        self.assertEqual([snapshot["source"] for snapshot in store.snapshots()], ["s1", "s2"])
+        self.assertEqual(len({snapshot["id"] for snapshot in store.snapshots()}), 2)
+        self.assertEqual(values(store.history("s1", "MyCall")), ["W1AW"])
+        self.assertEqual(values(store.history("s2", "MyCall")), ["W2AW"])
+        self.assertEqual(values(store.history("s2", "MyGrid")), ["FN42"])
+        
+        # The stale writer sees the other's snapshot before adding its next one
+        first.add(config("W1AW", "FN42"), "s1", captured=3)
+        store = SnapshotStore(self.path)
+        self.assertEqual(values(store.history("s1", "MyGrid")), ["FN31", "FN42"])
+        self.assertEqual(values(store.history("s2", "MyCall")), ["W2AW"])
+    
+    def test_interrupted_snapshot_id_is_not_reused(self):
+        SnapshotStore(self.path).add(config("W1AW"), "s1", captured=1)
+        # A snapshot that wrote its index line (ending in a cut-short line) but never its snapshot line
+        with open(os.path.join(self.path, INDEX_FILE), "a", encoding="utf-8") as f:
+            f.write('{"snapshot": 1, "changes": [["Configuration", "MyCall", 0]]}\n{"snap')
+        
+        store = SnapshotStore(self.path)
+        snapshot, _ = store.add(config("W3AW"), "s3", captured=2)
+        self.assertNotEqual(snapshot["id"], 1)
+        
+        store = SnapshotStore(self.path)
+        self.assertEqual(values(store.history("s3", "MyCall")), ["W3AW"])
+        self.assertEqual(values(store.history("s1", "MyCall")), ["W1AW"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the QSettings INI reader."""
+
+import unittest
+
+from js8call_config_viewer import iter_setting_records
+from js8call_diff import effective_setting
+from js8call_ini import IniFile
+from js8call_qvariant import decode_value
+
+def items(config, section):
+    return list(config[section].items())
+
+class IniFileTest(unittest.TestCase):
+    def test_lines_before_any_header_go_to_general(self):
+        config = IniFile(b"Version=2.2.0\nMyCall=W1AW\n[Configuration]\nMyGrid=FN31\n")
+        self.assertEqual(config.sections(), ["General", "Configuration"])
+        self.assertEqual(items(config, "General"), [("Version", "2.2.0"), ("MyCall", "W1AW")])
+        self.assertEqual(items(config, "Configuration"), [("MyGrid", "FN31")])
+    
+    def test_general_header_after_leading_lines_is_the_same_section(self):
+        config = IniFile(b"\xef\xbb\xbfA=1\n[Other]\nB=2\n[General]\nC=3\n")
+        self.assertEqual(config.sections(), ["General", "Other"])
+        self.assertEqual(items(config, "General"), [("A", "1"), ("C", "3")])
+    
+    def test_repeated_key_in_a_section_keeps_the_last_value(self):
+        config = IniFile(b"[Configuration]\nMyCall=W1AW\nMyCall=K1ABC\n")
+        self.assertEqual(items(config, "Configuration"), [("MyCall", "K1ABC")])
+    
+    def test_duplicate_keys_across_sections_last_one_wins(self):
+        config = IniFile(b"[Common]\nMyCall=W1AW\n[Configuration]\nMyCall=K1ABC\n[Other]\nMyGrid=FN31\n")
+        # Each section keeps its own value...
+        self.assertEqual(config["Common"]["MyCall"], "W1AW")
+        self.assertEqual(config["Configuration"]["MyCall"], "K1ABC")
+        # ...and the viewer shows the one from the last section that has the key
+        self.assertEqual(effective_setting(config, "MyCall"), ("Configuration", "K1ABC"))
+        shown = [record for _, records in iter_setting_records(config) for record in records if record.key == "MyCall"]
+        self.assertEqual([(record.section, record.value) for record in shown], [("Configuration", "K1ABC")])
+    
+    def test_values_are_kept_raw(self):
+        config = IniFile(
+            b"[Configuration]\n"
+            b"EOTCharacter=\\x2662\n"
+            b'MyInfo="100W, dipole "\n'
+            b"MyGroups=@ARES, RACES\n"
+            b"Path=C:\\\\Sounds\\\\alert.wav\n"
+            b"Percent=50% ; not a comment\n"
+            b"Padded =  spaced value \t\r\n"
+        )
+        section = config["Configuration"]
+        self.assertEqual(section["EOTCharacter"], "\\x2662")
+        self.assertEqual(section["MyInfo"], '"100W, dipole "')
+        self.assertEqual(section["MyGroups"], "@ARES, RACES")
+        self.assertEqual(section["Path"], "C:\\\\Sounds\\\\alert.wav")
+        self.assertEqual(section["Percent"], "50% ; not a comment")
+        self.assertEqual(section["Padded"], "spaced value")
+    
+    def test_escaped_and_quoted_values_decode(self):
+        config = IniFile(
+            b"[Configuration]\n"
+            b"EOTCharacter=\\x2662\n"
+            b'MyInfo="100W, dipole "\n'
+            b"MyGroups=ARES, RACES\n"
+            b"Path=C:\\\\Sounds\\\\alert.wav\n"
+        )
+        section = config["Configuration"]
+        self.assertEqual(decode_value(section["EOTCharacter"]), "\u2662")
+        self.assertEqual(decode_value(section["MyInfo"]), "100W, dipole ")
+        self.assertEqual(decode_value(section["MyGroups"]), ["ARES", "RACES"])
+        self.assertEqual(decode_value(section["Path"]), "C:\\Sounds\\alert.wav")
+    
+    def test_comments_blank_lines_and_garbage_are_skipped(self):
+        config = IniFile(b"; comment\n# comment\n\n[Configuration]\n  MyCall = W1AW\nno equals sign\n=no key\n")
+        self.assertEqual(config.sections(), ["Configuration"])
+        self.assertEqual(items(config, "Configuration"), [("MyCall", "W1AW")])
+        self.assertEqual(IniFile(b"garbage").sections(), [])
+    
+    def test_section_digest_ignores_section_order(self):
+        first = IniFile(b"[A]\nX=1\n[B]\nY=2\n")
+        second = IniFile(b"[B]\nY=2\n[A]\nX=1\n")
+        third = IniFile(b"[A]\nX=2\n[B]\nY=2\n")
+        self.assertEqual(first.section_digest("A"), second.section_digest("A"))
+        self.assertEqual(first.section_digest("B"), second.section_digest("B"))
+        self.assertNotEqual(first.section_digest("A"), third.section_digest("A"))
+
+if __name__ == "__main__":
+    unittest.main()
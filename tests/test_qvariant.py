@@ -0,0 +1,147 @@
+"""Tests for decoding the typed values QSettings writes."""
+
+import struct
+import unittest
+
+from js8call_qvariant import (
+    QT_BOOL, QT_BYTEARRAY, QT_COLOR, QT_DOUBLE, QT_HASH, QT_INT, QT_LIST, QT_MAP, QT_RECT, QT_STRING,
+    QT_STRINGLIST, QT_USER, DataStreamError, DataStreamReader, OpaqueValue, decode_value, unescape,
+)
+
+HEX_DIGITS = "0123456789abcdefABCDEF"
+
+def escape(text):
+    """Escape text the way QSettings writes it into an ini file (QSettingsPrivate::iniEscapedString)."""
+    result = []
+    escape_next_if_digit = False
+    for char in text:
+        code = ord(char)
+        if code == 0:
+            result.append("\\0")
+            escape_next_if_digit = True
+        elif char == "\\" or char == '"':
+            result.append("\\" + char)
+            escape_next_if_digit = False
+        elif code < 0x20 or code >= 0x7F or (escape_next_if_digit and char in HEX_DIGITS):
+            result.append(f"\\x{code:x}")
+            escape_next_if_digit = True
+        else:
+            result.append(char)
+            escape_next_if_digit = False
+    text = "".join(result)
+    return f'"{text}"' if any(char in text for char in ",;=") or text != text.strip() else text
+
+def qstring(text):
+    data = text.encode("utf-16-be")
+    return struct.pack(">I", len(data)) + data
+
+def qbytes(data):
+    return struct.pack(">I", len(data)) + data
+
+def variant(type_id, payload):
+    return struct.pack(">I", type_id) + payload
+
+def as_setting(data):
+    """Return how QSettings writes a serialized QVariant."""
+    return escape("@Variant(" + data.decode("latin-1") + ")")
+
+class UnescapeTest(unittest.TestCase):
+    def test_plain_value(self):
+        self.assertEqual(unescape("W1AW"), (["W1AW"], False))
+    
+    def test_escapes(self):
+        self.assertEqual(unescape("\\x2662"), (["♢"], False))
+        self.assertEqual(unescape("a\\tb\\\\c\\\"d"), (['a\tb\\c"d'], False))
+        self.assertEqual(unescape("\\101\\0"), (["A\0"], False))
+        # Out of range codes become the replacement character
+        self.assertEqual(unescape("\\x110000"), (["�"], False))
+    
+    def test_quotes_protect_commas_and_spaces(self):
+        self.assertEqual(unescape('" 100W, dipole "'), ([" 100W, dipole "], False))
+    
+    def test_unquoted_commas_make_a_list(self):
+        self.assertEqual(unescape("ARES, RACES ,SKCC"), (["ARES", "RACES", "SKCC"], True))
+        self.assertEqual(unescape('a, "b,c", d'), (["a", "b,c", "d"], True))
+        self.assertEqual(unescape(","), (["", ""], True))
+
+class DataStreamReaderTest(unittest.TestCase):
+    def read(self, data):
+        return DataStreamReader(data).read_variant()
+    
+    def test_scalars(self):
+        self.assertIs(self.read(variant(QT_BOOL, b"\x01")), True)
+        self.assertEqual(self.read(variant(QT_INT, struct.pack(">i", -5))), -5)
+        self.assertEqual(self.read(variant(QT_DOUBLE, struct.pack(">d", 14.078))), 14.078)
+        self.assertEqual(self.read(variant(QT_STRING, qstring("K1ABC ♢"))), "K1ABC ♢")
+        self.assertEqual(self.read(variant(QT_BYTEARRAY, qbytes(b"\0\1\2"))), b"\0\1\2")
+    
+    def test_null_string_and_bytes(self):
+        self.assertIsNone(self.read(variant(QT_STRING, b"\xff\xff\xff\xff")))
+        self.assertIsNone(self.read(variant(QT_BYTEARRAY, b"\xff\xff\xff\xff")))
+    
+    def test_containers(self):
+        strings = variant(QT_STRINGLIST, struct.pack(">I", 2) + qstring("ARES") + qstring("RACES"))
+        self.assertEqual(self.read(strings), ["ARES", "RACES"])
+        items = variant(QT_LIST, struct.pack(">I", 2) + variant(QT_INT, struct.pack(">i", 1)) + strings)
+        self.assertEqual(self.read(items), [1, ["ARES", "RACES"]])
+        for type_id in (QT_MAP, QT_HASH):
+            entries = variant(type_id, struct.pack(">I", 1) + qstring("40m") + variant(QT_INT, struct.pack(">i", 1500)))
+            self.assertEqual(self.read(entries), {"40m": 1500})
+    
+    def test_geometry_and_color(self):
+        self.assertEqual(self.read(variant(QT_RECT, struct.pack(">iiii", 10, 20, 109, 69))),
+                         {"x": 10, "y": 20, "width": 100, "height": 50})
+        self.assertEqual(self.read(variant(QT_COLOR, struct.pack(">bHHHHH", 1, 0xFFFF, 0x6666, 0xFFFF, 0x6666, 0))), "#66ff66")
+    
+    def test_user_type_is_opaque(self):
+        value = self.read(variant(QT_USER, qbytes(b"Frequencies\0") + b"\0\0\0\x01"))
+        self.assertEqual(value, OpaqueValue("Frequencies", b"\0\0\0\x01"))
+    
+    def test_truncated_data(self):
+        with self.assertRaises(DataStreamError):
+            self.read(variant(QT_STRING, struct.pack(">I", 10) + b"\0K"))
+        with self.assertRaises(DataStreamError):
+            self.read(b"\0\0")
+
+class DecodeValueTest(unittest.TestCase):
+    def test_plain_values_come_back_unchanged(self):
+        for raw in ("W1AW", "", "50%", "@"):
+            self.assertEqual(decode_value(raw), raw)
+    
+    def test_typed_values(self):
+        self.assertEqual(decode_value("@Rect(10 20 100 50)"), {"x": 10, "y": 20, "width": 100, "height": 50})
+        self.assertEqual(decode_value("@Size(800 600)"), {"width": 800, "height": 600})
+        self.assertEqual(decode_value("@Point(-5 7)"), {"x": -5, "y": 7})
+        self.assertIsNone(decode_value("@Invalid()"))
+        self.assertEqual(decode_value("@@literal"), "@literal")
+        # Malformed typed values stay as they are
+        self.assertEqual(decode_value("@Rect(a b c d)"), "@Rect(a b c d)")
+    
+    def test_bytearray_round_trip(self):
+        data = bytes(range(256))
+        self.assertEqual(decode_value(escape("@ByteArray(" + data.decode("latin-1") + ")")), data)
+        self.assertEqual(decode_value("@ByteArray()"), b"")
+    
+    def test_variant_round_trips(self):
+        cases = [
+            (variant(QT_INT, struct.pack(">i", 42)), 42),
+            (variant(QT_STRING, qstring("CQ, CQ = ♢")), "CQ, CQ = ♢"),
+            (variant(QT_STRINGLIST, struct.pack(">I", 2) + qstring("a,b") + qstring("")), ["a,b", ""]),
+            (variant(QT_MAP, struct.pack(">I", 2) + qstring("20m") + variant(QT_BOOL, b"\0")
+                     + qstring("40m") + variant(QT_BYTEARRAY, qbytes(b"\x00\x7f\x80\xff"))),
+             {"20m": False, "40m": b"\x00\x7f\x80\xff"}),
+        ]
+        for data, expected in cases:
+            with self.subTest(expected=expected):
+                self.assertEqual(decode_value(as_setting(data)), expected)
+    
+    def test_unreadable_variant_is_opaque(self):
+        value = decode_value(as_setting(variant(QT_STRING, struct.pack(">I", 100))))
+        self.assertIsInstance(value, OpaqueValue)
+        self.assertTrue(value.type_name.startswith("unreadable QVariant"))
+    
+    def test_lists_of_typed_values(self):
+        self.assertEqual(decode_value("@Size(1 2), plain, \\x41"), [{"width": 1, "height": 2}, "plain", "A"])
+
+if __name__ == "__main__":
+    unittest.main()
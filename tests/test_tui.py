@@ -0,0 +1,50 @@
+"""Tests for the Textual widgets that can run headless."""
+
+import asyncio
+import unittest
+
+from textual.app import App
+
+from js8call_config_viewer import SettingRecord
+from js8call_tui import SettingTable
+
+def records(*pairs):
+    return [SettingRecord(key, value, section="Configuration") for key, value in pairs]
+
+class TableApp(App):
+    def compose(self):
+        yield SettingTable(id="table")
+
+class SettingTableReplaceRowsTest(unittest.TestCase):
+    def shown_keys(self, table):
+        """Return the setting names rendered on the table's data rows."""
+        return [table.render_line(y).text.split()[0] for y in range(1, table.row_count + 1)]
+    
+    def replace(self, old, new, changed_keys):
+        async def run():
+            app = TableApp()
+            async with app.run_test(size=(80, 20)) as pilot:
+                table = app.query_one("#table", SettingTable)
+                table.set_rows(old)
+                await pilot.pause()
+                # Render every row once, as the screen would, so the strip cache is warm
+                self.assertEqual(self.shown_keys(table), [record.key for record in old])
+                table.replace_rows(new, changed_keys)
+                await pilot.pause()
+                return self.shown_keys(table)
+        return asyncio.run(run())
+    
+    def test_changed_value_keeps_rows(self):
+        old = records(("MyCall", "W1AW"), ("MyGrid", "FN31"), ("MyInfo", "x"))
+        new = records(("MyCall", "W1AW"), ("MyGrid", "FN42"), ("MyInfo", "x"))
+        self.assertEqual(self.replace(old, new, {"MyGrid"}), ["MyCall", "MyGrid", "MyInfo"])
+    
+    def test_same_count_different_keys(self):
+        # One key removed and another added: the rows between them shift by one
+        old = records(("EOTCharacter", "#"), ("MyCall", "W1AW"), ("MyGrid", "FN31"), ("MyStatus", "ok"))
+        new = records(("MyCall", "W1AW"), ("MyGrid", "FN31"), ("MyInfo", "x"), ("MyStatus", "ok"))
+        changed = {"EOTCharacter", "MyInfo"}
+        self.assertEqual(self.replace(old, new, changed), ["MyCall", "MyGrid", "MyInfo", "MyStatus"])
+
+if __name__ == "__main__":
+    unittest.main()
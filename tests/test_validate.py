@@ -0,0 +1,83 @@
+"""Tests for the validators compiled from the documented setting formats."""
+
+import unittest
+from unittest import mock
+
+import js8call_validate
+from js8call_config_viewer import load_setting_values
+from js8call_validate import SettingValidator, compile_format
+
+# Documented format -> (a valid value, an invalid value), one per kind of compiled validator
+FORMATS = {
+    '"true" or "false"': ("true", "yes"),
+    'Valid amateur callsign (e.g., "W1AW", "G4ABC", "VK3XYZ")': ("VE3/W1AW/P", "W1"),
+    '4-6 character Maidenhead grid (e.g., "FN20", "IO91wm")': ("IO91wm", "ZZ99"),
+    'Hex color code "#RRGGBB" (e.g., "#66ff66")': ("#66ff66", "66ff66"),
+    '"Family,Size,Weight,Italic,Strikeout,Underline,StyleHint,Spacing,FixedPitch,Kerning"': (
+        "Sans Serif,10,-1,5,50,0,0,0,0,0", "Sans Serif,big,-1,5,50,0,0,0,0,0"),
+    "Same as Font format": ("Courier,9.5,-1,5,75,1,0,0,0,0", "Courier,9"),
+    'String: "Default", "Fldigi", "Blue"': ("Fldigi", "Red"),
+    "Integer: 0=Mono, 1=Left, 2=Right": ("2", "3"),
+    "Integer: 7 or 8": ("7", "9"),
+    "Integer: power of 2 (e.g., 512, 1024, 2048)": ("4096", "1000"),
+    "Integer: 0-100 (dB)": ("100", "101"),
+    "Integer: minutes (typically 10-60)": ("600", "ten"),
+    "Integer: mode identifier": ("-3", "1.5"),
+    "Double: 0.0-1.0": ("0.25", "1.5"),
+    "Double: Hz offset (e.g., -125.0 to +125.0)": ("-200.5", "abc"),
+}
+
+# Formats that don't constrain the value
+UNCHECKED_FORMATS = [
+    'Free text string (e.g., "FT-991A 100W DIPOLE")',
+    "QByteArray (binary data, Base64 encoded)",
+    "String: anything at all",
+]
+
+class CompileFormatTest(unittest.TestCase):
+    def test_valid_and_invalid_value_per_format(self):
+        for text, (valid, invalid) in FORMATS.items():
+            with self.subTest(text):
+                validator = compile_format(text)
+                self.assertIsNotNone(validator)
+                self.assertIsNone(validator(valid))
+                self.assertIsInstance(validator(invalid), str)
+    
+    def test_unchecked_formats(self):
+        for text in UNCHECKED_FORMATS:
+            with self.subTest(text):
+                self.assertIsNone(compile_format(text))
+    
+    def test_messages_name_the_expected_values(self):
+        self.assertEqual(compile_format("Integer: 0-100 (dB)")("-1"), "expected an integer from 0 to 100")
+        self.assertEqual(compile_format("Integer: 1 or 2")("3"), "expected one of 1, 2")
+
+class SettingValidatorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        load_setting_values()
+    
+    def setUp(self):
+        self.validator = SettingValidator(js8call_validate.SETTING_VALUES)
+    
+    def test_documented_settings(self):
+        self.assertIsNone(self.validator.validate("MyGrid", "FN31"))
+        self.assertIsNotNone(self.validator.validate("MyGrid", "FN3"))
+        # Quotes QSettings adds around values are not part of the value
+        self.assertIsNone(self.validator.validate("colorCQ", '"#66ff66"'))
+    
+    def test_unchecked_values(self):
+        # Never-set settings, serialized values and undocumented keys
+        self.assertIsNone(self.validator.validate("MyGrid", ""))
+        self.assertIsNone(self.validator.validate("OutAttenuation", "@Variant(\\0\\0\\0\\x2)"))
+        self.assertIsNone(self.validator.validate("NoSuchSetting", "anything"))
+    
+    def test_result_cache_is_bounded(self):
+        with mock.patch.object(js8call_validate, "RESULT_CACHE_SIZE", 8):
+            for number in range(20):
+                self.validator.validate("OutAttenuation", str(number))
+            self.assertEqual(len(self.validator._results), 8)
+            self.assertIsNotNone(self.validator.validate("OutAttenuation", "200"))
+
+if __name__ == "__main__":
+    unittest.main()